@@ -4,8 +4,9 @@ import os
 from flask_cors import CORS
 from flask_migrate import Migrate
 from database import IDatabaseConnection
-from flask import Flask, current_app, g, jsonify
+from flask import Flask, current_app, g, jsonify, request
 from flask_jwt_extended import JWTManager
+from werkzeug.middleware.proxy_fix import ProxyFix
 from di.container import configure_dependencies
 from blueprints import (
     auth_bp,
@@ -17,11 +18,19 @@ from blueprints import (
     category_bp,
     notification_bp,
     author_bp,
+    beacon_bp,
 )
 from config import config
+from middleware.viewer_middleware import init_viewer_cookie
+from repositories.pagination import InvalidCursorError
+from services.auth.password_hasher import PasswordHashingBusyError
+from services.json_provider import FastJSONProvider
 
 load_dotenv()
 
+# Blueprints, яким не потрібна сесія БД (маяки відстеження)
+SESSIONLESS_BLUEPRINTS = {"beacon"}
+
 
 def create_app(config_name="default"):
     app = Flask(__name__)
@@ -30,6 +39,13 @@ def create_app(config_name="default"):
     config_class = config.get(config_name, config["default"])
     app.config.from_object(config_class)
     app.config["SQLALCHEMY_ECHO"] = False
+    if app.config["FAST_JSON"]:
+        app.json = FastJSONProvider(app)
+    if app.config["PROXY_FIX_X_FOR"]:
+        # request.remote_addr та is_secure — від клієнта, а не від nginx
+        proxies = app.config["PROXY_FIX_X_FOR"]
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxies, x_proto=proxies)
+    init_viewer_cookie(app)
 
     @app.before_request
     def attach_services():
@@ -38,6 +54,8 @@ def create_app(config_name="default"):
         Створює ОДНУ сесію на весь запит і зберігає її в 'g'.
         """
         g.container = current_app.container
+        if request.blueprint in SESSIONLESS_BLUEPRINTS:
+            return
         db_connection = g.container.resolve(IDatabaseConnection)
         g.db_session = db_connection.get_session()
 
@@ -72,6 +90,7 @@ def create_app(config_name="default"):
     app.register_blueprint(category_bp, url_prefix="/categories")
     app.register_blueprint(notification_bp, url_prefix="/notifications")
     app.register_blueprint(author_bp, url_prefix="/authors")
+    app.register_blueprint(beacon_bp, url_prefix="/beacon")
 
     @app.route("/")
     def hello():
@@ -81,10 +100,18 @@ def create_app(config_name="default"):
     def handle_value_error(e):
         return jsonify({"msg": str(e)}), 404
 
+    @app.errorhandler(InvalidCursorError)
+    def handle_invalid_cursor(e):
+        return jsonify({"msg": str(e)}), 400
+
     @app.errorhandler(PermissionError)
     def handle_permission_error(e):
         return jsonify({"msg": str(e)}), 403
 
+    @app.errorhandler(PasswordHashingBusyError)
+    def handle_password_hashing_busy(e):
+        return jsonify({"msg": str(e)}), 503, {"Retry-After": "1"}
+
     @app.errorhandler(HTTPException)
     def handle_http_exception(e):
         return jsonify({"msg": e.description}), e.code
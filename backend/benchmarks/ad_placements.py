@@ -0,0 +1,93 @@
+"""
+Вибір реклами для /ads/by-placement: старий шлях (get_all() і фільтрація
+для кожного з п'яти місць розміщення) проти одного читання інвентарю.
+
+    cd backend && python -m benchmarks.ad_placements [--ads 5000]
+"""
+
+import argparse
+import datetime as dt
+from benchmarks.common import benchmark_app, measure, report
+from database import IDatabaseConnection
+from models.ad import Ad
+from repositories.ad import AdRepository
+from services.ad_service import AdService
+
+PLACEMENTS = ["banner", "sidebar", "popup", "inline", "video"]
+LIMIT = 3
+
+
+def seed_ads(db_session, count: int):
+    far_future = dt.datetime.now() + dt.timedelta(days=3650)
+    db_session.execute(
+        Ad.__table__.insert(),
+        [
+            {
+                "title": f"Оголошення {index}",
+                "ad_type": PLACEMENTS[index % len(PLACEMENTS)],
+                "is_active": index % 4 != 0,
+                "impressions_count": 0,
+                "clicks_count": 0,
+                "end_date": far_future if index % 3 else None,
+            }
+            for index in range(count)
+        ],
+    )
+    db_session.commit()
+
+
+def old_ads_by_placement(db_session, ad_repo: AdRepository) -> dict:
+    """
+    Попередня реалізація get_ads_by_placement (DefaultAdStrategy). Після
+    кожного місця сесія скидає ідентичні об'єкти, як окремі запити.
+    """
+    result = {}
+    for ad_type in PLACEMENTS:
+        now = dt.datetime.now()
+        result[ad_type] = [
+            ad
+            for ad in ad_repo.get_all()
+            if ad.is_active
+            and (not ad.start_date or ad.start_date <= now)
+            and (not ad.end_date or ad.end_date >= now)
+            and ad.ad_type == ad_type
+        ][:LIMIT]
+        db_session.expire_all()
+    return result
+
+
+def selected_ids(result: dict) -> dict:
+    return {ad_type: [ad.id for ad in ads] for ad_type, ads in result.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ads", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_app() as app:
+        db_session = app.container.resolve(IDatabaseConnection).get_session()
+        seed_ads(db_session, args.ads)
+        ad_repo = AdRepository(db_session)
+        ad_service = AdService(ad_repo)
+
+        def old_path():
+            return old_ads_by_placement(db_session, ad_repo)
+
+        def new_path():
+            return ad_service.get_ads_by_placement(placements=PLACEMENTS, limit=LIMIT)
+
+        assert selected_ids(old_path()) == selected_ids(new_path())
+
+        print(f"{args.ads} оголошень, {len(PLACEMENTS)} місць розміщення")
+        report("get_all() на кожне місце", measure(old_path, args.repeat))
+        # Перший виклик нового шляху завантажує інвентар, далі — лише пам'ять
+        ad_service.ad_inventory.invalidate()
+        report("одне читання інвентарю (холодний)", measure(new_path, 1, warmup=0))
+        report("одне читання інвентарю (теплий)", measure(new_path, args.repeat))
+        db_session.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Пропускна здатність RotationAdStrategy з різними сховищами позицій
+і рівномірність ротації, коли показами ділиться кілька воркерів.
+
+    cd backend && python -m benchmarks.ad_rotation [--workers 4]
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import Counter
+from types import SimpleNamespace
+from cache.backends import InMemoryLRUCache
+from services.ad_strategy import RotationAdStrategy
+from services.rotation_state import (
+    CacheRotationState,
+    InProcessRotationState,
+    SharedMemoryRotationState,
+)
+
+ADS = [SimpleNamespace(id=ad_id, ad_type="banner") for ad_id in range(7)]
+LIMIT = 3
+
+
+def make_state(kind: str, path: str):
+    if kind == "memory":
+        return InProcessRotationState()
+    if kind == "shared":
+        return SharedMemoryRotationState(path)
+    return CacheRotationState(InMemoryLRUCache())
+
+
+def select_many(kind: str, path: str, selections: int) -> list[int]:
+    strategy = RotationAdStrategy(make_state(kind, path))
+    shown = []
+    for _ in range(selections):
+        shown.extend(ad.id for ad in strategy.select_ads(ADS, LIMIT))
+    return shown
+
+
+def throughput(kind: str, path: str, selections: int):
+    started = time.perf_counter()
+    select_many(kind, path, selections)
+    elapsed = time.perf_counter() - started
+    print(f"{kind:<8} {selections / elapsed / 1000:8.0f}k вибірок/с (1 процес)")
+
+
+def spread(kind: str, path: str, workers: int, selections: int):
+    """Покази кожного оголошення, коли workers процесів роблять по selections."""
+    with multiprocessing.Pool(workers) as pool:
+        started = time.perf_counter()
+        results = pool.starmap(select_many, [(kind, path, selections)] * workers)
+        elapsed = time.perf_counter() - started
+    shown = Counter(ad_id for result in results for ad_id in result)
+    line = (
+        f"{kind:<8} {workers} x {selections}: покази на оголошення "
+        f"від {min(shown.values())} до {max(shown.values())}"
+    )
+    # На кількох вибірках час — це запуск процесів, а не ротація
+    if selections >= 1000:
+        line += f", {workers * selections / elapsed / 1000:.0f}k вибірок/с"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--selections", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rotation.bin")
+        # cache з пам'яттю процесу — нижня межа для Redis без мережі
+        for kind in ("memory", "shared", "cache"):
+            throughput(kind, path, args.selections)
+        for kind in ("memory", "shared"):
+            if os.path.exists(path):
+                os.remove(path)
+            # 5 вибірок по 3 з 7 оголошень — неповне коло в кожному воркері
+            spread(kind, path, args.workers, selections=5)
+            spread(kind, path, args.workers, args.selections // 10)
+
+
+if __name__ == "__main__":
+    main()
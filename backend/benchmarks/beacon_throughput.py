@@ -0,0 +1,84 @@
+"""
+Запитів за секунду на відстеження показів і кліків: попередні обробники
+(/ads/<id>/impression, /ads/<id>/click, /articles/<id>/impression) проти
+маяків /beacon/ та /beacon/pixel.gif без сесії БД і завантаження
+користувача. Запити йдуть через test_client, тож вимірюється вартість
+стеку Flask без мережі.
+
+    cd backend && python -m benchmarks.beacon_throughput [--seconds 3]
+"""
+
+import argparse
+import json
+import time
+from flask_jwt_extended import create_access_token
+from benchmarks.common import benchmark_app, seed_site
+from database import IDatabaseConnection
+from services.beacon import get_beacon_signer
+
+
+def requests_per_second(send, seconds: float) -> float:
+    for _ in range(50):
+        send()
+    sent = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        for _ in range(50):
+            response = send()
+        assert response.status_code in (200, 204), response.status_code
+        sent += 50
+    return sent / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    with benchmark_app() as app:
+        db_session = app.container.resolve(IDatabaseConnection).get_session()
+        ids = seed_site(db_session)
+        db_session.close()
+
+        signer = get_beacon_signer()
+        ad_beacon = signer.sign("ad", ids["ad_id"])
+        article_beacon = signer.sign("article", ids["article_id"])
+        token = create_access_token(
+            identity=str(ids["user_id"]), additional_claims={"type": "user"}
+        )
+        client = app.test_client()
+        # Cookie глядача, як у браузера після першого запиту
+        client.get("/")
+
+        ad_id, article_id = ids["ad_id"], ids["article_id"]
+        beacon_body = json.dumps({"ads": [ad_beacon], "articles": [article_beacon]})
+        cases = {
+            "POST /ads/<id>/impression": lambda headers: client.post(
+                f"/ads/{ad_id}/impression", json={}, headers=headers
+            ),
+            "GET /ads/<id>/click": lambda headers: client.get(
+                f"/ads/{ad_id}/click", headers=headers
+            ),
+            "POST /articles/<id>/impression": lambda headers: client.post(
+                f"/articles/{article_id}/impression", json={}, headers=headers
+            ),
+            "POST /beacon/ (показ реклами + статті)": lambda headers: client.post(
+                "/beacon/", data=beacon_body, content_type="text/plain", headers=headers
+            ),
+            "GET /beacon/pixel.gif?clicks=": lambda headers: client.get(
+                f"/beacon/pixel.gif?clicks={ad_beacon}", headers=headers
+            ),
+        }
+
+        print(f"{'':<44}{'анонім':>10}{'з токеном':>12}  (запитів/с)")
+        for name, send in cases.items():
+            anonymous = requests_per_second(lambda: send({}), args.seconds)
+            signed_in = requests_per_second(
+                lambda: send({"Authorization": f"Bearer {token}"}), args.seconds
+            )
+            print(f"{name:<44}{anonymous:>10.0f}{signed_in:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
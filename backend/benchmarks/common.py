@@ -0,0 +1,90 @@
+import contextlib
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+from werkzeug.security import generate_password_hash
+from app import create_app
+from config import TestingConfig
+from database import IDatabaseConnection
+from models import Ad, Article, Author, Category, SubscriptionPlan, User
+from models import UserSubscriptionPlan
+from services.ad_event_buffer import AdEventBuffer
+from services.impression_buffer import ArticleImpressionBuffer
+
+USER_EMAIL = "user@news.com"
+PASSWORD = "password"
+
+
+@contextlib.contextmanager
+def benchmark_app():
+    """Застосунок з конфігурацією testing на порожній SQLite-БД у тимчасовій теці."""
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = TestingConfig.DATABASE_URL
+        TestingConfig.DATABASE_URL = f"sqlite:///{Path(directory) / 'bench.db'}"
+        try:
+            app = create_app("testing")
+        finally:
+            TestingConfig.DATABASE_URL = database_url
+        connection = app.container.resolve(IDatabaseConnection)
+        connection.create_tables()
+        try:
+            with app.app_context():
+                yield app
+        finally:
+            # Залишок буферів — до видалення БД, а не в atexit
+            for buffer_class in (AdEventBuffer, ArticleImpressionBuffer):
+                app.container.resolve(buffer_class).shutdown()
+            connection.engine.dispose()
+
+
+def seed_site(db_session) -> dict:
+    """
+    Мінімальний вміст: стаття, оголошення та користувач з планом підписки
+    (email user@news.com, пароль PASSWORD). Повертає їхні ID.
+    """
+    plan = SubscriptionPlan(name="Безкоштовний", permissions={}, price_per_month=None)
+    category = Category(name="Спорт", slug="sport")
+    author = Author(first_name="Іван", last_name="Франко")
+    db_session.add_all([plan, category, author])
+    db_session.flush()
+    article = Article(
+        title="Стаття",
+        content="Текст",
+        author_id=author.id,
+        category_id=category.id,
+        status="published",
+    )
+    ad = Ad(title="Банер", ad_type="banner")
+    user = User(
+        email=USER_EMAIL,
+        password=generate_password_hash(PASSWORD),
+        username="user",
+    )
+    db_session.add_all([article, ad, user])
+    db_session.flush()
+    db_session.add(UserSubscriptionPlan(user_id=user.id, plan_id=plan.id))
+    db_session.commit()
+    return {"ad_id": ad.id, "article_id": article.id, "user_id": user.id}
+
+
+def measure(fn: Callable, repeat: int, warmup: int = 1) -> list[float]:
+    """Час кожного з repeat викликів fn у мілісекундах (після warmup прогонів)."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name: str, timings: list[float]):
+    timings = sorted(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(
+        f"{name:<40} median {statistics.median(timings):9.3f} ms"
+        f"   p99 {p99:9.3f} ms   ({len(timings)} runs)"
+    )
@@ -0,0 +1,145 @@
+"""
+Входи під навантаженням: 16 клієнтів безперервно входять (з урахуванням
+Retry-After), а 2 клієнти кожні 10 мс читають статтю. Сервер має
+фіксований пул потоків, як воркер gunicorn --threads.
+
+Порівнюються: хешування в потоці запиту (до PasswordHasher), пул з
+лімітом 2 + 16 = 18 входів (колишні max_workers + max_queue), більшим
+за кількість потоків (хешування займають усі потоки, 503 не настає),
+і ліміт за кількістю потоків (PASSWORD_HASH_THREADS = WEB_THREADS // 2).
+
+    cd backend && python -m benchmarks.login_load [--seconds 15]
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+from benchmarks.common import PASSWORD, USER_EMAIL, benchmark_app, seed_site
+from database import IDatabaseConnection
+from services.auth.password_hasher import PasswordHasher
+
+LOGIN_CLIENTS = 16
+READ_CLIENTS = 2
+
+
+class InlinePasswordHasher(PasswordHasher):
+    """Хешування в потоці запиту, без пулу та ліміту."""
+
+    def _run(self, fn, *args):
+        return fn(*args)
+
+
+class QuietHandler(WSGIRequestHandler):
+    # Кожен запит — окреме з'єднання: потік пулу не тримається keep-alive
+    protocol_version = "HTTP/1.0"
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """WSGI-сервер з threads потоками обробки, як gthread-воркер gunicorn."""
+
+    def __init__(self, app, threads: int):
+        super().__init__("127.0.0.1", 0, app, handler=QuietHandler)
+        self._pool = ThreadPoolExecutor(threads)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._handle, request, client_address)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def run_load(port: int, article_id: int, seconds: float) -> dict:
+    deadline = time.monotonic() + seconds
+    logins = {"ok": 0, "busy": 0}
+    latencies = []
+    body = json.dumps({"email": USER_EMAIL, "password": PASSWORD})
+
+    def login_loop():
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        while time.monotonic() < deadline:
+            connection.request(
+                "POST", "/auth/login", body, {"Content-Type": "application/json"}
+            )
+            response = connection.getresponse()
+            response.read()
+            if response.status == 200:
+                logins["ok"] += 1
+            elif response.status == 503:
+                logins["busy"] += 1
+                time.sleep(float(response.getheader("Retry-After", "1")))
+
+    def read_loop():
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            connection.request("GET", f"/articles/{article_id}")
+            connection.getresponse().read()
+            latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=login_loop) for _ in range(LOGIN_CLIENTS)]
+    threads += [threading.Thread(target=read_loop) for _ in range(READ_CLIENTS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    return {
+        "logins": logins["ok"] / seconds,
+        "busy": logins["busy"] / seconds,
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=15)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with benchmark_app() as app:
+        db_session = app.container.resolve(IDatabaseConnection).get_session()
+        article_id = seed_site(db_session)["article_id"]
+        db_session.close()
+
+        hashers = {
+            "у потоці запиту": InlinePasswordHasher(),
+            "пул 2, ліміт 2 + 16": PasswordHasher(max_workers=2, max_concurrent=18),
+            f"пул 2, ліміт {args.threads // 2}": PasswordHasher(
+                max_workers=2, max_concurrent=args.threads // 2
+            ),
+        }
+        print(
+            f"{args.threads} потоків сервера, {LOGIN_CLIENTS} клієнтів входу, "
+            f"{READ_CLIENTS} читачі"
+        )
+        for name, hasher in hashers.items():
+            app.container.register_instance(PasswordHasher, hasher)
+            server = PooledWSGIServer(app, args.threads)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            result = run_load(server.server_port, article_id, args.seconds)
+            server.shutdown()
+            server.server_close()
+            print(
+                f"{name:<22} входів/с {result['logins']:5.1f}   "
+                f"503/с {result['busy']:5.1f}   читання p50 {result['p50']:7.1f} ms"
+                f"   p99 {result['p99']:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Великі сторінки адмінки (/admin/articles/ та /admin/authors/ з per_page
+1000 і 10000): час запиту цілком і окремо to_dict() та кодування JSON
+стандартним DefaultJSONProvider проти FastJSONProvider на orjson.
+
+    cd backend && python -m benchmarks.serialization [--rows 1000 10000]
+"""
+
+import argparse
+import datetime
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import create_access_token
+from sqlalchemy import insert
+from benchmarks.common import benchmark_app, measure, report
+from database import IDatabaseConnection
+from models import Admin, Article, Author, Category
+from models.article import ArticleKeyword
+from repositories.article import ArticleRepository
+from services.json_provider import FastJSONProvider
+
+CATEGORIES = 20
+AUTHORS_WITH_ARTICLES = 200
+
+
+def seed(db_session, rows: int) -> int:
+    """rows статей та авторів з українським текстом. Повертає ID адміна."""
+    db_session.execute(
+        insert(Category),
+        [
+            {"name": f"Категорія {i}", "slug": f"c{i}", "description": "Опис"}
+            for i in range(CATEGORIES)
+        ],
+    )
+    db_session.execute(
+        insert(Author),
+        [
+            {"first_name": "Іван", "last_name": f"Франко {i}", "bio": "Письменник"}
+            for i in range(rows)
+        ],
+    )
+    started = datetime.datetime(2025, 1, 1)
+    db_session.execute(
+        insert(Article),
+        [
+            {
+                "title": f"Україна перемогла у фіналі чемпіонату {i}",
+                "content": "Текст статті " * 50,
+                "author_id": i % AUTHORS_WITH_ARTICLES + 1,
+                "category_id": i % CATEGORIES + 1,
+                "status": "published",
+                "is_exclusive": False,
+                "is_breaking": i % 3 == 0,
+                "views_count": i,
+                "created_at": started + datetime.timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ],
+    )
+    db_session.execute(
+        insert(ArticleKeyword),
+        [
+            {"article_id": i % rows + 1, "keyword": f"футбол{i % 50}"}
+            for i in range(2 * rows)
+        ],
+    )
+    admin = Admin(email="admin@news.com", password="-")
+    db_session.add(admin)
+    db_session.commit()
+    return admin.id
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with benchmark_app() as app:
+        db_session = app.container.resolve(IDatabaseConnection).get_session()
+        admin_id = seed(db_session, max(args.rows))
+        token = create_access_token(
+            identity=str(admin_id), additional_claims={"type": "admin"}
+        )
+        headers = {"Authorization": f"Bearer {token}"}
+        client = app.test_client()
+        providers = {
+            "DefaultJSONProvider": DefaultJSONProvider(app),
+            "FastJSONProvider": FastJSONProvider(app),
+        }
+
+        for rows in args.rows:
+            # 10k рядків — секунди на прогін, тож менше повторів
+            repeat = max(args.repeat * 1000 // rows, 3)
+            print(f"--- {rows} рядків")
+            for path in ("/admin/articles/", "/admin/authors/"):
+                url = f"{path}?per_page={rows}"
+                timings = measure(lambda: client.get(url, headers=headers), repeat)
+                report(f"GET {path}", timings)
+
+            articles, _, _ = ArticleRepository(db_session).get_all(
+                per_page=rows, totals="none", profile="admin"
+            )
+            report(
+                "to_dict(metadata=True)",
+                measure(lambda: [a.to_dict(metadata=True) for a in articles], repeat),
+            )
+            payload = {"articles": [a.to_dict(metadata=True) for a in articles]}
+            for name, provider in providers.items():
+                report(name, measure(lambda: provider.response(payload), repeat))
+            # З null у виводі FastJSONProvider ще й шукає NaN/Infinity у даних
+            fast = providers["FastJSONProvider"]
+            payload["next_cursor"] = None
+            report(
+                "FastJSONProvider, next_cursor: null",
+                measure(lambda: fast.response(payload), repeat),
+            )
+            for article in payload["articles"]:
+                article["author"]["bio"] = None
+            report(
+                "FastJSONProvider, null у кожному рядку",
+                measure(lambda: fast.response(payload), repeat),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,3 +7,4 @@ from .comment_controller import comment_bp
 from .category_controller import category_bp
 from .notification_controller import notification_bp
 from .author_controller import author_bp
+from .beacon_controller import beacon_bp
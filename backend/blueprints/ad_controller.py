@@ -1,11 +1,26 @@
 from flask import Blueprint, request, jsonify
 from middleware.auth_middleware import token_optional
+from middleware.viewer_middleware import request_session_id
 from repositories import get_ad_repo, get_ad_view_repo
 from services.ad_service import AdService
+from services.beacon import get_beacon_signer
+from services.frequency_cap import viewer_key
 
 ad_bp = Blueprint("ad_public", __name__)
 
 
+def _with_beacons(ads) -> list[dict]:
+    """Серіалізує оголошення разом з підписаними маяками для /beacon."""
+    signer = get_beacon_signer()
+    return [{**ad.to_dict(), "beacon": signer.sign("ad", ad.id)} for ad in ads]
+
+
+def _request_viewer(current_user):
+    """Ключ глядача для частотних обмежень: користувач або сесія."""
+    user_id = None if not current_user or current_user.is_admin else current_user.id
+    return viewer_key(user_id, request_session_id(request.args.get("session_id")))
+
+
 @ad_bp.route("/", methods=["GET"])
 @token_optional
 def get_ads(current_user):
@@ -23,9 +38,10 @@ def get_ads(current_user):
         user_permissions=user_permissions,
         limit=limit,
         strategy=strategy,
+        viewer=_request_viewer(current_user),
     )
 
-    result = [ad.to_dict() for ad in ads]
+    result = _with_beacons(ads)
     return (
         jsonify(
             {
@@ -37,6 +53,21 @@ def get_ads(current_user):
     )
 
 
+@ad_bp.route("/slate/<token>", methods=["GET"])
+def get_ad_slate(token):
+    """
+    Реклама за токеном добірки (ads=deferred). Права й глядач уже зашиті
+    в підписаний токен, тож користувач не завантажується.
+    """
+    ad_service = AdService(get_ad_repo())
+    ad_type, limit, strategy, viewer = ad_service.ad_slates.read_token(token)
+
+    ads = ad_service.get_ad_payloads(
+        ad_type=ad_type, limit=limit, strategy=strategy, viewer=viewer
+    )
+    return jsonify({"ads": ads}), 200
+
+
 @ad_bp.route("/<int:ad_id>", methods=["GET"])
 @token_optional
 def get_ad_by_id(current_user, ad_id):
@@ -83,10 +114,11 @@ def get_ads_by_placement(current_user):
         user_permissions=user_permissions,
         placements=placements,
         strategy=strategy,
+        viewer=_request_viewer(current_user),
     )
 
     result = {
-        placement: [ad.to_dict() for ad in ads_list]
+        placement: _with_beacons(ads_list)
         for placement, ads_list in ads.items()
     }
 
@@ -112,7 +144,7 @@ def record_impression(current_user, ad_id):
     success = ad_service.record_impression(
         ad_id=ad_id,
         user_id=current_user.id if current_user else None,
-        session_id=data.get("session_id"),
+        session_id=request_session_id(data.get("session_id")),
         ip_address=request.remote_addr,
     )
 
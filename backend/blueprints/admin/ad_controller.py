@@ -1,10 +1,46 @@
+import math
 from flask import Blueprint, request, jsonify
 from middleware.auth_middleware import admin_token_required
-from repositories import get_ad_repo
-from datetime import datetime
+from models.serialization import FieldSet
+from repositories import get_ad_repo, get_ad_stats_repo
+from services.ad_inventory import get_ad_inventory
+from services.ad_service import AdService
+from services.ad_timeline import ad_status
+from services.ad_event_buffer import get_ad_event_buffer
+from datetime import datetime, timedelta
 
 ad_bp = Blueprint("ad", __name__)
 
+RECENT_PERFORMANCE_DAYS = 30
+MAX_TIMESERIES_DAYS = 90
+
+
+def parse_delivery_fields(data: dict) -> tuple[dict, str | None]:
+    """
+    Перевіряє налаштування показу (weight, impression_budget).
+    Повертає (поля для збереження, повідомлення про помилку або None).
+    """
+    fields = {}
+    if "weight" in data:
+        try:
+            fields["weight"] = float(data["weight"])
+        except (TypeError, ValueError):
+            return {}, "Вага має бути числом"
+        if not math.isfinite(fields["weight"]):
+            return {}, "Вага має бути скінченним числом"
+        if fields["weight"] < 0:
+            return {}, "Вага не може бути від'ємною"
+
+    if "impression_budget" in data:
+        budget = data["impression_budget"]
+        if budget is not None and (
+            isinstance(budget, bool) or not isinstance(budget, int) or budget <= 0
+        ):
+            return {}, "Бюджет показів має бути додатним цілим числом"
+        fields["impression_budget"] = budget
+
+    return fields, None
+
 
 @ad_bp.route("/", methods=["GET"])
 @admin_token_required
@@ -15,47 +51,14 @@ def get_all_ads(current_admin):
     status = request.args.get("status")  # active, inactive, expired
     ad_type = request.args.get("type")
 
-    ad_repo = get_ad_repo()
-    ads = ad_repo.get_all()
-
-    if status == "active":
-        ads = [
-            ad
-            for ad in ads
-            if ad.is_active and (not ad.end_date or ad.end_date > datetime.now())
-        ]
-    elif status == "inactive":
-        ads = [ad for ad in ads if not ad.is_active]
-    elif status == "expired":
-        ads = [ad for ad in ads if ad.end_date and ad.end_date < datetime.now()]
-
-    if ad_type:
-        ads = [ad for ad in ads if ad.ad_type == ad_type]
-
-    ads = sorted(ads, key=lambda x: x.id, reverse=True)
-
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_ads = ads[start:end]
-
-    result = []
-    for ad in paginated_ads:
-        ad_data = ad.to_dict()
-
-        ad_data["ctr"] = (
-            round((ad.clicks_count / ad.impressions_count * 100), 2)
-            if ad.impressions_count > 0
-            else 0
-        )
-        ad_data["status"] = (
-            "active"
-            if ad.is_active and (not ad.end_date or ad.end_date > datetime.now())
-            else "inactive"
-        )
-        if ad.end_date and ad.end_date < datetime.now():
-            ad_data["status"] = "expired"
-
-        result.append(ad_data)
+    ad_service = AdService(get_ad_repo())
+    result, total = ad_service.get_paginated_ads_for_admin(
+        page=page,
+        per_page=per_page,
+        status=status,
+        ad_type=ad_type,
+        fieldset=FieldSet.from_args(request.args),
+    )
 
     return (
         jsonify(
@@ -63,7 +66,7 @@ def get_all_ads(current_admin):
                 "ads": result,
                 "page": page,
                 "per_page": per_page,
-                "total": len(ads),
+                "total": total,
                 "filters": {"status": status, "type": ad_type},
             }
         ),
@@ -91,6 +94,10 @@ def create_ad(current_admin):
             400,
         )
 
+    delivery_fields, error = parse_delivery_fields(data)
+    if error:
+        return jsonify({"msg": error}), 400
+
     ad_repo = get_ad_repo()
 
     start_date = None
@@ -113,8 +120,10 @@ def create_ad(current_admin):
             "end_date": end_date,
             "impressions_count": 0,
             "clicks_count": 0,
+            **delivery_fields,
         }
     )
+    get_ad_inventory().invalidate()
     return jsonify(ad.to_dict()), 201
 
 
@@ -129,25 +138,20 @@ def get_ad(current_admin, ad_id):
 
     ad_data = ad.to_dict()
 
-    ad_data["ctr"] = (
-        round((ad.clicks_count / ad.impressions_count * 100), 2)
-        if ad.impressions_count > 0
-        else 0
-    )
-    ad_data["status"] = (
-        "active"
-        if ad.is_active and (not ad.end_date or ad.end_date > datetime.now())
-        else "inactive"
-    )
-    if ad.end_date and ad.end_date < datetime.now():
-        ad_data["status"] = "expired"
+    impressions, clicks = get_ad_event_buffer().live_counts([ad])[ad.id]
+    ad_data["impressions_count"] = impressions
+    ad_data["clicks_count"] = clicks
+    ad_data["ctr"] = round((clicks / impressions * 100), 2) if impressions > 0 else 0
+    ad_data["status"] = ad_status(ad, datetime.now())
 
+    since = (datetime.now() - timedelta(days=RECENT_PERFORMANCE_DAYS - 1)).date()
+    recent_impressions, recent_clicks, days_active = (
+        get_ad_stats_repo().get_period_totals(ad.id, since)
+    )
     ad_data["recent_performance"] = {
-        "daily_impressions": (
-            ad.impressions_count // 30 if ad.impressions_count > 0 else 0
-        ),
-        "daily_clicks": ad.clicks_count // 30 if ad.clicks_count > 0 else 0,
-        "days_active": 30,
+        "daily_impressions": recent_impressions // RECENT_PERFORMANCE_DAYS,
+        "daily_clicks": recent_clicks // RECENT_PERFORMANCE_DAYS,
+        "days_active": days_active,
     }
 
     return jsonify(ad_data), 200
@@ -198,7 +202,13 @@ def update_ad(current_admin, ad_id):
         else:
             update_data["end_date"] = None
 
+    delivery_fields, error = parse_delivery_fields(data)
+    if error:
+        return jsonify({"msg": error}), 400
+    update_data.update(delivery_fields)
+
     updated_ad = ad_repo.update(ad, update_data)
+    get_ad_inventory().invalidate()
     return jsonify(updated_ad.to_dict()), 200
 
 
@@ -212,6 +222,7 @@ def delete_ad(current_admin, ad_id):
         raise ValueError("Рекламне оголошення не знайдено")
 
     ad_repo.delete(ad)
+    get_ad_inventory().invalidate()
     return jsonify({"msg": "Рекламне оголошення видалено"}), 200
 
 
@@ -225,6 +236,7 @@ def toggle_ad_status(current_admin, ad_id):
         raise ValueError("Рекламне оголошення не знайдено")
 
     updated_ad = ad_repo.update(ad, {"is_active": not ad.is_active})
+    get_ad_inventory().invalidate()
     return (
         jsonify(
             {
@@ -236,70 +248,103 @@ def toggle_ad_status(current_admin, ad_id):
     )
 
 
+@ad_bp.route("/<int:ad_id>/timeseries", methods=["GET"])
+@admin_token_required
+def get_ad_timeseries(current_admin, ad_id):
+    """Покази, кліки та CTR оголошення по годинах або днях з агрегатів"""
+    granularity = request.args.get("granularity", "day")
+    if granularity not in ("hour", "day"):
+        return jsonify({"msg": "granularity має бути 'hour' або 'day'"}), 400
+    days = min(max(request.args.get("days", 7, type=int), 1), MAX_TIMESERIES_DAYS)
+
+    if not get_ad_repo().get_by(id=ad_id):
+        raise ValueError("Рекламне оголошення не знайдено")
+
+    since = datetime.now() - timedelta(days=days)
+    if granularity == "day":
+        since += timedelta(days=1)
+    rows = get_ad_stats_repo().get_time_series(ad_id, granularity, since)
+
+    series = [
+        {
+            "period": period.isoformat(),
+            "impressions": impressions,
+            "clicks": clicks,
+            "ctr": round((clicks / impressions * 100), 2) if impressions > 0 else 0,
+        }
+        for period, impressions, clicks in rows
+    ]
+    return (
+        jsonify(
+            {"ad_id": ad_id, "granularity": granularity, "days": days, "series": series}
+        ),
+        200,
+    )
+
+
 @ad_bp.route("/statistics", methods=["GET"])
 @admin_token_required
 def get_ads_statistics(current_admin):
-    """Отримує загальну статистику по рекламі"""
+    """
+    Отримує загальну статистику по рекламі: лічильники агрегуються в SQL,
+    найефективніші оголошення — з добових агрегатів за останні `days` днів.
+    """
+    days = min(
+        max(request.args.get("days", RECENT_PERFORMANCE_DAYS, type=int), 1),
+        MAX_TIMESERIES_DAYS,
+    )
     ad_repo = get_ad_repo()
-    ads = ad_repo.get_all()
-
-    current_time = datetime.now()
-
-    stats = {
-        "total_ads": len(ads),
-        "active_ads": len(
-            [
-                ad
-                for ad in ads
-                if ad.is_active and (not ad.end_date or ad.end_date > current_time)
-            ]
-        ),
-        "inactive_ads": len([ad for ad in ads if not ad.is_active]),
-        "expired_ads": len(
-            [ad for ad in ads if ad.end_date and ad.end_date < current_time]
-        ),
-        "total_impressions": sum([ad.impressions_count for ad in ads]),
-        "total_clicks": sum([ad.clicks_count for ad in ads]),
+
+    stats = get_ad_inventory().get_status_counts()
+
+    ad_types_stats = {
+        ad_type: {"count": count, "impressions": impressions, "clicks": clicks}
+        for ad_type, count, impressions, clicks in ad_repo.get_counters_by_type()
     }
 
+    # Ще не записані з буфера покази та кліки цього процесу
+    pending = get_ad_event_buffer().pending_counts()
+    pending_types = ad_repo.get_types_by_ids(pending.keys())
+    for ad_id, (impressions, clicks) in pending.items():
+        ad_type = pending_types.get(ad_id)
+        if ad_type in ad_types_stats:
+            ad_types_stats[ad_type]["impressions"] += impressions
+            ad_types_stats[ad_type]["clicks"] += clicks
+
+    stats["total_impressions"] = sum(
+        type_stats["impressions"] for type_stats in ad_types_stats.values()
+    )
+    stats["total_clicks"] = sum(
+        type_stats["clicks"] for type_stats in ad_types_stats.values()
+    )
     stats["overall_ctr"] = (
         round((stats["total_clicks"] / stats["total_impressions"] * 100), 2)
         if stats["total_impressions"] > 0
         else 0
     )
 
-    ad_types_stats = {}
-    for ad in ads:
-        if ad.ad_type not in ad_types_stats:
-            ad_types_stats[ad.ad_type] = {"count": 0, "impressions": 0, "clicks": 0}
-        ad_types_stats[ad.ad_type]["count"] += 1
-        ad_types_stats[ad.ad_type]["impressions"] += ad.impressions_count
-        ad_types_stats[ad.ad_type]["clicks"] += ad.clicks_count
-
-    for ad_type in ad_types_stats:
-        impressions = ad_types_stats[ad_type]["impressions"]
-        clicks = ad_types_stats[ad_type]["clicks"]
-        ad_types_stats[ad_type]["ctr"] = (
+    for type_stats in ad_types_stats.values():
+        impressions = type_stats["impressions"]
+        clicks = type_stats["clicks"]
+        type_stats["ctr"] = (
             round((clicks / impressions * 100), 2) if impressions > 0 else 0
         )
 
     stats["by_type"] = ad_types_stats
 
-    top_ads = sorted(
-        [ad for ad in ads if ad.impressions_count > 0],
-        key=lambda x: x.clicks_count / x.impressions_count,
-        reverse=True,
-    )[:5]
-
+    since = (datetime.now() - timedelta(days=days - 1)).date()
     stats["top_performing"] = [
         {
-            "id": ad.id,
-            "title": ad.title,
-            "ctr": round((ad.clicks_count / ad.impressions_count * 100), 2),
-            "impressions": ad.impressions_count,
-            "clicks": ad.clicks_count,
+            "id": ad_id,
+            "title": title,
+            "ctr": round((clicks / impressions * 100), 2),
+            "impressions": impressions,
+            "clicks": clicks,
         }
-        for ad in top_ads
+        for ad_id, title, impressions, clicks in get_ad_stats_repo().get_top_performing(
+            since
+        )
     ]
+    stats["top_performing_days"] = days
 
     return jsonify(stats), 200
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash
 from middleware.auth_middleware import admin_token_required
+from models.serialization import FieldSet
 from repositories import get_admin_repo
+from services.admin_user_service import AdminUserService
+from services.auth.password_hasher import get_password_hasher
+from services.auth.principal_cache import get_principal_cache
 
 admin_user_bp = Blueprint("admin_user", __name__)
 
@@ -10,14 +13,22 @@ admin_user_bp = Blueprint("admin_user", __name__)
 @admin_token_required
 def get_all_admin_users(current_admin):
     """Отримує всіх адміністраторів"""
+    fieldset = FieldSet.from_args(request.args)
     admin_repo = get_admin_repo()
-    admin_users = admin_repo.get_all()
+    admin_users = admin_repo.get_all(fieldset)
 
-    result = [admin.to_dict() for admin in admin_users]
+    result = [admin.to_dict(fieldset) for admin in admin_users]
 
     return jsonify({"admin_users": result, "total": len(result)}), 200
 
 
+@admin_user_bp.route("/principal-cache", methods=["GET"])
+@admin_token_required
+def get_principal_cache_stats(current_admin):
+    """Лічильники кешу principal цього процесу (для підбору розміру й TTL)"""
+    return jsonify(get_principal_cache().stats()), 200
+
+
 @admin_user_bp.route("/<int:admin_id>", methods=["GET"])
 @admin_token_required
 def get_admin_user(current_admin, admin_id):
@@ -58,7 +69,7 @@ def update_admin_user(current_admin, admin_id):
                     )
             update_data[field] = data.get(field)
 
-    updated_user = admin_repo.update(admin, update_data)
+    updated_user = AdminUserService(admin_repo).update_admin(admin, update_data)
 
     return jsonify(updated_user.to_dict()), 200
 
@@ -75,7 +86,7 @@ def delete_admin_user(current_admin, admin_id):
     if not admin:
         raise ValueError("Адміністратора не знайдено")
 
-    admin_repo.delete(admin)
+    AdminUserService(admin_repo).delete_admin(admin)
     return jsonify({"msg": "Адміністратора видалено"}), 200
 
 
@@ -96,7 +107,7 @@ def change_admin_password(current_admin, admin_id):
     if not user:
         raise ValueError("Адміністратора не знайдено")
 
-    hashed_password = generate_password_hash(data.get("new_password"))
-    admin_repo.update(user, {"password": hashed_password})
+    hashed_password = get_password_hasher().hash(data.get("new_password"))
+    AdminUserService(admin_repo).update_admin(user, {"password": hashed_password})
 
     return jsonify({"msg": "Пароль успішно змінено"}), 200
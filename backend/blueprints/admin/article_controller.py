@@ -1,6 +1,8 @@
 from flask import Blueprint, g, request, jsonify
 from middleware.auth_middleware import admin_token_required
+from middleware.cache_middleware import purge_cache
 from models.article import Article
+from models.serialization import FieldSet
 from repositories import get_article_repo
 from services.article_service import ArticleService
 from services.notification_service import notification_service
@@ -8,6 +10,14 @@ from services.notification_service import notification_service
 article_bp = Blueprint("article", __name__)
 
 
+def article_cache_tags(article: Article) -> set[str]:
+    """Теги кешу, які зачіпає зміна статті: списки, сама стаття, автор, категорія."""
+    tags = {"articles", f"article:{article.id}", f"author:{article.author_id}"}
+    if article.category_id:
+        tags.add(f"category:{article.category_id}")
+    return tags
+
+
 @article_bp.route("/", methods=["GET"])
 @admin_token_required
 def get_all_articles(current_admin):
@@ -16,6 +26,7 @@ def get_all_articles(current_admin):
     per_page = request.args.get("per_page", 1000, type=int)
     status = request.args.get("status")
     category_id = request.args.get("category", type=int)
+    fieldset = FieldSet.from_args(request.args)
 
     filters = {}
     if status:
@@ -24,10 +35,10 @@ def get_all_articles(current_admin):
         filters["category_id"] = category_id
 
     article_service = ArticleService(get_article_repo())
-    articles, total = article_service.get_articles(
-        page=page, per_page=per_page, filters=filters
+    articles, total, _ = article_service.get_articles(
+        page=page, per_page=per_page, filters=filters, fieldset=fieldset
     )
-    result = [article.to_dict(metadata=True) for article in articles]
+    result = [article.to_dict(metadata=True, fieldset=fieldset) for article in articles]
     return (
         jsonify(
             {"articles": result, "page": page, "per_page": per_page, "total": total}
@@ -59,6 +70,7 @@ def create_article(current_admin):
             "is_breaking": data.get("is_breaking", False),
         }
     )
+    purge_cache(*article_cache_tags(article))
     return jsonify(article.to_dict()), 201
 
 
@@ -82,6 +94,7 @@ def update_article(current_admin, article_id):
     if not article:
         raise ValueError("Статтю не знайдено")
 
+    stale_tags = article_cache_tags(article)
     old_status = article.status
     new_status = data.get("status", old_status)
 
@@ -108,6 +121,7 @@ def update_article(current_admin, article_id):
             update_data[field] = data.get(field)
 
     updated_article = article_repo.update(article, update_data)
+    purge_cache(*stale_tags, *article_cache_tags(updated_article))
     return jsonify(updated_article.to_dict()), 200
 
 
@@ -120,7 +134,9 @@ def delete_article(current_admin, article_id):
     if not article:
         raise ValueError("Статтю не знайдено")
 
+    stale_tags = article_cache_tags(article)
     article_repo.delete(article)
+    purge_cache(*stale_tags)
     return jsonify({"msg": "Статтю видалено"}), 200
 
 
@@ -155,4 +171,5 @@ def update_article_status(current_admin, article_id):
         notification_service.notify(article, g.db_session)
 
     updated_article = article_repo.update(article, {"status": data.get("status")})
+    purge_cache(*article_cache_tags(updated_article))
     return jsonify(updated_article.to_dict()), 200
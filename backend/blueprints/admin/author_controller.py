@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from middleware.auth_middleware import admin_token_required
+from middleware.cache_middleware import purge_cache
+from models.serialization import FieldSet
 from repositories import get_author_repo, get_article_repo
 
 author_bp = Blueprint("author", __name__)
@@ -12,9 +14,12 @@ def get_all_authors(current_admin):
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 1000, type=int)
     search = request.args.get("search", "")
+    fieldset = FieldSet.from_args(request.args)
 
+    # Пошук виконується в Python (регістр кирилиці в SQLite не враховується),
+    # тож для нього вибираються всі поля авторів
     author_repo = get_author_repo()
-    authors = author_repo.get_all()
+    authors = author_repo.get_all(None if search else fieldset)
 
     if search:
         search_lower = search.lower()
@@ -28,7 +33,7 @@ def get_all_authors(current_admin):
 
     start = (page - 1) * per_page
     end = start + per_page
-    paginated_authors = [author.to_dict() for author in authors[start:end]]
+    paginated_authors = [author.to_dict(fieldset) for author in authors[start:end]]
 
     return (
         jsonify(
@@ -77,9 +82,9 @@ def get_author(current_admin, author_id):
 
     author_data = author.to_dict()
 
-    recent_articles = sorted(author.articles, key=lambda x: x.created_at, reverse=True)[
-        :5
-    ]
+    recent_articles, _, _ = get_article_repo().get_all(
+        per_page=5, filters={"author_id": author_id}, totals="none", profile=None
+    )
     author_data["recent_articles"] = [
         {
             "id": article.id,
@@ -116,6 +121,11 @@ def update_author(current_admin, author_id):
             update_data[field] = data.get(field)
 
     updated_author = author_repo.update(author, update_data)
+
+    if "first_name" in update_data or "last_name" in update_data:
+        get_article_repo().reindex_author_articles(author_id)
+
+    purge_cache(f"author:{author_id}")
     return jsonify(updated_author.to_dict()), 200
 
 
@@ -128,23 +138,19 @@ def delete_author(current_admin, author_id):
     if not author:
         raise ValueError("Автора не знайдено")
 
-    article_repo = get_article_repo()
-    author_articles = [
-        article for article in article_repo.get_all() if article.author_id == author_id
-    ]
-
-    if author_articles:
+    if author.articles_count:
         return (
             jsonify(
                 {
                     "msg": "Неможливо видалити автора, оскільки у нього є статті",
-                    "articles_count": len(author_articles),
+                    "articles_count": author.articles_count,
                 }
             ),
             400,
         )
 
     author_repo.delete(author)
+    purge_cache(f"author:{author_id}")
     return jsonify({"msg": "Автора видалено"}), 200
 
 
@@ -155,6 +161,7 @@ def get_author_articles(current_admin, author_id):
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
     status = request.args.get("status")
+    fieldset = FieldSet.from_args(request.args)
 
     author_repo = get_author_repo()
     author = author_repo.get_by(id=author_id)
@@ -166,22 +173,15 @@ def get_author_articles(current_admin, author_id):
     if status:
         db_filters["status"] = status
 
-    author_articles = article_repo.get_all_by(**db_filters)
-
-    if status:
-        author_articles = [
-            article for article in author_articles if article.status == status
-        ]
-
-    author_articles = sorted(
-        author_articles, key=lambda x: x.created_at or "", reverse=True
+    author_articles, total, _ = article_repo.get_all(
+        page=page,
+        per_page=per_page,
+        filters=db_filters,
+        profile="admin",
+        fieldset=fieldset,
     )
 
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_articles = author_articles[start:end]
-
-    result = [article.to_dict() for article in paginated_articles]
+    result = [article.to_dict(fieldset=fieldset) for article in author_articles]
 
     return (
         jsonify(
@@ -190,7 +190,7 @@ def get_author_articles(current_admin, author_id):
                 "author": author.to_dict(),
                 "page": page,
                 "per_page": per_page,
-                "total": len(author_articles),
+                "total": total,
                 "status_filter": status,
             }
         ),
@@ -208,9 +208,7 @@ def get_author_statistics(current_admin, author_id):
         raise ValueError("Автора не знайдено")
 
     article_repo = get_article_repo()
-    author_articles = [
-        article for article in article_repo.get_all() if article.author_id == author_id
-    ]
+    author_articles = article_repo.get_all_by(author_id=author_id)
 
     stats = {
         "author": author.to_dict(),
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from middleware.auth_middleware import admin_token_required
+from middleware.cache_middleware import purge_cache
+from models.serialization import FieldSet
 from repositories import get_category_repo, get_article_repo
 from slugify import slugify
 
@@ -13,8 +15,9 @@ def get_all_categories(current_admin):
     category_repo = get_category_repo()
     article_repo = get_article_repo()  # Не використовується, але залишено
 
-    categories = category_repo.get_all()
-    result = [category.to_dict() for category in categories]
+    fieldset = FieldSet.from_args(request.args)
+    categories = category_repo.get_all(fieldset)
+    result = [category.to_dict(fieldset) for category in categories]
 
     return jsonify({"categories": result, "total": len(result)}), 200
 
@@ -49,6 +52,7 @@ def create_category(current_admin):
             "is_searchable": data.get("is_searchable", True),
         }
     )
+    purge_cache("categories")
     return jsonify(category.to_dict()), 201
 
 
@@ -98,6 +102,7 @@ def update_category(current_admin, category_id):
         update_data["is_searchable"] = data.get("is_searchable")
 
     updated_category = category_repo.update(category, update_data)
+    purge_cache(f"category:{category_id}")
     return jsonify(updated_category.to_dict()), 200
 
 
@@ -105,25 +110,24 @@ def update_category(current_admin, category_id):
 @admin_token_required
 def delete_category(current_admin, category_id):
     """Видаляє категорію (ОНОВЛЕНО: з перевіркою на статті)"""
-    article_repo = get_article_repo()
-    articles = article_repo.get_all_by(category_id=category_id)
-    if articles:
+    category_repo = get_category_repo()
+    category = category_repo.get_by(id=category_id)
+    if not category:
+        raise ValueError("Категорію не знайдено")
+
+    if category.articles_count:
         return (
             jsonify(
                 {
                     "msg": "Неможливо видалити категорію, оскільки у неї є статті",
-                    "articles_count": len(articles),
+                    "articles_count": category.articles_count,
                 }
             ),
             400,
         )
 
-    category_repo = get_category_repo()
-    category = category_repo.get_by(id=category_id)
-    if not category:
-        raise ValueError("Категорію не знайдено")
-
     category_repo.delete(category)
+    purge_cache(f"category:{category_id}")
     return jsonify({"msg": "Категорію видалено"}), 200
 
 
@@ -135,10 +139,17 @@ def get_category_articles(current_admin, category_id):
     if not category:
         raise ValueError("Категорію не знайдено")
 
+    fieldset = FieldSet.from_args(request.args)
+    articles = get_article_repo().get_all_by(
+        profile="admin", fieldset=fieldset, category_id=category_id
+    )
+
     return (
         jsonify(
             {
-                "articles": [article.to_dict() for article in category.articles],
+                "articles": [
+                    article.to_dict(fieldset=fieldset) for article in articles
+                ],
             }
         ),
         200,
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from middleware.auth_middleware import admin_token_required
+from middleware.cache_middleware import purge_cache
+from models.serialization import FieldSet
 from repositories import get_subscription_repo
+from services.subscribtion_service import SubscriptionService
 
 subscription_bp = Blueprint("subscription", __name__)
 
@@ -9,9 +12,10 @@ subscription_bp = Blueprint("subscription", __name__)
 @admin_token_required
 def get_all_plans(current_admin):
     """Отримує всі плани підписок"""
+    fieldset = FieldSet.from_args(request.args)
     subscription_repo = get_subscription_repo()
-    plans = subscription_repo.get_all()
-    result = [plan.to_dict() for plan in plans]
+    plans = subscription_repo.get_all(fieldset)
+    result = [plan.to_dict(fieldset) for plan in plans]
     return jsonify({"plans": result, "total": len(result)}), 200
 
 
@@ -35,6 +39,7 @@ def create_plan(current_admin):
             "description": data.get("description", ""),
         }
     )
+    purge_cache("plans")
     return jsonify(plan.to_dict()), 201
 
 
@@ -72,6 +77,9 @@ def update_plan(current_admin, plan_id):
             update_data[field] = data.get(field)
 
     updated_plan = subscription_repo.update(plan, update_data)
+    if "permissions" in update_data:
+        SubscriptionService(subscription_repo).invalidate_plan_subscribers(plan_id)
+    purge_cache("plans")
     return jsonify(updated_plan.to_dict()), 200
 
 
@@ -84,5 +92,7 @@ def delete_plan(current_admin, plan_id):
     if not plan:
         raise ValueError("План не знайдено")
 
+    SubscriptionService(subscription_repo).invalidate_plan_subscribers(plan_id)
     subscription_repo.delete(plan)
+    purge_cache("plans")
     return jsonify({"msg": "План видалено"}), 200
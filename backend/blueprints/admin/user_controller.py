@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify
 from middleware.auth_middleware import admin_token_required
+from models.serialization import FieldSet
 from repositories import get_user_repo, get_subscription_repo
 from services.subscribtion_service import SubscriptionService
+from services.user_admin_service import UserAdminService
 
 user_bp = Blueprint("user", __name__)
 
@@ -13,21 +15,25 @@ def get_all_users(current_admin):
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
 
-    user_repo = get_user_repo()
-    users = user_repo.get_all()
+    fieldset = FieldSet.from_args(request.args)
 
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_users = users[start:end]
+    user_repo = get_user_repo()
+    users, total = user_repo.get_all_paginated(
+        page=page,
+        per_page=per_page,
+        order_by_col="id",
+        order_desc=False,
+        fieldset=fieldset,
+    )
 
-    result = [user.to_dict() for user in paginated_users]
+    result = [user.to_dict(fieldset) for user in users]
     return (
         jsonify(
             {
                 "users": result,
                 "page": page,
                 "per_page": per_page,
-                "total": len(users),
+                "total": total,
             }
         ),
         200,
@@ -78,7 +84,7 @@ def update_user(current_admin, user_id):
                     )
             update_data[field] = data.get(field)
 
-    updated_user = user_repo.update(user, update_data)
+    updated_user = UserAdminService(user_repo).update_user(user, update_data)
     return jsonify(updated_user.to_dict()), 200
 
 
@@ -91,7 +97,7 @@ def delete_user(current_admin, user_id):
     if not user:
         raise ValueError("Користувача не знайдено")
 
-    user_repo.delete(user)
+    UserAdminService(user_repo).delete_user(user)
     return jsonify({"msg": "Користувача видалено"}), 200
 
 
@@ -1,19 +1,60 @@
 from flask import Blueprint, request, jsonify
 from middleware.ads_middleware import ads_injector
+from middleware.cache_middleware import cached_response
+from middleware.viewer_middleware import request_session_id
 from middleware.auth_middleware import (
     token_optional,
     token_required,
     permission_required,
 )
-from repositories import get_article_repo
+from models.serialization import FieldSet
+from repositories import get_ad_repo, get_article_repo, get_recommendation_repo
+from repositories.totals import parse_totals_mode
+from services.ad_service import AdService
 from services.article_service import ArticleService
+from services.beacon import get_beacon_signer
+from services.recommendation_service import RecommendationService
 
 article_bp = Blueprint("article", __name__)
 
+MAX_IMPRESSIONS_BATCH = 100
+
+
+def with_beacon(article: dict) -> dict:
+    """Додає до статті підписаний маяк показу для /beacon."""
+    return {**article, "beacon": get_beacon_signer().sign("article", article["id"])}
+
+
+def cursor_page(items: list, next_cursor, cursor) -> list | dict:
+    """
+    Тіло списку збережених/вподобаних статей. У курсорному режимі
+    (?cursor=) — {"articles", "next_cursor"}, як у стрічках; без нього —
+    простий список, як і раніше.
+    """
+    if cursor is None:
+        return items
+    return {"articles": items, "next_cursor": next_cursor}
+
+
+def article_list_tags(payload: dict) -> set[str]:
+    """
+    Теги кешу для списку статей: сам список та кожна стаття/автор/категорія.
+    Автор і категорія, не запитані через fields=/include=, тегів не дають.
+    """
+    tags = {"articles"}
+    for article in payload["articles"]:
+        tags.add(f"article:{article['id']}")
+        if article.get("author"):
+            tags.add(f"author:{article['author']['id']}")
+        if article.get("category"):
+            tags.add(f"category:{article['category']['id']}")
+    return tags
+
 
 @article_bp.route("/", methods=["GET"])
 @token_optional
 @ads_injector(ad_type="sidebar")
+@cached_response(article_list_tags, vary_by_permissions=True)
 def get_articles(current_user, ads=[]):
     """Отримує список статей"""
     page = request.args.get("page", 1, type=int)
@@ -21,6 +62,9 @@ def get_articles(current_user, ads=[]):
     status = request.args.get("status")
     category_id = request.args.get("category", type=int)
     category_slug = request.args.get("category_slug", type=str)
+    cursor = request.args.get("cursor")
+    totals = parse_totals_mode(request.args)
+    fieldset = FieldSet.from_args(request.args)
     filters = {}
     if status:
         filters["status"] = status
@@ -34,10 +78,18 @@ def get_articles(current_user, ads=[]):
     article_repo = get_article_repo()
     article_service = ArticleService(article_repo)
 
-    articles, total = article_service.get_articles(
-        page=page, per_page=per_page, filters=filters
+    articles, total, next_cursor = article_service.get_articles(
+        page=page,
+        per_page=per_page,
+        filters=filters,
+        cursor=cursor,
+        totals=totals,
+        fieldset=fieldset,
     )
-    result = [article.to_dict(metadata=True) for article in articles]
+    result = [
+        with_beacon(article.to_dict(metadata=True, fieldset=fieldset))
+        for article in articles
+    ]
     return (
         jsonify(
             {
@@ -46,6 +98,7 @@ def get_articles(current_user, ads=[]):
                 "page": page,
                 "per_page": per_page,
                 "total": total,
+                "next_cursor": next_cursor,
             }
         ),
         200,
@@ -61,28 +114,34 @@ def get_recommended_articles(current_user, ads=[]):
     per_page = request.args.get("per_page", 5, type=int)
     status = request.args.get("satus", "published", type=str)
     current_article_id = request.args.get("article_id", type=int)
+    cursor = request.args.get("cursor")
+    totals = parse_totals_mode(request.args)
+    fieldset = FieldSet.from_args(request.args)
 
-    article_repo = get_article_repo()
-    article_service = ArticleService(article_repo)
+    recommendation_service = RecommendationService(
+        get_article_repo(), get_recommendation_repo()
+    )
 
     filters = {"status": status}
 
-    preferences = current_user.preferences or {}
-    fav_category_slugs = preferences.get("favorite_categories", [])
-
     if not getattr(current_user, "permissions", {}).get("exclusive_content", False):
         filters["is_exclusive"] = False
 
-    articles, total = article_service.get_recommended_articles(
-        user_id=current_user.id,
+    articles, total, next_cursor = recommendation_service.get_recommended_articles(
+        current_user,
         page=page,
         per_page=per_page,
-        favorite_category_slugs=fav_category_slugs,
         filters=filters,
         current_article_id=current_article_id,
+        cursor=cursor,
+        totals=totals,
+        fieldset=fieldset,
     )
 
-    result = [article.to_dict(metadata=True) for article in articles]
+    result = [
+        with_beacon(article.to_dict(metadata=True, fieldset=fieldset))
+        for article in articles
+    ]
     return (
         jsonify(
             {
@@ -91,6 +150,7 @@ def get_recommended_articles(current_user, ads=[]):
                 "page": page,
                 "per_page": per_page,
                 "total": total,
+                "next_cursor": next_cursor,
             }
         ),
         200,
@@ -105,6 +165,9 @@ def search_articles(current_user):
     per_page = request.args.get("per_page", 10, type=int)
     date_from = request.args.get("date_from")
     date_to = request.args.get("date_to")
+    cursor = request.args.get("cursor")
+    totals = parse_totals_mode(request.args)
+    fieldset = FieldSet.from_args(request.args)
 
     if not query:
         return jsonify({"msg": "Параметр 'q' є обов'язковим"}), 400
@@ -114,16 +177,22 @@ def search_articles(current_user):
 
     user_permissions = current_user.permissions if current_user else {}
 
-    articles, total = article_service.search_articles(
+    articles, total, next_cursor = article_service.search_articles(
         query,
         page,
         per_page,
         user_permissions=user_permissions,
         date_from=date_from,
         date_to=date_to,
+        cursor=cursor,
+        totals=totals,
+        fieldset=fieldset,
     )
 
-    result = [article.to_dict(metadata=True) for article in articles]
+    result = [
+        with_beacon(article.to_dict(metadata=True, fieldset=fieldset))
+        for article in articles
+    ]
 
     return (
         jsonify(
@@ -133,6 +202,7 @@ def search_articles(current_user):
                 "page": page,
                 "per_page": per_page,
                 "total": total,
+                "next_cursor": next_cursor,
                 "date_from": date_from,
                 "date_to": date_to,
             }
@@ -149,17 +219,16 @@ def get_article(current_user, ads, article_id):
     article_repo = get_article_repo()
     article_service = ArticleService(article_repo)
 
-    if current_user:
-        article = article_service.get_article_by_id(article_id, current_user.id)
-    else:
-        article = article_service.get_article_by_id(article_id)
-
-    if not getattr(current_user, "permissions", {}).get(
-        "exclusive_content", False
-    ) and article.get("is_exclusive", False):
-        raise PermissionError("Недостатньо прав для доступу до цього ресурсу")
+    article = article_service.get_article_by_id(
+        article_id,
+        current_user.id if current_user else None,
+        fieldset=FieldSet.from_args(request.args),
+        allow_exclusive=getattr(current_user, "permissions", {}).get(
+            "exclusive_content", False
+        ),
+    )
 
-    return jsonify({**article, "ads": ads}), 200
+    return jsonify({**with_beacon(article), "ads": ads}), 200
 
 
 @article_bp.route("/<int:article_id>/impression", methods=["POST"])
@@ -173,7 +242,7 @@ def record_article_impression(current_user, article_id):
     success = article_service.record_article_impression(
         article_id=article_id,
         user_id=current_user.id if current_user else None,
-        session_id=data.get("session_id"),
+        session_id=request_session_id(data.get("session_id")),
         ip_address=request.remote_addr,
     )
 
@@ -183,6 +252,58 @@ def record_article_impression(current_user, article_id):
         return jsonify({"msg": "Помилка при реєстрації показу"}), 500
 
 
+@article_bp.route("/impressions", methods=["POST"])
+@token_optional
+def record_impressions_batch(current_user):
+    """
+    Реєструє покази кількох карток статей та рекламних оголошень одним запитом.
+    Тіло: {"article_ids": [...], "ad_ids": [...], "session_id": "..."}
+    """
+    data = request.get_json(silent=True) or {}
+    article_ids = data.get("article_ids") or []
+    ad_ids = data.get("ad_ids") or []
+
+    for ids in (article_ids, ad_ids):
+        # bool — підклас int, тож true/false інакше стали б ID 1 та 0
+        if not isinstance(ids, list) or not all(type(i) is int for i in ids):
+            return jsonify({"msg": "article_ids та ad_ids мають бути списками ID"}), 400
+    if len(article_ids) + len(ad_ids) > MAX_IMPRESSIONS_BATCH:
+        return (
+            jsonify({"msg": f"Не більше {MAX_IMPRESSIONS_BATCH} показів за запит"}),
+            400,
+        )
+    # Повтор ID в одному запиті — той самий показ
+    article_ids = list(dict.fromkeys(article_ids))
+    ad_ids = list(dict.fromkeys(ad_ids))
+
+    tracking = {
+        "user_id": current_user.id if current_user else None,
+        "session_id": request_session_id(data.get("session_id")),
+        "ip_address": request.remote_addr,
+    }
+
+    recorded_articles = []
+    if article_ids:
+        recorded_articles = ArticleService(
+            get_article_repo()
+        ).record_article_impressions(article_ids, **tracking)
+
+    recorded_ads = []
+    if ad_ids:
+        recorded_ads = AdService(get_ad_repo()).record_impressions(ad_ids, **tracking)
+
+    return (
+        jsonify(
+            {
+                "msg": "Покази зареєстровано",
+                "articles_recorded": len(recorded_articles),
+                "ads_recorded": len(recorded_ads),
+            }
+        ),
+        200,
+    )
+
+
 @article_bp.route("/<int:article_id>/save", methods=["POST"])
 @token_required
 @permission_required("save_article")
@@ -240,14 +361,22 @@ def get_saved_articles(current_user):
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
     get_all_ids = request.args.get("ids", False, type=bool)
+    cursor = request.args.get("cursor")
 
     article_repo = get_article_repo()
     article_service = ArticleService(article_repo)
 
-    articles = article_service.get_saved_articles(current_user.id, page, per_page)
+    articles, next_cursor = article_service.get_saved_articles(
+        current_user.id,
+        page,
+        per_page,
+        cursor=cursor,
+        fieldset=FieldSet.from_args(request.args),
+    )
     if get_all_ids:
         articles = [article.get("id") for article in articles]
-    return jsonify(articles), 200
+
+    return jsonify(cursor_page(articles, next_cursor, cursor)), 200
 
 
 @article_bp.route("/liked", methods=["GET"])
@@ -256,9 +385,17 @@ def get_liked_articles(current_user):
     """Отримує статті, які лайкнув користувач"""
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
+    cursor = request.args.get("cursor")
 
     article_repo = get_article_repo()
     article_service = ArticleService(article_repo)
 
-    articles = article_service.get_liked_articles(current_user.id, page, per_page)
-    return jsonify(articles), 200
+    articles, next_cursor = article_service.get_liked_articles(
+        current_user.id,
+        page,
+        per_page,
+        cursor=cursor,
+        fieldset=FieldSet.from_args(request.args),
+    )
+
+    return jsonify(cursor_page(articles, next_cursor, cursor)), 200
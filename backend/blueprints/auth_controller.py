@@ -2,7 +2,12 @@ from flask import Blueprint, g, request, jsonify, make_response, render_template
 from middleware.auth_middleware import token_required
 from models.newsletter import NewsletterSubscription
 from services.subscribtion_service import SubscriptionService
-from repositories import get_subscription_repo, get_user_repo
+from repositories import (
+    get_recommendation_repo,
+    get_subscription_repo,
+    get_user_repo,
+)
+from services.auth.principal import load_user
 from services.auth.user import UserAuthService as AuthService
 from flask_jwt_extended import (
     get_jwt,
@@ -111,8 +116,9 @@ def update_preferences(current_user):
     if data is None:
         return jsonify({"msg": "Тіло запиту не може бути порожнім"}), 400
 
+    get_recommendation_repo().mark_stale(current_user.id)
     user_repo = get_user_repo()
-    updated_user = user_repo.update(current_user, {"preferences": data})
+    updated_user = user_repo.update(load_user(current_user), {"preferences": data})
     return jsonify({"user": updated_user.to_dict()}), 200
 
 
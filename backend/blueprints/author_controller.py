@@ -1,21 +1,26 @@
 from flask import Blueprint, g, request, jsonify
 from models.user import User
 from middleware.auth_middleware import token_optional, token_required
+from middleware.cache_middleware import cached_response
+from models.serialization import FieldSet
 from repositories import get_author_repo, get_article_repo
+from repositories.totals import parse_totals_mode
 from services.article_service import ArticleService
 
 author_bp = Blueprint("author", __name__)
 
 
 @author_bp.route("/<int:author_id>", methods=["GET"])
+@cached_response(lambda payload: {f"author:{payload['id']}"})
 def get_author(author_id):
     """Отримує публічну інформацію про автора за ID"""
+    fieldset = FieldSet.from_args(request.args)
     author_repo = get_author_repo()
-    author = author_repo.get_by(id=author_id)
+    author = author_repo.get_by_id(author_id, fieldset)
     if not author:
         raise ValueError("Автора не знайдено")
 
-    return jsonify(author.to_dict()), 200
+    return jsonify(author.to_dict(fieldset)), 200
 
 
 @author_bp.route("/<int:author_id>/articles", methods=["GET"])
@@ -24,6 +29,9 @@ def get_author_articles(current_user, author_id):
     """Отримує опубліковані статті автора"""
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
+    cursor = request.args.get("cursor")
+    totals = parse_totals_mode(request.args)
+    fieldset = FieldSet.from_args(request.args)
 
     filters = {"author_id": author_id, "status": "published"}
 
@@ -33,10 +41,15 @@ def get_author_articles(current_user, author_id):
     article_repo = get_article_repo()
     article_service = ArticleService(article_repo)
 
-    articles, total = article_service.get_articles(
-        page=page, per_page=per_page, filters=filters
+    articles, total, next_cursor = article_service.get_articles(
+        page=page,
+        per_page=per_page,
+        filters=filters,
+        cursor=cursor,
+        totals=totals,
+        fieldset=fieldset,
     )
-    result = [article.to_dict(metadata=True) for article in articles]
+    result = [article.to_dict(metadata=True, fieldset=fieldset) for article in articles]
     return (
         jsonify(
             {
@@ -44,6 +57,7 @@ def get_author_articles(current_user, author_id):
                 "page": page,
                 "per_page": per_page,
                 "total": total,
+                "next_cursor": next_cursor,
             }
         ),
         200,
@@ -54,8 +68,9 @@ def get_author_articles(current_user, author_id):
 @token_required
 def get_followed_authors(current_user: User):
     """Отримує список авторів, на яких підписаний поточний користувач"""
-    followed = current_user.followed_authors
-    result = [author.to_dict() for author in followed]
+    fieldset = FieldSet.from_args(request.args)
+    followed = get_author_repo().get_followed_by(current_user.id, fieldset)
+    result = [author.to_dict(fieldset) for author in followed]
     return jsonify({"authors": result, "total": len(result)}), 200
 
 
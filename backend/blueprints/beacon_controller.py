@@ -0,0 +1,79 @@
+import json
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from middleware.viewer_middleware import request_session_id
+from services.beacon import BeaconService
+
+# Запити до цього blueprint обслуговуються без сесії БД (див. app.py)
+beacon_bp = Blueprint("beacon", __name__)
+
+MAX_BEACON_EVENTS = 100
+BEACON_FIELDS = ("ads", "clicks", "articles")
+
+
+def _read_payload() -> dict:
+    """
+    GET (піксель): ?ads=..&clicks=..&articles=..&sid=.. зі списками маяків
+    через кому. POST (navigator.sendBeacon): ті самі поля в JSON-тілі;
+    sendBeacon надсилає рядок як text/plain, тож Content-Type не перевіряємо.
+    """
+    if request.method == "GET":
+        payload = {
+            field: [
+                beacon for beacon in request.args.get(field, "").split(",") if beacon
+            ]
+            for field in BEACON_FIELDS
+        }
+        payload["sid"] = request.args.get("sid")
+        return payload
+
+    try:
+        payload = json.loads(request.get_data(cache=False) or b"{}")
+    except ValueError:
+        return None
+    if not isinstance(payload, dict):
+        return None
+    for field in BEACON_FIELDS:
+        beacons = payload.get(field) or []
+        if not isinstance(beacons, list) or not all(
+            isinstance(beacon, str) for beacon in beacons
+        ):
+            return None
+        payload[field] = beacons
+    return payload
+
+
+def _beacon_user_id():
+    """ID користувача з JWT (cookie або заголовок) без звернення до БД."""
+    try:
+        verify_jwt_in_request(optional=True)
+        if get_jwt().get("type") != "user":
+            return None
+        identity = get_jwt_identity()
+    except Exception:
+        return None
+    return int(identity) if identity else None
+
+
+@beacon_bp.route("/", methods=["POST"])
+@beacon_bp.route("/pixel.gif", methods=["GET"])
+def record_beacon():
+    """Маяк відстеження показів і кліків. Відповідає 204 без тіла."""
+    payload = _read_payload()
+    if payload is None:
+        return jsonify({"msg": "Некоректне тіло маяка"}), 400
+    if sum(len(payload[field]) for field in BEACON_FIELDS) > MAX_BEACON_EVENTS:
+        return jsonify({"msg": f"Не більше {MAX_BEACON_EVENTS} подій за маяк"}), 400
+
+    session_id = payload.get("sid")
+    if not isinstance(session_id, str):
+        session_id = None
+    BeaconService().record(
+        ad_views=payload["ads"],
+        ad_clicks=payload["clicks"],
+        article_views=payload["articles"],
+        user_id=_beacon_user_id(),
+        session_id=request_session_id(session_id),
+        ip_address=request.remote_addr,
+    )
+    return "", 204
@@ -1,25 +1,34 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
+from middleware.cache_middleware import cached_response
+from models.serialization import FieldSet
 from repositories import get_category_repo
 
 category_bp = Blueprint("category", __name__)
 
 
 @category_bp.route("/", methods=["GET"])
+@cached_response(
+    lambda payload: {"categories"}
+    | {f"category:{category['id']}" for category in payload["categories"]}
+)
 def get_all_categories():
     """Отримує список всіх категорій"""
+    fieldset = FieldSet.from_args(request.args)
     category_repo = get_category_repo()
-    categories = category_repo.get_all()
-    result = [category.to_dict() for category in categories]
+    categories = category_repo.get_all(fieldset)
+    result = [category.to_dict(fieldset) for category in categories]
     return jsonify({"categories": result, "total": len(result)}), 200
 
 
 @category_bp.route("/slug/<string:slug>", methods=["GET"])
+@cached_response(lambda payload: {f"category:{payload['id']}"})
 def get_category_by_slug(slug):
     """Отримує одну категорію за її 'slug'"""
+    fieldset = FieldSet.from_args(request.args)
     category_repo = get_category_repo()
-    category = category_repo.get_by(slug=slug)
+    category = category_repo.get_by_slug(slug, fieldset)
 
     if not category:
         raise ValueError("Категорію не знайдено")
 
-    return jsonify(category.to_dict()), 200
+    return jsonify(category.to_dict(fieldset)), 200
@@ -1,7 +1,9 @@
 from flask import Blueprint, request, jsonify, g
 from middleware.auth_middleware import token_required
 from repositories import get_notification_repo
+from repositories.totals import count_total, parse_totals_mode
 from models.push_subscription import PushSubscription
+from models.serialization import FieldSet
 
 notification_bp = Blueprint("notification", __name__)
 
@@ -10,18 +12,21 @@ notification_bp = Blueprint("notification", __name__)
 @token_required
 def get_unread(current_user):
     """Отримує останні 5 непрочитаних сповіщень"""
+    fieldset = FieldSet.from_args(request.args)
     repo = get_notification_repo()
-    notifications = repo.get_unread_by_user(current_user.id, limit=5)
-    unread_count = (
-        repo.db_session.query(repo.model)
-        .filter_by(user_id=current_user.id, is_read=False)
-        .count()
+    notifications = repo.get_unread_by_user(
+        current_user.id, limit=5, fieldset=fieldset
+    )
+    unread_count = count_total(
+        repo.db_session.query(repo.model).filter_by(
+            user_id=current_user.id, is_read=False
+        )
     )
 
     return (
         jsonify(
             {
-                "notifications": [n.to_dict() for n in notifications],
+                "notifications": [n.to_dict(fieldset) for n in notifications],
                 "unread_count": unread_count,
             }
         ),
@@ -35,14 +40,18 @@ def get_all(current_user):
     """Отримує всі сповіщення з пагінацією"""
     page = request.args.get("page", 1, type=int)
     per_page = request.args.get("per_page", 10, type=int)
+    totals = parse_totals_mode(request.args)
+    fieldset = FieldSet.from_args(request.args)
 
     repo = get_notification_repo()
-    notifications, total = repo.get_all_by_user(current_user.id, page, per_page)
+    notifications, total = repo.get_all_by_user(
+        current_user.id, page, per_page, totals=totals, fieldset=fieldset
+    )
 
     return (
         jsonify(
             {
-                "notifications": [n.to_dict() for n in notifications],
+                "notifications": [n.to_dict(fieldset) for n in notifications],
                 "total": total,
                 "page": page,
                 "per_page": per_page,
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from middleware.auth_middleware import token_required
+from middleware.cache_middleware import cached_response
 from repositories import get_subscription_repo
 from services.subscribtion_service import SubscriptionService
 
@@ -7,6 +8,7 @@ subscription_bp = Blueprint("subscription", __name__)
 
 
 @subscription_bp.route("/", methods=["GET"])
+@cached_response(lambda payload: {"plans"})
 def get_plans():
     plans = SubscriptionService(get_subscription_repo()).list_plans()
     result = [plan.to_dict() for plan in plans]
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+
+
+class ICacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str):
+        pass
+
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> list:
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value, ttl: int | None = None):
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1) -> int:
+        """Атомарно збільшує цілочисельне значення (відсутнє = 0), повертає нове."""
+        pass
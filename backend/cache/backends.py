@@ -0,0 +1,92 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from cache import ICacheBackend
+
+
+class InMemoryLRUCache(ICacheBackend):
+    """
+    Кеш у пам'яті процесу з витісненням найдавніше використаних записів (LRU)
+    та необов'язковим TTL. Безпечний для потоків.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float | None, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys: list[str]) -> list:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value, ttl: int | None = None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] < time.monotonic():
+                entry = None
+            value = (entry[1] if entry else 0) + amount
+            self._entries[key] = (entry[0] if entry else None, value)
+            self._entries.move_to_end(key)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache(ICacheBackend):
+    """
+    Спільний для всіх процесів кеш у Redis. Значення серіалізуються в JSON.
+    Пакет redis імпортується лише при використанні цього бекенда.
+    """
+
+    def __init__(self, url: str, prefix: str = "news:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str):
+        raw = self.client.get(self.prefix + key)
+        return json.loads(raw) if raw is not None else None
+
+    def get_many(self, keys: list[str]) -> list:
+        if not keys:
+            return []
+        raws = self.client.mget([self.prefix + key for key in keys])
+        return [json.loads(raw) if raw is not None else None for raw in raws]
+
+    def set(self, key: str, value, ttl: int | None = None):
+        self.client.set(self.prefix + key, json.dumps(value), ex=ttl)
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def incr(self, key: str, amount: int = 1) -> int:
+        return self.client.incrby(self.prefix + key, amount)
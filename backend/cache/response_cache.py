@@ -0,0 +1,90 @@
+import uuid
+from typing import Iterable
+from cache import ICacheBackend
+
+
+class ResponseCache:
+    """
+    Кеш відповідей з інвалідацією за тегами.
+
+    Кожен тег має токен версії в бекенді. Запис запам'ятовує токени своїх
+    тегів на момент збереження і вважається дійсним, лише поки вони не
+    змінилися. purge() просто видає тегу новий токен — старі записи стають
+    недійсними без перебору ключів. Якщо токен тегу витіснено з бекенда,
+    записи з цим тегом теж вважаються недійсними.
+
+    Теги відомі лише з тіла відповіді, тож токени читаються після
+    обробника. Щоб відповідь, прочитану з БД до інвалідації, не зберегли з
+    уже новими токенами, purge() спершу змінює спільну епоху: set()
+    зберігає запис, лише якщо епоха та сама, що й у snapshot() перед
+    обробником.
+
+    З бекендом memory і токени, і записи живуть у кожному процесі окремо:
+    purge() інвалідовує лише процес, що обробив зміну, а інші віддають
+    старі відповіді до закінчення TTL. Для кількох воркерів потрібен redis.
+    """
+
+    KEY_PREFIX = "resp:"
+    TAG_PREFIX = "tag:"
+    EPOCH_KEY = "tag-epoch"
+
+    def __init__(self, backend: ICacheBackend, default_ttl: int = 60):
+        self.backend = backend
+        self.default_ttl = default_ttl
+
+    def _tag_keys(self, tags: Iterable[str]) -> list[str]:
+        return [self.TAG_PREFIX + tag for tag in tags]
+
+    def get(self, key: str):
+        entry = self.backend.get(self.KEY_PREFIX + key)
+        if entry is None:
+            return None
+
+        tags = list(entry["tags"])
+        current = self.backend.get_many(self._tag_keys(tags))
+        if any(
+            token is None or token != entry["tags"][tag]
+            for tag, token in zip(tags, current)
+        ):
+            return None
+        return entry["payload"]
+
+    def snapshot(self):
+        """Епоха інвалідацій до того, як обробник прочитає дані (для set)."""
+        return self.backend.get(self.EPOCH_KEY)
+
+    def set(
+        self,
+        key: str,
+        payload,
+        tags: Iterable[str],
+        snapshot,
+        ttl: int | None = None,
+    ) -> bool:
+        """
+        Зберігає відповідь. Повертає False, якщо після snapshot() була
+        інвалідація: відповідь могла бути прочитана ще до зміни.
+        """
+        tags = sorted(set(tags))
+        tag_keys = self._tag_keys(tags)
+        # Епоха читається після токенів, purge() змінює її перед токенами
+        *tokens, epoch = self.backend.get_many([*tag_keys, self.EPOCH_KEY])
+        if epoch != snapshot:
+            return False
+        for index, token in enumerate(tokens):
+            if token is None:
+                tokens[index] = uuid.uuid4().hex
+                self.backend.set(tag_keys[index], tokens[index])
+
+        self.backend.set(
+            self.KEY_PREFIX + key,
+            {"payload": payload, "tags": dict(zip(tags, tokens))},
+            ttl or self.default_ttl,
+        )
+        return True
+
+    def purge(self, *tags: str):
+        """Інвалідовує всі записи, позначені хоча б одним з тегів."""
+        self.backend.set(self.EPOCH_KEY, uuid.uuid4().hex)
+        for tag_key in self._tag_keys(tags):
+            self.backend.set(tag_key, uuid.uuid4().hex)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pathlib import Path
 from datetime import timedelta
 
@@ -8,6 +9,8 @@ BASE_DIR = Path(__file__).resolve().parent
 class Config:
     # Flask settings
     SECRET_KEY = os.environ.get("SECRET_KEY", "your-secret-key-here")
+    # JSON-відповіді через orjson (вивід той самий, що й у стандартного json)
+    FAST_JSON = os.environ.get("FAST_JSON", "true").lower() != "false"
 
     # Database settings
     DATABASE_TYPE = os.environ.get("DATABASE_TYPE", "sqlite")
@@ -19,6 +22,76 @@ class Config:
     JWT_COOKIE_CSRF_PROTECT = False
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Скільки секунд кешується версія прав користувача (claim pv)
+    PERMISSION_VERSION_TTL = int(os.environ.get("PERMISSION_VERSION_TTL", 60))
+    # Кеш розв'язаних principal (адмін/користувач) у пам'яті процесу. Токени
+    # поколінь для відкликання — в CACHE_BACKEND: з redis зміна чи видалення
+    # адміна діє в усіх воркерах одразу, з memory — через PRINCIPAL_CACHE_TTL
+    PRINCIPAL_CACHE_MAX_ENTRIES = int(
+        os.environ.get("PRINCIPAL_CACHE_MAX_ENTRIES", 10_000)
+    )
+    PRINCIPAL_CACHE_TTL = int(os.environ.get("PRINCIPAL_CACHE_TTL", 60))
+    # Параметри хешування паролів werkzeug, напр. "scrypt:32768:8:1" або
+    # "pbkdf2:sha256:600000" (None — типові). Старі хеші оновлюються при вході
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD")
+    # Потоки запитів у воркері (gunicorn --threads у Dockerfile)
+    WEB_THREADS = int(os.environ.get("WEB_THREADS", 8))
+    # Потоки хешування на процес і скільки потоків запитів можуть разом
+    # рахувати чи чекати хеш; решта входів — 503, решта потоків — читанням
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_THREADS = int(
+        os.environ.get("PASSWORD_HASH_THREADS", max(WEB_THREADS // 2, 1))
+    )
+
+    # Response cache settings ("memory" — LRU у процесі, "redis" — спільний).
+    # З memory інвалідація досягає лише воркера, що обробив зміну; інші
+    # воркери віддають старі відповіді до CACHE_DEFAULT_TTL секунд
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+    CACHE_REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 1024))
+    CACHE_DEFAULT_TTL = int(os.environ.get("CACHE_DEFAULT_TTL", 60))
+    # Токени поколінь total живуть у тому ж бекенді: з memory коміт в одному
+    # воркері не інвалідовує total в інших, і вони до TOTALS_CACHE_TTL секунд
+    # віддають старі total. Для кількох воркерів потрібен CACHE_BACKEND=redis
+    TOTALS_CACHE_TTL = int(os.environ.get("TOTALS_CACHE_TTL", 300))
+    AD_INVENTORY_TTL = int(os.environ.get("AD_INVENTORY_TTL", 60))
+    AD_SLATE_TOKEN_TTL = int(os.environ.get("AD_SLATE_TOKEN_TTL", 300))
+    AD_EVENT_BUFFER_SIZE = int(os.environ.get("AD_EVENT_BUFFER_SIZE", 500))
+    AD_EVENT_FLUSH_INTERVAL = float(os.environ.get("AD_EVENT_FLUSH_INTERVAL", 5))
+    AD_EVENT_BUFFER_MAX_PENDING = int(
+        os.environ.get("AD_EVENT_BUFFER_MAX_PENDING", 50_000)
+    )
+    AD_PACING_REFRESH = float(os.environ.get("AD_PACING_REFRESH", 5))
+    # memory — у процесі, shared — mmap-файл для воркерів одного хоста,
+    # cache — атомарний incr у кеш-бекенді (Redis для кількох вузлів)
+    AD_ROTATION_STATE = os.environ.get("AD_ROTATION_STATE", "memory")
+    AD_ROTATION_STATE_PATH = os.environ.get(
+        "AD_ROTATION_STATE_PATH",
+        os.path.join(tempfile.gettempdir(), "news-ad-rotation.bin"),
+    )
+    # Частотні обмеження: не більше AD_FREQUENCY_CAP показів оголошення
+    # глядачу за AD_FREQUENCY_WINDOW секунд, повтори в межах
+    # AD_DEDUPE_SECONDS не зараховуються. Лічильники — у пам'яті кожного
+    # воркера, тож ліміт діє на воркер: з gunicorn --workers=4 глядач може
+    # побачити оголошення до 4 * AD_FREQUENCY_CAP разів за вікно
+    AD_FREQUENCY_CAP = int(os.environ.get("AD_FREQUENCY_CAP", 3))
+    AD_FREQUENCY_WINDOW = int(os.environ.get("AD_FREQUENCY_WINDOW", 3600))
+    AD_DEDUPE_SECONDS = int(os.environ.get("AD_DEDUPE_SECONDS", 30))
+    # Очікувана кількість різних пар (глядач, оголошення) за вікно на процес
+    # і допустима частка хибних обмежень; від них залежить розмір фільтрів
+    AD_FREQUENCY_CAPACITY = int(os.environ.get("AD_FREQUENCY_CAPACITY", 250_000))
+    AD_FREQUENCY_ERROR_RATE = float(os.environ.get("AD_FREQUENCY_ERROR_RATE", 0.01))
+    # Кількість проксі перед застосунком (nginx), яким довіряти
+    # X-Forwarded-For/-Proto; 0 — заголовки ігноруються
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", 0))
+
+    # Write-behind буфер показів статей. Поки БД недоступна, в пам'яті
+    # лишається не більше IMPRESSION_BUFFER_MAX_PENDING показів
+    IMPRESSION_BUFFER_SIZE = int(os.environ.get("IMPRESSION_BUFFER_SIZE", 500))
+    IMPRESSION_FLUSH_INTERVAL = float(os.environ.get("IMPRESSION_FLUSH_INTERVAL", 5))
+    IMPRESSION_BUFFER_MAX_PENDING = int(
+        os.environ.get("IMPRESSION_BUFFER_MAX_PENDING", 50_000)
+    )
 
 
 class DefaultConfig(Config):
@@ -31,6 +104,7 @@ class TestingConfig(Config):
     TESTING = True
     DATABASE_TYPE = "sqlite"
     DATABASE_URL = "sqlite:///:memory:"
+    CACHE_BACKEND = "memory"
 
 
 config = {"testing": TestingConfig, "default": DefaultConfig}
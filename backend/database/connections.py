@@ -2,6 +2,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from database import IDatabaseConnection
 from models.base import Base
+from database.search import get_search_index
 
 
 class SQLiteDatabaseConnection(IDatabaseConnection):
@@ -19,6 +20,8 @@ class SQLiteDatabaseConnection(IDatabaseConnection):
 
     def create_tables(self):
         Base.metadata.create_all(bind=self.engine)
+        with self.engine.begin() as connection:
+            get_search_index(self.engine.dialect.name).create_schema(connection)
 
     @property
     def metadata(self):
@@ -42,6 +45,8 @@ class PostgreSQLDatabaseConnection(IDatabaseConnection):
 
     def create_tables(self):
         Base.metadata.create_all(bind=self.engine)
+        with self.engine.begin() as connection:
+            get_search_index(self.engine.dialect.name).create_schema(connection)
 
     @property
     def metadata(self):
@@ -0,0 +1,260 @@
+import re
+from abc import ABC, abstractmethod
+from sqlalchemy import Float, Integer, literal, or_, select, text
+from sqlalchemy.orm import Session
+from models.article import Article
+from models.author import Author
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(query_string: str) -> list[str]:
+    """Розбиває пошуковий запит на безпечні токени (без операторів FTS)."""
+    return TOKEN_PATTERN.findall(query_string or "")
+
+
+class IArticleSearchIndex(ABC):
+    """
+    Абстракція повнотекстового індексу статей.
+    match() повертає підзапит з колонками article_id та rank
+    (менше значення rank = релевантніший результат).
+    """
+
+    @abstractmethod
+    def create_schema(self, connection):
+        pass
+
+    @abstractmethod
+    def match(self, query_string: str):
+        pass
+
+    @abstractmethod
+    def index_article(self, db_session: Session, article: Article):
+        pass
+
+    @abstractmethod
+    def remove_article(self, db_session: Session, article_id: int):
+        pass
+
+    @abstractmethod
+    def rebuild(self, db_session: Session) -> int:
+        pass
+
+    def clear(self, db_session: Session):
+        pass
+
+    @staticmethod
+    def _author_name(article: Article) -> str:
+        author = article.author
+        return f"{author.first_name} {author.last_name}" if author else ""
+
+
+class SQLiteArticleSearchIndex(IArticleSearchIndex):
+    """FTS5-індекс: віртуальна таблиця articles_fts з rowid = articles.id."""
+
+    table_name = "articles_fts"
+    # Ваги bm25 для колонок (title, content, author_name)
+    weights = (10.0, 1.0, 5.0)
+
+    def create_schema(self, connection):
+        connection.execute(
+            text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table_name} "
+                "USING fts5(title, content, author_name, "
+                "tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        )
+
+    def match(self, query_string: str):
+        tokens = tokenize(query_string)
+        if not tokens:
+            return None
+
+        match_expression = " ".join(f'"{token}"*' for token in tokens)
+        weights = ", ".join(str(weight) for weight in self.weights)
+        return (
+            text(
+                f"SELECT rowid AS article_id, bm25({self.table_name}, {weights}) AS rank "
+                f"FROM {self.table_name} WHERE {self.table_name} MATCH :match"
+            )
+            .bindparams(match=match_expression)
+            .columns(article_id=Integer, rank=Float)
+            .subquery("search_hits")
+        )
+
+    def index_article(self, db_session: Session, article: Article):
+        self.remove_article(db_session, article.id)
+        db_session.execute(
+            text(
+                f"INSERT INTO {self.table_name} (rowid, title, content, author_name) "
+                "VALUES (:id, :title, :content, :author_name)"
+            ),
+            {
+                "id": article.id,
+                "title": article.title,
+                "content": article.content,
+                "author_name": self._author_name(article),
+            },
+        )
+
+    def remove_article(self, db_session: Session, article_id: int):
+        db_session.execute(
+            text(f"DELETE FROM {self.table_name} WHERE rowid = :id"), {"id": article_id}
+        )
+
+    def clear(self, db_session: Session):
+        db_session.execute(text(f"DELETE FROM {self.table_name}"))
+
+    def rebuild(self, db_session: Session) -> int:
+        self.clear(db_session)
+        result = db_session.execute(
+            text(
+                f"INSERT INTO {self.table_name} (rowid, title, content, author_name) "
+                "SELECT a.id, a.title, a.content, au.first_name || ' ' || au.last_name "
+                "FROM articles a JOIN authors au ON au.id = a.author_id"
+            )
+        )
+        return result.rowcount
+
+
+class PostgreSQLArticleSearchIndex(IArticleSearchIndex):
+    """tsvector-індекс в окремій таблиці article_search_index з GIN-індексом."""
+
+    table_name = "article_search_index"
+    config = "simple"
+
+    def _document_sql(self, title: str, author_name: str, content: str) -> str:
+        return (
+            f"setweight(to_tsvector('{self.config}', coalesce({title}, '')), 'A') || "
+            f"setweight(to_tsvector('{self.config}', coalesce({author_name}, '')), 'A') || "
+            f"setweight(to_tsvector('{self.config}', coalesce({content}, '')), 'B')"
+        )
+
+    def create_schema(self, connection):
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {self.table_name} ("
+                "article_id INTEGER PRIMARY KEY "
+                "REFERENCES articles (id) ON DELETE CASCADE, "
+                "document TSVECTOR NOT NULL)"
+            )
+        )
+        connection.execute(
+            text(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table_name}_document "
+                f"ON {self.table_name} USING GIN (document)"
+            )
+        )
+
+    def match(self, query_string: str):
+        tokens = tokenize(query_string)
+        if not tokens:
+            return None
+
+        ts_query = " & ".join(f"{token}:*" for token in tokens)
+        return (
+            text(
+                "SELECT article_id, -ts_rank_cd(document, q) AS rank "
+                f"FROM {self.table_name}, to_tsquery('{self.config}', :match) q "
+                "WHERE document @@ q"
+            )
+            .bindparams(match=ts_query)
+            .columns(article_id=Integer, rank=Float)
+            .subquery("search_hits")
+        )
+
+    def index_article(self, db_session: Session, article: Article):
+        document = self._document_sql(":title", ":author_name", ":content")
+        db_session.execute(
+            text(
+                f"INSERT INTO {self.table_name} (article_id, document) "
+                f"VALUES (:id, {document}) "
+                "ON CONFLICT (article_id) DO UPDATE SET document = EXCLUDED.document"
+            ),
+            {
+                "id": article.id,
+                "title": article.title,
+                "content": article.content,
+                "author_name": self._author_name(article),
+            },
+        )
+
+    def remove_article(self, db_session: Session, article_id: int):
+        db_session.execute(
+            text(f"DELETE FROM {self.table_name} WHERE article_id = :id"),
+            {"id": article_id},
+        )
+
+    def clear(self, db_session: Session):
+        db_session.execute(text(f"DELETE FROM {self.table_name}"))
+
+    def rebuild(self, db_session: Session) -> int:
+        self.clear(db_session)
+        document = self._document_sql(
+            "a.title", "au.first_name || ' ' || au.last_name", "a.content"
+        )
+        result = db_session.execute(
+            text(
+                f"INSERT INTO {self.table_name} (article_id, document) "
+                f"SELECT a.id, {document} "
+                "FROM articles a JOIN authors au ON au.id = a.author_id"
+            )
+        )
+        return result.rowcount
+
+
+class LikeArticleSearchIndex(IArticleSearchIndex):
+    """Запасний варіант без індексу: LIKE по заголовку, тексту та автору."""
+
+    def create_schema(self, connection):
+        pass
+
+    def match(self, query_string: str):
+        search_term = f"%{query_string}%"
+        return (
+            select(Article.id.label("article_id"), literal(0.0).label("rank"))
+            .join(Article.author)
+            .where(
+                or_(
+                    Article.title.like(search_term),
+                    Article.content.like(search_term),
+                    Author.first_name.like(search_term),
+                    Author.last_name.like(search_term),
+                )
+            )
+            .subquery("search_hits")
+        )
+
+    def index_article(self, db_session: Session, article: Article):
+        pass
+
+    def remove_article(self, db_session: Session, article_id: int):
+        pass
+
+    def rebuild(self, db_session: Session) -> int:
+        return 0
+
+
+SEARCH_INDEXES = {
+    "sqlite": SQLiteArticleSearchIndex,
+    "postgresql": PostgreSQLArticleSearchIndex,
+}
+
+
+def is_search_index_table(table_name: str) -> bool:
+    """
+    Чи належить таблиця індексу пошуку (разом з тіньовими таблицями FTS5
+    articles_fts_data, _idx, ...). Їх немає в моделях, тож autogenerate
+    Alembic не повинен пропонувати їх видалити.
+    """
+    return any(
+        table_name == index_class.table_name
+        or table_name.startswith(f"{index_class.table_name}_")
+        for index_class in SEARCH_INDEXES.values()
+    )
+
+
+def get_search_index(dialect_name: str) -> IArticleSearchIndex:
+    """Повертає реалізацію індексу для діалекту БД (LIKE, якщо немає)."""
+    index_class = SEARCH_INDEXES.get(dialect_name.lower(), LikeArticleSearchIndex)
+    return index_class()
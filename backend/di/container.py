@@ -1,6 +1,26 @@
 from typing import Dict, Any, TypeVar, Type
 from database import IDatabaseConnection
 from database.connections import SQLiteDatabaseConnection, PostgreSQLDatabaseConnection
+from cache import ICacheBackend
+from cache.backends import InMemoryLRUCache, RedisCache
+from cache.response_cache import ResponseCache
+from services.impression_buffer import ArticleImpressionBuffer
+from services.ad_inventory import AdInventory
+from services.ad_slates import AdSlates
+from services.beacon import BeaconSigner
+from services.auth.permission_versions import PermissionVersions
+from services.auth.principal_cache import PrincipalCache
+from services.auth.password_hasher import PasswordHasher
+from services.ad_event_buffer import AdEventBuffer
+from services.ad_strategy import WeightedAdStrategy, WeightedCtrAdStrategy
+from services.frequency_cap import AdFrequencyCapper
+from services.rotation_state import (
+    CacheRotationState,
+    InProcessRotationState,
+    IRotationStateBackend,
+    SharedMemoryRotationState,
+)
+from repositories.totals import TotalsCounter
 
 T = TypeVar("T")
 
@@ -30,8 +50,8 @@ container = DIContainer()
 def configure_dependencies(app_config):
     """Конфігурація залежностей"""
 
-    database_type = getattr(app_config, "DATABASE_TYPE", "sqlite")
-    database_url = getattr(app_config, "DATABASE_URL", "sqlite:///news.db")
+    database_type = app_config.get("DATABASE_TYPE", "sqlite")
+    database_url = app_config.get("DATABASE_URL", "sqlite:///news.db")
 
     if database_type.lower() == "sqlite":
         db_connection = SQLiteDatabaseConnection(database_url)
@@ -42,4 +62,121 @@ def configure_dependencies(app_config):
 
     container.register_instance(IDatabaseConnection, db_connection)
 
+    cache_backend_type = app_config.get("CACHE_BACKEND", "memory")
+    if cache_backend_type.lower() == "memory":
+        cache_backend = InMemoryLRUCache(app_config.get("CACHE_MAX_ENTRIES", 1024))
+    elif cache_backend_type.lower() == "redis":
+        cache_backend = RedisCache(app_config.get("CACHE_REDIS_URL"))
+    else:
+        raise ValueError(f"Unsupported cache backend: {cache_backend_type}")
+
+    container.register_instance(ICacheBackend, cache_backend)
+    container.register_instance(
+        PermissionVersions,
+        PermissionVersions(
+            db_connection,
+            cache_backend,
+            ttl=app_config.get("PERMISSION_VERSION_TTL", 60),
+        ),
+    )
+    container.register_instance(
+        PasswordHasher,
+        PasswordHasher(
+            app_config.get("PASSWORD_HASH_METHOD"),
+            max_workers=app_config.get("PASSWORD_HASH_WORKERS", 2),
+            max_concurrent=app_config.get("PASSWORD_HASH_THREADS", 4),
+        ),
+    )
+    container.register_instance(
+        PrincipalCache,
+        PrincipalCache(
+            app_config.get("PRINCIPAL_CACHE_MAX_ENTRIES", 10_000),
+            app_config.get("PRINCIPAL_CACHE_TTL", 60),
+            cache_backend,
+        ),
+    )
+    container.register_instance(
+        ResponseCache,
+        ResponseCache(cache_backend, app_config.get("CACHE_DEFAULT_TTL", 60)),
+    )
+
+    totals_counter = TotalsCounter(cache_backend, app_config.get("TOTALS_CACHE_TTL", 300))
+    totals_counter.install(db_connection.SessionLocal)
+    container.register_instance(TotalsCounter, totals_counter)
+
+    container.register_instance(
+        ArticleImpressionBuffer,
+        ArticleImpressionBuffer(
+            db_connection,
+            max_size=app_config.get("IMPRESSION_BUFFER_SIZE", 500),
+            flush_interval=app_config.get("IMPRESSION_FLUSH_INTERVAL", 5),
+            max_pending=app_config.get("IMPRESSION_BUFFER_MAX_PENDING"),
+        ),
+    )
+
+    ad_inventory = AdInventory(
+        db_connection,
+        version_backend=cache_backend,
+        ttl=app_config.get("AD_INVENTORY_TTL", 60),
+    )
+    container.register_instance(AdInventory, ad_inventory)
+    beacon_signer = BeaconSigner(app_config.get("SECRET_KEY"))
+    container.register_instance(BeaconSigner, beacon_signer)
+    container.register_instance(
+        AdSlates,
+        AdSlates(
+            ad_inventory,
+            app_config.get("SECRET_KEY"),
+            beacon_signer,
+            token_ttl=app_config.get("AD_SLATE_TOKEN_TTL", 300),
+        ),
+    )
+
+    ad_event_buffer = AdEventBuffer(
+        db_connection,
+        max_size=app_config.get("AD_EVENT_BUFFER_SIZE", 500),
+        flush_interval=app_config.get("AD_EVENT_FLUSH_INTERVAL", 5),
+        max_pending=app_config.get("AD_EVENT_BUFFER_MAX_PENDING"),
+    )
+    container.register_instance(AdEventBuffer, ad_event_buffer)
+
+    pacing_refresh = app_config.get("AD_PACING_REFRESH", 5)
+    container.register_instance(
+        WeightedAdStrategy,
+        WeightedAdStrategy(
+            ad_event_buffer.load_live_counts, pacing_refresh=pacing_refresh
+        ),
+    )
+    container.register_instance(
+        WeightedCtrAdStrategy,
+        WeightedCtrAdStrategy(
+            ad_event_buffer.load_live_counts, pacing_refresh=pacing_refresh
+        ),
+    )
+
+    rotation_state_type = app_config.get("AD_ROTATION_STATE", "memory").lower()
+    if rotation_state_type == "memory":
+        rotation_state = InProcessRotationState()
+    elif rotation_state_type == "shared":
+        rotation_state = SharedMemoryRotationState(
+            app_config.get("AD_ROTATION_STATE_PATH")
+        )
+    elif rotation_state_type == "cache":
+        rotation_state = CacheRotationState(cache_backend)
+    else:
+        raise ValueError(f"Unsupported ad rotation state: {rotation_state_type}")
+
+    container.register_instance(IRotationStateBackend, rotation_state)
+
+    container.register_instance(
+        AdFrequencyCapper,
+        AdFrequencyCapper(
+            max_impressions=app_config.get("AD_FREQUENCY_CAP", 3),
+            window=app_config.get("AD_FREQUENCY_WINDOW", 3600),
+            dedupe_seconds=app_config.get("AD_DEDUPE_SECONDS", 30),
+            capacity=app_config.get("AD_FREQUENCY_CAPACITY", 250_000),
+            error_rate=app_config.get("AD_FREQUENCY_ERROR_RATE", 0.01),
+        ),
+    )
+
     return container
@@ -1,33 +1,55 @@
 from functools import wraps
+from flask import request
+from middleware.viewer_middleware import request_session_id
 from repositories import get_ad_repo
 from services.ad_service import AdService
+from services.frequency_cap import viewer_key
+
+
+def _no_ads(current_user) -> bool:
+    """Чи вимкнена реклама для користувача (права з токена, без БД)."""
+    if not current_user or current_user.is_admin:
+        return False
+    return bool((current_user.permissions or {}).get("no_ads", False))
+
+
+def _user_id(current_user):
+    """ID користувача для ключа глядача; адміністратор — не глядач-користувач."""
+    if not current_user or current_user.is_admin:
+        return None
+    return current_user.id
 
 
 def ads_injector(ad_type: str = None, limit=3, strategy="random"):
     """
     Декоратор, що інжектить рекламу обраного типу в параметри функції-обробника.
     ["banner", "sidebar", "popup", "inline", "video"]
+
+    Реклама береться з готових добірок у пам'яті (AdSlates). З параметром
+    запиту ads=deferred замість реклами передається {"slate_token": ...},
+    за яким клієнт окремо отримує рекламу через /ads/slate/<token>.
     """
 
     def decorator(f):
         @wraps(f)
         def wrapper(current_user, *args, **kwargs):
-            user_permissions = {}
-            if current_user and not current_user.is_admin:
-                user_permissions = current_user.permissions
-            ad_repo = get_ad_repo()
-            ad_service = AdService(ad_repo)
-
             ads = []
-            if ad_type is not None:
-                if ad_service.should_show_ads(user_permissions):
-                    ads = ad_service.get_ads_for_user(
+            if ad_type is not None and not _no_ads(current_user):
+                ad_service = AdService(get_ad_repo())
+                viewer = viewer_key(_user_id(current_user), request_session_id())
+                if request.args.get("ads") == "deferred":
+                    ads = {
+                        "slate_token": ad_service.ad_slates.issue_token(
+                            ad_type, limit, strategy, viewer
+                        )
+                    }
+                else:
+                    ads = ad_service.get_ad_payloads(
                         ad_type=ad_type,
-                        user_permissions=user_permissions,
                         limit=limit,
                         strategy=strategy,
+                        viewer=viewer,
                     )
-                    ads = [ad.to_dict() for ad in ads]
 
             return f(current_user, ads, *args, **kwargs)
 
@@ -1,11 +1,47 @@
-from flask import jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from flask import after_this_request, jsonify
+from flask_jwt_extended import (
+    get_jwt,
+    get_jwt_identity,
+    get_jwt_request_location,
+    jwt_required,
+    set_access_cookies,
+)
 from functools import wraps
 from repositories import get_user_repo, get_admin_repo
 from services.auth.admin import AdminAuthService
+from services.auth.token import UserTokenFactory
 from services.auth.user import UserAuthService
 
 
+def resolve_current_user(user_id):
+    """
+    Користувач запиту: UserPrincipal з прав у токені або, якщо токен
+    застарів (права змінились чи токен без них), завантажений User.
+    Застарілий токен у cookie одразу замінюється новим; клієнтам із
+    заголовком Authorization відповідь підказує оновити токен.
+    """
+    user, is_stale = UserAuthService(get_user_repo()).get_principal(
+        user_id, get_jwt()
+    )
+    if is_stale:
+        from_cookies = get_jwt_request_location() == "cookies"
+        access_token = (
+            UserTokenFactory().create_token(user)["access_token"]
+            if from_cookies
+            else None
+        )
+
+        @after_this_request
+        def refresh_access_token(response):
+            if access_token:
+                set_access_cookies(response, access_token)
+            else:
+                response.headers["X-Permissions-Changed"] = "1"
+            return response
+
+    return user
+
+
 def token_required(f):
     """Декоратор для перевірки JWT токену"""
 
@@ -15,13 +51,11 @@ def token_required(f):
         current_id = get_jwt_identity()
         jwt = get_jwt()
         if jwt.get("type") == "user":
-            current_user = UserAuthService(get_user_repo()).get_current_user(current_id)
+            current_user = resolve_current_user(current_id)
         elif jwt.get("type") == "admin":
-            current_user = AdminAuthService(get_admin_repo()).get_current_admin(
-                current_id
+            current_user = AdminAuthService(get_admin_repo()).get_principal(
+                current_id, jwt
             )
-            current_user.permissions = {}
-            current_user.preferences = {}
 
         return f(current_user, *args, **kwargs)
 
@@ -55,23 +89,29 @@ def permission_required(*permissions):
     return decorator
 
 
+def optional_current_user():
+    """
+    Користувач запиту з необов'язковим токеном. Лише токен типу user дає
+    користувача: ID адміністратора — не ID користувача, тож з токеном
+    адміна запит публічного ресурсу анонімний (і cookie адміна не
+    перезаписується токеном користувача з тим самим ID).
+    """
+    if get_jwt().get("type") != "user":
+        return None
+    try:
+        current_user_id = get_jwt_identity()
+        return resolve_current_user(current_user_id) if current_user_id else None
+    except Exception:
+        return None
+
+
 def token_optional(f):
     """Декоратор, що дозволяє опціональну авторизацію"""
 
     @wraps(f)
     @jwt_required(optional=True)
     def decorated(*args, **kwargs):
-        try:
-            current_user_id = get_jwt_identity()
-            if current_user_id:
-                current_user = UserAuthService(get_user_repo()).get_current_user(
-                    current_user_id
-                )
-                return f(current_user, *args, **kwargs)
-        except:
-            pass
-
-        return f(None, *args, **kwargs)
+        return f(optional_current_user(), *args, **kwargs)
 
     return decorated
 
@@ -86,8 +126,8 @@ def admin_token_required(f):
                 return jsonify({"msg": "Недостатньо прав"}), 403
             current_admin_id = get_jwt_identity()
             if current_admin_id:
-                current_admin = AdminAuthService(get_admin_repo()).get_current_admin(
-                    current_admin_id
+                current_admin = AdminAuthService(get_admin_repo()).get_principal(
+                    current_admin_id, jwt
                 )
                 return f(current_admin, *args, **kwargs)
         except:
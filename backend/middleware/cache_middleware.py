@@ -0,0 +1,76 @@
+from functools import wraps
+from typing import Callable, Iterable
+from flask import g, jsonify, make_response, request
+from cache.response_cache import ResponseCache
+
+
+def get_response_cache() -> ResponseCache:
+    return g.container.resolve(ResponseCache)
+
+
+def purge_cache(*tags: str):
+    """Інвалідовує кешовані відповіді з будь-яким із тегів."""
+    get_response_cache().purge(*tags)
+
+
+def permission_class(current_user) -> str:
+    """
+    Клас доступу для розбиття ключів кешу: відповіді однакові для всіх
+    користувачів з тим самим набором прав exclusive_content / no_ads.
+    """
+    if not current_user or current_user.is_admin:
+        return "anonymous"
+
+    permissions = current_user.permissions or {}
+    flags = [
+        name
+        for name, permission in (
+            ("exclusive", "exclusive_content"),
+            ("no_ads", "no_ads"),
+        )
+        if permissions.get(permission, False)
+    ]
+    return "+".join(flags) or "anonymous"
+
+
+def cached_response(
+    tags: Callable[[dict], Iterable[str]],
+    vary_by_permissions: bool = False,
+    ttl: int | None = None,
+):
+    """
+    Декоратор, що кешує JSON-відповіді GET-обробника з тегами для інвалідації.
+
+    tags — функція, яка за тілом відповіді повертає її теги.
+    vary_by_permissions — обробник отримує current_user першим аргументом,
+    ключ розбивається за класом доступу. Якщо другим аргументом обробник
+    отримує рекламу від ads_injector, вона не кешується: у відповідь з кешу
+    підставляється свіжа добірка.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            partition = permission_class(args[0]) if vary_by_permissions else "public"
+            query = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(True)))
+            key = f"{request.path}?{query}|{partition}"
+
+            cache = get_response_cache()
+            payload = cache.get(key)
+            if payload is not None:
+                if isinstance(payload, dict) and "ads" in payload and len(args) > 1:
+                    payload = {**payload, "ads": args[1]}
+                return jsonify(payload), 200
+
+            snapshot = cache.snapshot()
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200 and response.is_json:
+                payload = response.get_json()
+                if isinstance(payload, dict) and "ads" in payload:
+                    payload = {**payload, "ads": []}
+                cache.set(key, payload, tags(payload), snapshot, ttl)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,45 @@
+import re
+import uuid
+from typing import Optional
+from flask import Flask, request
+
+# Перший-сторонній cookie незалогіненого глядача для частотних обмежень
+# реклами та статистики показів
+VIEWER_COOKIE = "viewer_id"
+VIEWER_COOKIE_MAX_AGE = 365 * 24 * 3600
+VIEWER_ID = re.compile(r"[0-9a-f]{32}")
+
+
+def request_viewer_id() -> Optional[str]:
+    """ID глядача з cookie; None, якщо клієнт його ще не повернув."""
+    viewer_id = request.cookies.get(VIEWER_COOKIE, "")
+    return viewer_id if VIEWER_ID.fullmatch(viewer_id) else None
+
+
+def request_session_id(session_id: Optional[str] = None) -> Optional[str]:
+    """
+    ID сесії глядача: явно переданий клієнтом (session_id, X-Session-Id)
+    або з cookie глядача.
+    """
+    return session_id or request.headers.get("X-Session-Id") or request_viewer_id()
+
+
+def init_viewer_cookie(app: Flask):
+    """
+    Видає cookie глядача кожному клієнту, який його ще не має. Запит, що
+    прийшов без cookie, глядача не має: частотні обмеження до нього не
+    застосовуються, бо невідомо, чи поверне клієнт cookie.
+    """
+
+    @app.after_request
+    def issue_viewer_cookie(response):
+        if request.method != "OPTIONS" and request_viewer_id() is None:
+            response.set_cookie(
+                VIEWER_COOKIE,
+                uuid.uuid4().hex,
+                max_age=VIEWER_COOKIE_MAX_AGE,
+                secure=request.is_secure,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -35,6 +35,7 @@ def get_engine_url():
 # for 'autogenerate' support
 from models.user import User
 from models.base import Base
+from database.search import is_search_index_table
 
 target_metadata = Base.metadata
 config.set_main_option("sqlalchemy.url", get_engine_url())
@@ -45,6 +46,13 @@ target_db = current_app.extensions["migrate"].db
 # ... etc.
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # Таблиці повнотекстового індексу створюються міграцією, а не моделями
+    if type_ == "table" and reflected and is_search_index_table(name):
+        return False
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, "metadatas"):
         return target_db.metadatas[None]
@@ -64,7 +72,12 @@ def run_migrations_offline():
 
     """
     url = config.get_main_option("sqlalchemy.url")
-    context.configure(url=url, target_metadata=get_metadata(), literal_binds=True)
+    context.configure(
+        url=url,
+        target_metadata=get_metadata(),
+        literal_binds=True,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -91,6 +104,7 @@ def run_migrations_online():
     conf_args = current_app.extensions["migrate"].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
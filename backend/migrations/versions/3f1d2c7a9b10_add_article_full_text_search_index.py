@@ -0,0 +1,34 @@
+"""Add article full-text search index
+
+Revision ID: 3f1d2c7a9b10
+Revises: 1b4c32babff5
+Create Date: 2025-11-20 10:12:31.402118
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+from database.search import get_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = "3f1d2c7a9b10"
+down_revision = "1b4c32babff5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    search_index = get_search_index(bind.dialect.name)
+    search_index.create_schema(bind)
+    search_index.rebuild(Session(bind=bind))
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS articles_fts")
+    elif bind.dialect.name == "postgresql":
+        op.execute("DROP TABLE IF EXISTS article_search_index")
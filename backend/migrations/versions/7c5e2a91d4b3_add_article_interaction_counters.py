@@ -0,0 +1,42 @@
+"""Add article like/save counters
+
+Revision ID: 7c5e2a91d4b3
+Revises: 3f1d2c7a9b10
+Create Date: 2025-11-22 14:05:17.630945
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "7c5e2a91d4b3"
+down_revision = "3f1d2c7a9b10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "articles",
+        sa.Column("likes_count", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "articles",
+        sa.Column("saves_count", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.execute(
+        "UPDATE articles SET "
+        "likes_count = (SELECT COUNT(*) FROM article_interactions ai "
+        "WHERE ai.article_id = articles.id AND ai.interaction_type = 'like'), "
+        "saves_count = (SELECT COUNT(*) FROM article_interactions ai "
+        "WHERE ai.article_id = articles.id AND ai.interaction_type = 'saved' "
+        "AND ai.value = 1)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_column("saves_count")
+        batch_op.drop_column("likes_count")
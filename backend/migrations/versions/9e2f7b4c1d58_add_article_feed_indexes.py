@@ -0,0 +1,33 @@
+"""Add article feed indexes without status filter
+
+Revision ID: 9e2f7b4c1d58
+Revises: f2d4b8e61a37
+Create Date: 2025-12-03 09:41:27.518204
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9e2f7b4c1d58"
+down_revision = "f2d4b8e61a37"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_articles_exclusive_created_at", "articles", ["is_exclusive", "created_at"]),
+    ("ix_articles_created_at", "articles", ["created_at"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,40 @@
+"""Add precomputed user recommendations
+
+Revision ID: a8d3f6c1e2b7
+Revises: 7c5e2a91d4b3
+Create Date: 2025-11-24 09:41:52.118306
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a8d3f6c1e2b7"
+down_revision = "7c5e2a91d4b3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_recommendations",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("article_ids", sa.JSON(), nullable=False),
+        sa.Column("is_stale", sa.Boolean(), nullable=False),
+        sa.Column(
+            "computed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("user_recommendations")
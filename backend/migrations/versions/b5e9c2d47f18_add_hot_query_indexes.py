@@ -0,0 +1,62 @@
+"""Add secondary indexes for hot queries
+
+Revision ID: b5e9c2d47f18
+Revises: a8d3f6c1e2b7
+Create Date: 2025-11-25 11:20:08.457391
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b5e9c2d47f18"
+down_revision = "a8d3f6c1e2b7"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    (
+        "ix_articles_status_exclusive_created_at",
+        "articles",
+        ["status", "is_exclusive", "created_at"],
+    ),
+    ("ix_articles_author_id_created_at", "articles", ["author_id", "created_at"]),
+    ("ix_articles_category_id_created_at", "articles", ["category_id", "created_at"]),
+    ("ix_article_keywords_article_id", "article_keywords", ["article_id"]),
+    (
+        "ix_article_interactions_user_article_type",
+        "article_interactions",
+        ["user_id", "article_id", "interaction_type"],
+    ),
+    (
+        "ix_article_interactions_article_type",
+        "article_interactions",
+        ["article_id", "interaction_type"],
+    ),
+    ("ix_article_views_user_id_article_id", "article_views", ["user_id", "article_id"]),
+    (
+        "ix_notifications_user_read_created_at",
+        "notifications",
+        ["user_id", "is_read", "created_at"],
+    ),
+    (
+        "ix_comments_article_status_created_at",
+        "comments",
+        ["article_id", "status", "created_at"],
+    ),
+    ("ix_ad_views_ad_id_viewed_at", "ad_views", ["ad_id", "viewed_at"]),
+    ("ix_push_subscriptions_user_id", "push_subscriptions", ["user_id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
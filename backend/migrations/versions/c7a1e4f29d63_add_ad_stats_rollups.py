@@ -0,0 +1,87 @@
+"""Add ad click events and hourly/daily ad stats rollups
+
+Revision ID: c7a1e4f29d63
+Revises: b5e9c2d47f18
+Create Date: 2025-11-27 10:14:36.902114
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c7a1e4f29d63"
+down_revision = "b5e9c2d47f18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "ad_clicks",
+        sa.Column("ad_id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "clicked_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(["ad_id"], ["ads.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_ad_clicks_ad_id_clicked_at", "ad_clicks", ["ad_id", "clicked_at"]
+    )
+
+    op.create_table(
+        "ad_stats_hourly",
+        sa.Column("ad_id", sa.BigInteger(), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("impressions", sa.BigInteger(), nullable=False),
+        sa.Column("clicks", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(["ad_id"], ["ads.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "ad_id", "bucket_start", name="uq_ad_stats_hourly_ad_bucket"
+        ),
+    )
+    op.create_index(
+        "ix_ad_stats_hourly_bucket_start", "ad_stats_hourly", ["bucket_start"]
+    )
+
+    op.create_table(
+        "ad_stats_daily",
+        sa.Column("ad_id", sa.BigInteger(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("impressions", sa.BigInteger(), nullable=False),
+        sa.Column("clicks", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(["ad_id"], ["ads.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("ad_id", "day", name="uq_ad_stats_daily_ad_day"),
+    )
+    op.create_index("ix_ad_stats_daily_day", "ad_stats_daily", ["day"])
+
+    op.create_table(
+        "ad_rollup_state",
+        sa.Column("name", sa.Text(), nullable=False),
+        sa.Column("last_view_id", sa.BigInteger(), nullable=False),
+        sa.Column("last_click_id", sa.BigInteger(), nullable=False),
+        sa.Column("rolled_up_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+
+
+def downgrade():
+    op.drop_table("ad_rollup_state")
+    op.drop_index("ix_ad_stats_daily_day", table_name="ad_stats_daily")
+    op.drop_table("ad_stats_daily")
+    op.drop_index("ix_ad_stats_hourly_bucket_start", table_name="ad_stats_hourly")
+    op.drop_table("ad_stats_hourly")
+    op.drop_index("ix_ad_clicks_ad_id_clicked_at", table_name="ad_clicks")
+    op.drop_table("ad_clicks")
@@ -0,0 +1,31 @@
+"""Add ad weight and impression budget
+
+Revision ID: d3b8f05a6c21
+Revises: c7a1e4f29d63
+Create Date: 2025-11-28 15:02:41.377520
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d3b8f05a6c21"
+down_revision = "c7a1e4f29d63"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("ads") as batch_op:
+        batch_op.add_column(
+            sa.Column("weight", sa.Float(), server_default="1", nullable=False)
+        )
+        batch_op.add_column(sa.Column("impression_budget", sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table("ads") as batch_op:
+        batch_op.drop_column("impression_budget")
+        batch_op.drop_column("weight")
@@ -0,0 +1,33 @@
+"""Add ad status filter indexes
+
+Revision ID: e4c9a7b2d815
+Revises: d3b8f05a6c21
+Create Date: 2025-11-29 10:14:52.613084
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e4c9a7b2d815"
+down_revision = "d3b8f05a6c21"
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ("ix_ads_is_active_end_date", "ads", ["is_active", "end_date"]),
+    ("ix_ads_end_date", "ads", ["end_date"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
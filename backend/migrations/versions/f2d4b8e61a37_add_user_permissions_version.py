@@ -0,0 +1,34 @@
+"""Add user permissions version
+
+Revision ID: f2d4b8e61a37
+Revises: e4c9a7b2d815
+Create Date: 2025-11-30 09:41:17.208356
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "f2d4b8e61a37"
+down_revision = "e4c9a7b2d815"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "permissions_version",
+                sa.BigInteger(),
+                server_default="0",
+                nullable=False,
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("permissions_version")
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.declarative import declarative_base
-from .ad import Ad, AdView
+from .ad import Ad, AdClick, AdView
+from .ad_stats import AdRollupState, AdStatDaily, AdStatHourly
 from .article import Article, ArticleInteraction, ArticleView, Comment
 from .category import Category
 from .newsletter import NewsletterSubscription
@@ -8,6 +9,7 @@ from .author import Author
 from .user import User
 from .subscription import UserSubscriptionPlan, SubscriptionPlan
 from .admin import Admin
+from .recommendation import UserRecommendation
 
 Base = declarative_base()
 
@@ -15,6 +17,10 @@ __all__ = [
     "Base",
     "Ad",
     "AdView",
+    "AdClick",
+    "AdStatHourly",
+    "AdStatDaily",
+    "AdRollupState",
     "Article",
     "ArticleInteraction",
     "ArticleView",
@@ -27,4 +33,5 @@ __all__ = [
     "SubscriptionPlan",
     "Comment",
     "Admin",
+    "UserRecommendation",
 ]
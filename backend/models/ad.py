@@ -1,6 +1,17 @@
-from sqlalchemy import Column, Text, BigInteger, DateTime, ForeignKey, Boolean, func
+from sqlalchemy import (
+    Column,
+    Text,
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Boolean,
+    Float,
+    Index,
+    func,
+)
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
+from models.serialization import Attr, Serializer, isoformat
 
 
 class Ad(BaseModel):
@@ -14,21 +25,34 @@ class Ad(BaseModel):
     end_date = Column(DateTime(timezone=True))
     impressions_count = Column(BigInteger, nullable=False, default=0)
     clicks_count = Column(BigInteger, nullable=False, default=0)
+    # Відносна вага для зваженого вибору та бюджет показів для рівномірного
+    # розподілу (pacing) між start_date та end_date
+    weight = Column(Float, nullable=False, default=1.0, server_default="1")
+    impression_budget = Column(BigInteger)
 
     ad_views = relationship("AdView", back_populates="ad")
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "content": self.content,
-            "ad_type": self.ad_type,
-            "is_active": self.is_active,
-            "start_date": self.start_date.isoformat() if self.start_date else None,
-            "end_date": self.end_date.isoformat() if self.end_date else None,
-            "impressions_count": self.impressions_count,
-            "clicks_count": self.clicks_count,
+    # Фільтри статусу в адмін-панелі (active / inactive / expired)
+    __table_args__ = (
+        Index("ix_ads_is_active_end_date", "is_active", "end_date"),
+        Index("ix_ads_end_date", "end_date"),
+    )
+
+    SERIALIZER = Serializer(
+        {
+            "id": Attr(),
+            "title": Attr(),
+            "content": Attr(),
+            "ad_type": Attr(),
+            "is_active": Attr(),
+            "start_date": Attr(convert=isoformat),
+            "end_date": Attr(convert=isoformat),
+            "impressions_count": Attr(),
+            "clicks_count": Attr(),
+            "weight": Attr(),
+            "impression_budget": Attr(),
         }
+    )
 
 
 class AdView(BaseModel):
@@ -45,12 +69,28 @@ class AdView(BaseModel):
     ad = relationship("Ad", back_populates="ad_views")
     user = relationship("User", back_populates="ad_views")
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "ad_id": self.ad_id,
-            "user_id": self.user_id,
-            "session_id": self.session_id,
-            "ip_address": self.ip_address,
-            "viewed_at": self.viewed_at.isoformat(),
+    SERIALIZER = Serializer(
+        {
+            "id": Attr(),
+            "ad_id": Attr(),
+            "user_id": Attr(),
+            "session_id": Attr(),
+            "ip_address": Attr(),
+            "viewed_at": Attr(convert=isoformat),
         }
+    )
+
+    __table_args__ = (Index("ix_ad_views_ad_id_viewed_at", "ad_id", "viewed_at"),)
+
+
+class AdClick(BaseModel):
+    """Сирий клік по рекламі; агрегується в ad_stats_* завданням rollup_ad_stats."""
+
+    __tablename__ = "ad_clicks"
+
+    ad_id = Column(BigInteger, ForeignKey("ads.id"), nullable=False)
+    clicked_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+    __table_args__ = (Index("ix_ad_clicks_ad_id_clicked_at", "ad_id", "clicked_at"),)
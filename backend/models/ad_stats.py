@@ -0,0 +1,54 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Text,
+    UniqueConstraint,
+)
+from models.base import BaseModel
+
+
+class AdStatHourly(BaseModel):
+    """Покази та кліки оголошення за годину (bucket_start — початок години)"""
+
+    __tablename__ = "ad_stats_hourly"
+
+    ad_id = Column(BigInteger, ForeignKey("ads.id", ondelete="CASCADE"), nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    impressions = Column(BigInteger, nullable=False, default=0)
+    clicks = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("ad_id", "bucket_start", name="uq_ad_stats_hourly_ad_bucket"),
+        Index("ix_ad_stats_hourly_bucket_start", "bucket_start"),
+    )
+
+
+class AdStatDaily(BaseModel):
+    """Покази та кліки оголошення за добу"""
+
+    __tablename__ = "ad_stats_daily"
+
+    ad_id = Column(BigInteger, ForeignKey("ads.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)
+    impressions = Column(BigInteger, nullable=False, default=0)
+    clicks = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("ad_id", "day", name="uq_ad_stats_daily_ad_day"),
+        Index("ix_ad_stats_daily_day", "day"),
+    )
+
+
+class AdRollupState(BaseModel):
+    """Позиція інкрементального агрегування: останні оброблені ID сирих подій"""
+
+    __tablename__ = "ad_rollup_state"
+
+    name = Column(Text, nullable=False, unique=True)
+    last_view_id = Column(BigInteger, nullable=False, default=0)
+    last_click_id = Column(BigInteger, nullable=False, default=0)
+    rolled_up_at = Column(DateTime(timezone=True))
@@ -1,5 +1,6 @@
 from sqlalchemy import Column, DateTime, Text, func
 from models.base import BaseModel
+from models.serialization import Attr, Serializer
 
 
 class Admin(BaseModel):
@@ -11,12 +12,7 @@ class Admin(BaseModel):
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "email": self.email,
-            "created_at": self.created_at,
-        }
+    SERIALIZER = Serializer({"id": Attr(), "email": Attr(), "created_at": Attr()})
 
     @property
     def is_admin(self):
@@ -5,11 +5,13 @@ from sqlalchemy import (
     BigInteger,
     DateTime,
     ForeignKey,
+    Index,
     Numeric,
     func,
 )
 from sqlalchemy.orm import relationship, backref, remote
 from models.base import BaseModel
+from models.serialization import Attr, FieldSet, Related, Serializer, isoformat
 
 
 class Article(BaseModel):
@@ -22,6 +24,9 @@ class Article(BaseModel):
     is_exclusive = Column(Boolean, nullable=False, default=False)
     is_breaking = Column(Boolean, nullable=False, default=False)
     views_count = Column(BigInteger, nullable=False, default=0)
+    # Денормалізовані лічильники взаємодій (підтримує ArticleRepository)
+    likes_count = Column(BigInteger, nullable=False, default=0, server_default="0")
+    saves_count = Column(BigInteger, nullable=False, default=0, server_default="0")
     created_at = Column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
@@ -34,41 +39,59 @@ class Article(BaseModel):
     interactions = relationship("ArticleInteraction", back_populates="article")
     notifications = relationship("Notification", back_populates="article")
 
-    @property
-    def likes_count(self):
-        all_likes = [
-            inter for inter in self.interactions if inter.interaction_type == "like"
-        ]
-        return len(all_likes)
-
-    def to_dict(self, metadata: bool | None = None):
-        if metadata:
-            return {
-                "id": self.id,
-                "author": self.author.to_dict(),
-                "category": self.category.to_dict() if self.category else None,
-                "title": self.title,
-                "status": self.status,
-                "is_exclusive": self.is_exclusive,
-                "is_breaking": self.is_breaking,
-                "views_count": self.views_count,
-                "created_at": self.created_at.isoformat(),
-                "keywords": [keyword.keyword for keyword in self.keywords],
-            }
-        return {
-            "id": self.id,
-            "author": self.author.to_dict(),
-            "category": self.category.to_dict() if self.category else None,
-            "title": self.title,
-            "content": self.content,
-            "status": self.status,
-            "is_exclusive": self.is_exclusive,
-            "is_breaking": self.is_breaking,
-            "views_count": self.views_count,
-            "created_at": self.created_at.isoformat(),
-            "keywords": [keyword.keyword for keyword in self.keywords],
-            "likes_count": self.likes_count,
-        }
+    SERIALIZER = Serializer(
+        {
+            "id": Attr(),
+            "author": Related(),
+            "category": Related(),
+            "title": Attr(),
+            "content": Attr(),
+            "status": Attr(),
+            "is_exclusive": Attr(),
+            "is_breaking": Attr(),
+            "views_count": Attr(),
+            "created_at": Attr(convert=isoformat),
+            "keywords": Related(render=lambda keyword: keyword.keyword),
+            "likes_count": Attr(),
+            "saves_count": Attr(),
+        },
+        shapes={
+            "card": (
+                "id",
+                "author",
+                "category",
+                "title",
+                "status",
+                "is_exclusive",
+                "is_breaking",
+                "views_count",
+                "created_at",
+                "keywords",
+            )
+        },
+    )
+
+    def to_dict(
+        self, metadata: bool | None = None, fieldset: FieldSet | None = None
+    ):
+        """metadata=True — картка для стрічок (без тексту та лічильників)."""
+        return self.SERIALIZER.serialize(
+            self, fieldset, "card" if metadata else "default"
+        )
+
+    __table_args__ = (
+        Index(
+            "ix_articles_status_exclusive_created_at",
+            "status",
+            "is_exclusive",
+            "created_at",
+        ),
+        # Стрічка без фільтра статусу: без ексклюзивів або всі статті
+        Index("ix_articles_exclusive_created_at", "is_exclusive", "created_at"),
+        Index("ix_articles_created_at", "created_at"),
+        Index("ix_articles_author_id_created_at", "author_id", "created_at"),
+        Index("ix_articles_category_id_created_at", "category_id", "created_at"),
+    )
 
 
 class ArticleKeyword(BaseModel):
@@ -77,6 +100,8 @@ class ArticleKeyword(BaseModel):
     keyword = Column(Text, nullable=False)
     article = relationship("Article", back_populates="keywords")
 
+    __table_args__ = (Index("ix_article_keywords_article_id", "article_id"),)
+
 
 class ArticleView(BaseModel):
     __tablename__ = "article_views"
@@ -91,6 +116,10 @@ class ArticleView(BaseModel):
     article = relationship("Article", back_populates="views")
     user = relationship("User", back_populates="article_views")
 
+    __table_args__ = (
+        Index("ix_article_views_user_id_article_id", "user_id", "article_id"),
+    )
+
 
 class Comment(BaseModel):
     __tablename__ = "comments"
@@ -105,19 +134,27 @@ class Comment(BaseModel):
     article = relationship("Article", back_populates="comments")
     user = relationship("User", back_populates="comments")
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "article_id": self.article_id,
-            "user": (
-                {"id": self.user.id, "username": self.user.username}
-                if self.user
-                else None
+    SERIALIZER = Serializer(
+        {
+            "id": Attr(),
+            "article_id": Attr(),
+            "user": Related(
+                render=lambda user: {"id": user.id, "username": user.username}
             ),
-            "text": self.text,
-            "status": self.status,
-            "created_at": self.created_at.isoformat(),
+            "text": Attr(),
+            "status": Attr(),
+            "created_at": Attr(convert=isoformat),
         }
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_comments_article_status_created_at",
+            "article_id",
+            "status",
+            "created_at",
+        ),
+    )
 
 
 class ArticleInteraction(BaseModel):
@@ -132,3 +169,15 @@ class ArticleInteraction(BaseModel):
 
     article = relationship("Article", back_populates="interactions")
     user = relationship("User", back_populates="interactions")
+
+    __table_args__ = (
+        Index(
+            "ix_article_interactions_user_article_type",
+            "user_id",
+            "article_id",
+            "interaction_type",
+        ),
+        Index(
+            "ix_article_interactions_article_type", "article_id", "interaction_type"
+        ),
+    )
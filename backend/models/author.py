@@ -1,6 +1,8 @@
-from sqlalchemy import Column, ForeignKey, Integer, Table, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, ForeignKey, Integer, Table, Text, func, select
+from sqlalchemy.orm import column_property, relationship
 from models.base import Base, BaseModel
+from models.serialization import Attr, Serializer
+from models.article import Article
 
 
 author_followers = Table(
@@ -28,17 +30,28 @@ class Author(BaseModel):
 
     @property
     def total_articles(self):
-        return len(self.articles)
+        return self.articles_count
 
     @property
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "bio": self.bio,
-            "total_articles": self.total_articles,
+    SERIALIZER = Serializer(
+        {
+            "id": Attr(),
+            "first_name": Attr(),
+            "last_name": Attr(),
+            "bio": Attr(),
+            # Лічильник — відкладений підзапит, вантажиться лише якщо запитаний
+            "total_articles": Attr("articles_count"),
         }
+    )
+
+
+Author.articles_count = column_property(
+    select(func.count(Article.id))
+    .where(Article.author_id == Author.id)
+    .correlate_except(Article)
+    .scalar_subquery(),
+    deferred=True,
+)
@@ -1,10 +1,24 @@
 from sqlalchemy import Column, Integer
 
 from sqlalchemy.ext.declarative import declarative_base
+from models.serialization import Attr, FieldSet, Serializer
 
 Base = declarative_base()
 
 
+class _TableSerializer:
+    """Типовий серіалізатор моделі: усі колонки таблиці (будується ліниво)."""
+
+    def __get__(self, obj, cls):
+        serializer = cls.__dict__.get("_table_serializer")
+        if serializer is None:
+            serializer = Serializer(
+                {column.name: Attr(column.name) for column in cls.__table__.columns}
+            )
+            cls._table_serializer = serializer
+        return serializer
+
+
 class BaseModel(Base):
     """Абстрактний базовий клас для всіх моделей"""
 
@@ -12,11 +26,12 @@ class BaseModel(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
 
-    def to_dict(self):
-        """Конвертує модель у словник"""
-        return {
-            column.name: getattr(self, column.name) for column in self.__table__.columns
-        }
+    # Моделі з власною формою словника перевизначають його своїм Serializer
+    SERIALIZER = _TableSerializer()
+
+    def to_dict(self, fieldset: FieldSet | None = None):
+        """Конвертує модель у словник (лише поля з fieldset, якщо задано)"""
+        return self.SERIALIZER.serialize(self, fieldset)
 
     def __repr__(self):
         return f"<{self.__class__.__name__}(id={self.id})>"
@@ -1,6 +1,17 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, Text, UniqueConstraint
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Boolean,
+    Column,
+    ForeignKey,
+    Integer,
+    Text,
+    UniqueConstraint,
+    func,
+    select,
+)
+from sqlalchemy.orm import column_property, relationship
 from models.base import BaseModel
+from models.serialization import Attr, Serializer
+from models.article import Article
 
 
 class Category(BaseModel):
@@ -13,14 +24,24 @@ class Category(BaseModel):
 
     articles = relationship("Article", back_populates="category")
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "slug": self.slug,
-            "is_searchable": self.is_searchable,
-            "total_articles": len(self.articles),
+    SERIALIZER = Serializer(
+        {
+            "id": Attr(),
+            "name": Attr(),
+            "description": Attr(),
+            "slug": Attr(),
+            "is_searchable": Attr(),
+            "total_articles": Attr("articles_count"),
         }
+    )
 
     __table_args__ = (UniqueConstraint("slug", name="uq_categories_slug"),)
+
+
+Category.articles_count = column_property(
+    select(func.count(Article.id))
+    .where(Article.category_id == Category.id)
+    .correlate_except(Article)
+    .scalar_subquery(),
+    deferred=True,
+)
@@ -1,6 +1,16 @@
-from sqlalchemy import Column, Text, Boolean, BigInteger, DateTime, ForeignKey, func
+from sqlalchemy import (
+    Column,
+    Text,
+    Boolean,
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    func,
+)
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
+from models.serialization import Attr, Related, Serializer
 
 
 class Notification(BaseModel):
@@ -17,3 +27,36 @@ class Notification(BaseModel):
 
     user = relationship("User", back_populates="notifications")
     article = relationship("Article", back_populates="notifications")
+
+    # Стаття не входить у типову форму; її вкладає ?include=article
+    SERIALIZER = Serializer(
+        {
+            "user_id": Attr(),
+            "article_id": Attr(),
+            "type": Attr(),
+            "title": Attr(),
+            "message": Attr(),
+            "is_read": Attr(),
+            "created_at": Attr(),
+            "id": Attr(),
+            "article": Related(shape="card"),
+        },
+        shapes={
+            "default": (
+                "user_id",
+                "article_id",
+                "type",
+                "title",
+                "message",
+                "is_read",
+                "created_at",
+                "id",
+            )
+        },
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_notifications_user_read_created_at", "user_id", "is_read", "created_at"
+        ),
+    )
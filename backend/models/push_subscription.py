@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Text, Integer, ForeignKey
+from sqlalchemy import Column, Text, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
 
@@ -12,3 +12,5 @@ class PushSubscription(BaseModel):
     auth = Column(Text, nullable=False)
 
     user = relationship("User", back_populates="push_subscriptions")
+
+    __table_args__ = (Index("ix_push_subscriptions_user_id", "user_id"),)
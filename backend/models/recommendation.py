@@ -0,0 +1,17 @@
+from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Integer, func
+from models.base import BaseModel
+
+
+class UserRecommendation(BaseModel):
+    """Попередньо обчислений ранжований список рекомендованих статей користувача"""
+
+    __tablename__ = "user_recommendations"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    article_ids = Column(JSON, nullable=False, default=list)
+    is_stale = Column(Boolean, nullable=False, default=False)
+    computed_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
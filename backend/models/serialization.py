@@ -0,0 +1,315 @@
+import keyword
+import threading
+from typing import Callable, Iterable, Optional
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+
+def isoformat(value) -> str:
+    return value.isoformat()
+
+
+def _attribute(var: str, attr: str) -> str:
+    """Вираз читання атрибута в згенерованому коді."""
+    if attr.isidentifier() and not keyword.iskeyword(attr):
+        return f"{var}.{attr}"
+    return f"getattr({var}, {attr!r})"
+
+
+class FieldSet:
+    """
+    Запитаний клієнтом набір полів відповіді (?fields=...&include=...).
+
+    fields — поля ресурсу через кому; поля вкладеного зв'язку задаються
+    через крапку (author.first_name), що водночас вмикає сам зв'язок.
+    include — зв'язки, які слід вкласти; порожній include= прибирає всі.
+    Без include зв'язки з типової форми вкладаються, лише якщо не задано
+    fields. id повертається завжди. Невідомі назви ігноруються.
+    """
+
+    __slots__ = ("fields", "include", "nested", "key")
+
+    def __init__(
+        self,
+        fields: Optional[Iterable[str]] = None,
+        include: Optional[Iterable[str]] = None,
+    ):
+        self.fields = None
+        nested: dict[str, list[str]] = {}
+        if fields is not None:
+            fields = frozenset(fields)
+            own = set()
+            for name in fields:
+                head, _, rest = name.partition(".")
+                own.add(head)
+                if rest:
+                    nested.setdefault(head, []).append(rest)
+            self.fields = frozenset(own)
+        self.include = None if include is None else frozenset(include)
+        self.nested = {name: FieldSet(names) for name, names in nested.items()}
+        # Однакові набори з різних запитів ділять скомпільовані функції
+        self.key = (fields, self.include)
+
+    @classmethod
+    def from_args(cls, args) -> Optional["FieldSet"]:
+        """FieldSet з параметрів запиту або None, якщо їх не передано."""
+        if "fields" not in args and "include" not in args:
+            return None
+
+        def names(param):
+            if param not in args:
+                return None
+            return [name.strip() for name in args[param].split(",") if name.strip()]
+
+        return cls(names("fields"), names("include"))
+
+    def wants(self, name: str, is_relation: bool, default: bool) -> bool:
+        if name == "id":
+            return True
+        if is_relation:
+            if self.include is not None and name in self.include:
+                return True
+            if self.fields is not None:
+                return name in self.fields
+            return self.include is None and default
+        if self.fields is None:
+            return default
+        return name in self.fields
+
+
+class Attr:
+    """Значення атрибута моделі (колонки), з необов'язковим перетворенням."""
+
+    __slots__ = ("attr", "convert")
+    is_relation = False
+
+    def __init__(self, attr: Optional[str] = None, convert: Callable = None):
+        self.attr = attr
+        self.convert = convert
+
+    def bind(self, name: str):
+        self.attr = self.attr or name
+
+    def expression(self, var: str, helper: str, namespace: dict, fieldset) -> str:
+        value = _attribute(var, self.attr)
+        if self.convert is None:
+            return value
+        if self.convert is isoformat:
+            return f"(None if ({helper} := {value}) is None else {helper}.isoformat())"
+        namespace[helper] = self.convert
+        return f"(None if ({helper}_v := {value}) is None else {helper}({helper}_v))"
+
+    def columns(self, model) -> list[str]:
+        return [self.attr] if self.attr in inspect(model).column_attrs else []
+
+    def options(self, model, fieldset) -> list:
+        return []
+
+
+class Computed:
+    """
+    Обчислюване значення. requires — колонки, які воно читає; options —
+    функція, що повертає опції завантаження потрібних йому зв'язків.
+    """
+
+    __slots__ = ("fn", "requires", "loader_options")
+    is_relation = False
+
+    def __init__(
+        self,
+        fn: Callable,
+        requires: tuple[str, ...] = (),
+        options: Callable[[], list] = None,
+    ):
+        self.fn = fn
+        self.requires = requires
+        self.loader_options = options
+
+    def bind(self, name: str):
+        pass
+
+    def expression(self, var: str, helper: str, namespace: dict, fieldset) -> str:
+        namespace[helper] = self.fn
+        return f"{helper}({var})"
+
+    def columns(self, model) -> list[str]:
+        return list(self.requires)
+
+    def options(self, model, fieldset) -> list:
+        return list(self.loader_options()) if self.loader_options else []
+
+
+class Related:
+    """
+    Вкладений зв'язок. Без render серіалізується серіалізатором цільової
+    моделі у формі shape (з урахуванням вкладених fields); render
+    перетворює кожен пов'язаний об'єкт сам (напр. лише ID), тоді вкладені
+    поля не діють.
+    """
+
+    __slots__ = ("attr", "render", "loader", "requires", "shape")
+    is_relation = True
+
+    def __init__(
+        self,
+        attr: Optional[str] = None,
+        render: Callable = None,
+        loader: Callable = None,
+        requires: tuple[str, ...] = (),
+        shape: str = "default",
+    ):
+        self.attr = attr
+        self.render = render
+        self.loader = loader
+        self.requires = requires
+        self.shape = shape
+
+    def bind(self, name: str):
+        self.attr = self.attr or name
+
+    def _relationship(self, model):
+        return inspect(model).relationships[self.attr]
+
+    def expression(self, var: str, helper: str, namespace: dict, fieldset) -> str:
+        namespace[helper] = self._compile(fieldset)
+        return f"{helper}({_attribute(var, self.attr)})"
+
+    def _compile(self, fieldset) -> Callable:
+        render = self.render
+        if render is None:
+            shape = self.shape
+            row = None
+
+            def render(item):
+                # Функція цільової моделі береться з першого об'єкта зв'язку
+                nonlocal row
+                if row is None:
+                    row = item.SERIALIZER.row_function(fieldset, shape)
+                return row(item)
+
+        def get(value):
+            if value is None:
+                return None
+            if isinstance(value, (list, tuple)):
+                return [render(item) for item in value]
+            return render(value)
+
+        return get
+
+    def columns(self, model) -> list[str]:
+        relationship = self._relationship(model)
+        # Для many-to-one потрібні локальні зовнішні ключі
+        own = [
+            column.key
+            for column in relationship.local_columns
+            if not relationship.uselist and column.key in inspect(model).column_attrs
+        ]
+        return own + list(self.requires)
+
+    def options(self, model, fieldset) -> list:
+        relationship = self._relationship(model)
+        loader = self.loader or (selectinload if relationship.uselist else joinedload)
+        option = loader(getattr(model, self.attr))
+        target = relationship.mapper.class_
+        serializer = getattr(target, "SERIALIZER", None)
+        if self.render is None and serializer is not None:
+            option = option.options(
+                *serializer.load_options(target, fieldset, self.shape)
+            )
+        return [option]
+
+
+class Serializer:
+    """
+    Опис серіалізації моделі: поля у порядку виводу та іменовані форми
+    (набори полів за замовчуванням, напр. "card" для стрічок).
+
+    serialize() будує словник лише з полів, потрібних FieldSet, тож
+    незапитані зв'язки не читаються й не довантажуються. load_options()
+    дає опції запиту під ті самі поля: load_only для колонок та
+    joinedload/selectinload лише для запитаних зв'язків.
+
+    Для кожної пари (форма, набір полів) план один раз компілюється у
+    функцію рядок -> словник: один літерал словника з прямим читанням
+    атрибутів, isoformat() дат і викликами вже скомпільованих функцій
+    вкладених моделей. Реєстр функцій обмежений MAX_COMPILED записами,
+    бо набори полів приходять з параметрів запиту.
+    """
+
+    MAX_COMPILED = 256
+
+    def __init__(self, fields: dict, shapes: Optional[dict] = None):
+        for name, field in fields.items():
+            field.bind(name)
+        self.fields = fields
+        self.shapes = {"default": tuple(fields), **(shapes or {})}
+        # (форма, FieldSet.key) -> (план, функція рядка)
+        self._compiled: dict[tuple, tuple[list, Callable]] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, fieldset: Optional[FieldSet], shape: str) -> tuple:
+        key = (shape, None if fieldset is None else fieldset.key)
+        entry = self._compiled.get(key)
+        if entry is None:
+            plan = self._plan(fieldset, shape)
+            entry = (plan, self._compile(plan))
+            with self._lock:
+                if len(self._compiled) >= self.MAX_COMPILED:
+                    self._compiled.pop(next(iter(self._compiled)))
+                self._compiled[key] = entry
+        return entry
+
+    def _plan(self, fieldset: Optional[FieldSet], shape: str) -> list:
+        defaults = self.shapes[shape]
+        return [
+            (
+                name,
+                field,
+                fieldset.nested.get(name) if fieldset is not None else None,
+            )
+            for name, field in self.fields.items()
+            if (
+                name in defaults
+                if fieldset is None
+                else fieldset.wants(name, field.is_relation, name in defaults)
+            )
+        ]
+
+    @staticmethod
+    def _compile(plan: list) -> Callable:
+        namespace = {}
+        items = [
+            f"{name!r}: {field.expression('obj', f'_f{index}', namespace, nested)}"
+            for index, (name, field, nested) in enumerate(plan)
+        ]
+        source = "def row(obj):\n    return {%s}\n" % ", ".join(items)
+        exec(compile(source, "<serializer>", "exec"), namespace)
+        return namespace["row"]
+
+    def plan(self, fieldset: Optional[FieldSet], shape: str = "default") -> list:
+        """[(назва, поле, вкладений FieldSet)] для цієї форми і FieldSet."""
+        return self._entry(fieldset, shape)[0]
+
+    def row_function(
+        self, fieldset: Optional[FieldSet] = None, shape: str = "default"
+    ) -> Callable:
+        """Скомпільована функція об'єкт -> словник для форми і FieldSet."""
+        return self._entry(fieldset, shape)[1]
+
+    def serialize(
+        self, obj, fieldset: Optional[FieldSet] = None, shape: str = "default"
+    ) -> dict:
+        return self._entry(fieldset, shape)[1](obj)
+
+    def load_options(
+        self, model, fieldset: Optional[FieldSet] = None, shape: str = "default"
+    ) -> list:
+        columns = {inspect(model).primary_key[0].key}
+        options = []
+        for _, field, nested in self.plan(fieldset, shape):
+            columns.update(field.columns(model))
+            options.extend(field.options(model, nested))
+        return [
+            load_only(*(getattr(model, column) for column in sorted(columns))),
+            *options,
+        ]
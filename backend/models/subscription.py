@@ -9,8 +9,9 @@ from sqlalchemy import (
     Numeric,
     func,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import joinedload, relationship
 from models.base import BaseModel
+from models.serialization import Attr, Computed, Related, Serializer, isoformat
 
 
 class SubscriptionPlan(BaseModel):
@@ -42,22 +43,27 @@ class UserSubscriptionPlan(BaseModel):
         elapsed = timedelta(days=(datetime.now() - self.start_date).days).days
         return max(0, 30 - elapsed)
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "plan_id": self.plan_id,
-            "start_date": self.start_date.isoformat(),
-            "is_active": self.is_active,
-            "plan": {
-                "name": self.plan.name,
-                "permissions": self.plan.permissions,
-                "price_per_month": (
-                    float(self.plan.price_per_month)
-                    if self.plan.price_per_month
-                    else None
-                ),
-                "description": self.plan.description,
-            },
-            "left_days": self.left_days,
+    SERIALIZER = Serializer(
+        {
+            "id": Attr(),
+            "user_id": Attr(),
+            "plan_id": Attr(),
+            "start_date": Attr(convert=isoformat),
+            "is_active": Attr(),
+            "plan": Related(
+                render=lambda plan: {
+                    "name": plan.name,
+                    "permissions": plan.permissions,
+                    "price_per_month": (
+                        float(plan.price_per_month) if plan.price_per_month else None
+                    ),
+                    "description": plan.description,
+                }
+            ),
+            "left_days": Computed(
+                lambda subscription: subscription.left_days,
+                requires=("start_date",),
+                options=lambda: [joinedload(UserSubscriptionPlan.plan)],
+            ),
         }
+    )
@@ -1,7 +1,9 @@
-from sqlalchemy import JSON, Column, DateTime, Text, func
-from sqlalchemy.orm import relationship
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Text, func
+from sqlalchemy.orm import relationship, selectinload
 from models.base import BaseModel
-from .author import author_followers
+from models.serialization import Attr, Computed, Related, Serializer, isoformat
+from .author import Author, author_followers
+from .subscription import UserSubscriptionPlan
 
 
 class User(BaseModel):
@@ -14,6 +16,11 @@ class User(BaseModel):
     created_at = Column(
         DateTime(timezone=True), nullable=False, server_default=func.now()
     )
+    # Зростає при кожній зміні прав (підписка, зміна плану): токени з іншою
+    # версією в claim pv вважаються застарілими
+    permissions_version = Column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
 
     article_views = relationship("ArticleView", back_populates="user")
     comments = relationship("Comment", back_populates="user")
@@ -27,18 +34,32 @@ class User(BaseModel):
     )
     push_subscriptions = relationship("PushSubscription", back_populates="user")
 
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "email": self.email,
-            "username": self.username,
-            "preferences": self.preferences,
-            "created_at": self.created_at.isoformat(),
-            "permissions": self.permissions,
-            "followed_authors": [author.id for author in self.followed_authors],
-            "push_subscriptions": [sub.to_dict() for sub in self.push_subscriptions],
-            "is_subscribed_to_newsletter": self.is_subscribed_to_newsletter,
+    SERIALIZER = Serializer(
+        {
+            "id": Attr(),
+            "email": Attr(),
+            "username": Attr(),
+            "preferences": Attr(),
+            "created_at": Attr(convert=isoformat),
+            "permissions": Computed(
+                lambda user: user.permissions,
+                options=lambda: [
+                    selectinload(User.subscriptions).joinedload(
+                        UserSubscriptionPlan.plan
+                    )
+                ],
+            ),
+            "followed_authors": Related(
+                render=lambda author: author.id,
+                loader=lambda attr: selectinload(attr).load_only(Author.id),
+            ),
+            "push_subscriptions": Related(),
+            "is_subscribed_to_newsletter": Computed(
+                lambda user: user.is_subscribed_to_newsletter,
+                options=lambda: [selectinload(User.newsletter_subs)],
+            ),
         }
+    )
 
     @property
     def is_admin(self):
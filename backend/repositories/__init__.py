@@ -2,12 +2,14 @@ from flask import g
 from .article_view import ArticleViewRepository
 from .notification import NotificationRepository
 from .ad import AdRepository
+from .ad_stats import AdStatsRepository
 from .ad_view import AdViewRepository
 from .admin import AdminRepository
 from .article import ArticleRepository
 from .author import AuthorRepository
 from .category import CategoryRepository
 from .comment import CommentRepository
+from .recommendation import RecommendationRepository
 from .subscription import SubscriptionRepository
 from .user import UserRepository
 
@@ -16,6 +18,10 @@ def get_ad_repo() -> AdRepository:
     return AdRepository(g.db_session)
 
 
+def get_ad_stats_repo() -> AdStatsRepository:
+    return AdStatsRepository(g.db_session)
+
+
 def get_ad_view_repo() -> AdViewRepository:
     return AdViewRepository(g.db_session)
 
@@ -54,3 +60,7 @@ def get_notification_repo() -> NotificationRepository:
 
 def get_article_view_repo() -> ArticleViewRepository:
     return ArticleViewRepository(g.db_session)
+
+
+def get_recommendation_repo() -> RecommendationRepository:
+    return RecommendationRepository(g.db_session)
@@ -1,8 +1,9 @@
-import datetime
-
-from sqlalchemy import desc
+from datetime import datetime
+from collections import Counter
+from sqlalchemy import bindparam, desc, func, insert, update
 from repositories.repositories import BaseRepository
-from models.ad import Ad
+from repositories.totals import count_total
+from models.ad import Ad, AdClick, AdView
 from sqlalchemy.orm import Session
 
 
@@ -11,32 +12,119 @@ class AdRepository(BaseRepository):
         super().__init__(db_session, Ad)
 
     def get_paginated_ads(
-        self, page: int, per_page: int, status: str | None, ad_type: str | None
+        self,
+        page: int,
+        per_page: int,
+        status: str | None,
+        ad_type: str | None,
+        totals: str = "exact",
+        now: datetime | None = None,
     ):
         """
         Отримує пагінований список рекламних оголошень з фільтрами.
+        Фільтр статусу виконується в SQL за індексами ix_ads_is_active_end_date
+        та ix_ads_end_date.
         """
         query = self.db_session.query(self.model)
-        current_time = datetime.now()
+        now = now or datetime.now()
 
         if status == "active":
             query = query.filter(
                 self.model.is_active == True,
-                (self.model.end_date == None) | (self.model.end_date > current_time),
+                (self.model.end_date == None) | (self.model.end_date >= now),
             )
         elif status == "inactive":
             query = query.filter(self.model.is_active == False)
         elif status == "expired":
             query = query.filter(
-                (self.model.end_date != None) & (self.model.end_date < current_time)
+                (self.model.end_date != None) & (self.model.end_date < now)
             )
 
         if ad_type:
             query = query.filter(self.model.ad_type == ad_type)
 
-        total = query.count()
+        total = count_total(query, totals)
 
         offset = (page - 1) * per_page
         ads = query.order_by(desc(self.model.id)).offset(offset).limit(per_page).all()
 
         return ads, total
+
+    def get_counters_by_type(self) -> list:
+        """(ad_type, кількість, покази, кліки) за типами оголошень."""
+        return (
+            self.db_session.query(
+                Ad.ad_type,
+                func.count(Ad.id),
+                func.coalesce(func.sum(Ad.impressions_count), 0),
+                func.coalesce(func.sum(Ad.clicks_count), 0),
+            )
+            .group_by(Ad.ad_type)
+            .all()
+        )
+
+    def get_types_by_ids(self, ad_ids) -> dict[int, str]:
+        if not ad_ids:
+            return {}
+        return dict(
+            self.db_session.query(Ad.id, Ad.ad_type).filter(Ad.id.in_(set(ad_ids))).all()
+        )
+
+    def get_counters(self, ad_ids) -> dict[int, tuple[int, int]]:
+        """Записані (покази, кліки) за ID оголошення."""
+        if not ad_ids:
+            return {}
+        rows = (
+            self.db_session.query(Ad.id, Ad.impressions_count, Ad.clicks_count)
+            .filter(Ad.id.in_(set(ad_ids)))
+            .all()
+        )
+        return {ad_id: (impressions, clicks) for ad_id, impressions, clicks in rows}
+
+    def get_existing_ids(self, ad_ids) -> set[int]:
+        """Повертає ті з переданих ID, для яких оголошення існують."""
+        if not ad_ids:
+            return set()
+        return {
+            row.id
+            for row in self.db_session.query(Ad.id).filter(Ad.id.in_(set(ad_ids))).all()
+        }
+
+    def record_events(self, views: list[dict], clicks: list[dict]) -> int:
+        """
+        Записує накопичені події однією транзакцією: масовий INSERT в ad_views
+        та ad_clicks і атомарні impressions_count + n / clicks_count + n на
+        оголошення (без читання рядка). Події для видалених оголошень
+        пропускаються. Повертає кількість записаних подій.
+        """
+        existing_ids = self.get_existing_ids(
+            {event["ad_id"] for event in views + clicks}
+        )
+        views = [view for view in views if view["ad_id"] in existing_ids]
+        clicks = [click for click in clicks if click["ad_id"] in existing_ids]
+
+        ads = Ad.__table__
+        if views:
+            self.db_session.execute(insert(AdView), views)
+            self.db_session.execute(
+                update(ads)
+                .where(ads.c.id == bindparam("b_ad_id"))
+                .values(impressions_count=ads.c.impressions_count + bindparam("b_n")),
+                [
+                    {"b_ad_id": ad_id, "b_n": n}
+                    for ad_id, n in Counter(view["ad_id"] for view in views).items()
+                ],
+            )
+        if clicks:
+            self.db_session.execute(insert(AdClick), clicks)
+            self.db_session.execute(
+                update(ads)
+                .where(ads.c.id == bindparam("b_ad_id"))
+                .values(clicks_count=ads.c.clicks_count + bindparam("b_n")),
+                [
+                    {"b_ad_id": ad_id, "b_n": n}
+                    for ad_id, n in Counter(click["ad_id"] for click in clicks).items()
+                ],
+            )
+        self.db_session.commit()
+        return len(views) + len(clicks)
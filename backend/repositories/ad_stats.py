@@ -0,0 +1,191 @@
+from datetime import date, datetime
+from collections import defaultdict
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from repositories.repositories import BaseRepository
+from models.ad import Ad, AdClick, AdView
+from models.ad_stats import AdRollupState, AdStatDaily, AdStatHourly
+
+
+class AdStatsRepository(BaseRepository):
+    """
+    Погодинні та добові агрегати показів і кліків реклами.
+
+    Сирі події (ad_views, ad_clicks) агрегуються інкрементально: стан
+    AdRollupState зберігає останні оброблені ID, тож кожен запуск обробляє
+    лише нові рядки. Після агрегування сирі події можна видаляти.
+    """
+
+    STATE_NAME = "ads"
+
+    def __init__(self, db_session: Session):
+        super().__init__(db_session, AdStatHourly)
+
+    def _hour_bucket(self, column):
+        if self.db_session.get_bind().dialect.name == "postgresql":
+            return func.date_trunc("hour", column)
+        return func.strftime("%Y-%m-%d %H:00:00", column)
+
+    @staticmethod
+    def _as_datetime(value) -> datetime:
+        return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+    def _get_state(self) -> AdRollupState:
+        state = (
+            self.db_session.query(AdRollupState).filter_by(name=self.STATE_NAME).first()
+        )
+        if state is None:
+            state = AdRollupState(name=self.STATE_NAME, last_view_id=0, last_click_id=0)
+            self.db_session.add(state)
+        return state
+
+    def _aggregate_new_events(self, model, time_column, last_id, settled_before):
+        """
+        Агрегує за (ad_id, година) події з ID в (last_id, upper], де upper —
+        найбільший ID події, старшої за settled_before (щоб не обігнати
+        транзакції, які ще записують молодші події). Повертає (рядки, upper).
+        """
+        upper = (
+            self.db_session.query(func.max(model.id))
+            .filter(model.id > last_id, time_column < settled_before)
+            .scalar()
+        )
+        if upper is None:
+            return [], last_id
+
+        bucket = self._hour_bucket(time_column)
+        rows = (
+            self.db_session.query(model.ad_id, bucket, func.count(model.id))
+            .filter(model.id > last_id, model.id <= upper)
+            .group_by(model.ad_id, bucket)
+            .all()
+        )
+        return rows, upper
+
+    def roll_up(self, settled_before: datetime) -> int:
+        """
+        Додає нові сирі події до погодинних і добових агрегатів однією
+        транзакцією. Повертає кількість оброблених подій.
+        """
+        state = self._get_state()
+
+        # (ad_id, початок години) -> [покази, кліки]
+        deltas = defaultdict(lambda: [0, 0])
+        view_rows, state.last_view_id = self._aggregate_new_events(
+            AdView, AdView.viewed_at, state.last_view_id, settled_before
+        )
+        for ad_id, bucket, count in view_rows:
+            deltas[(ad_id, self._as_datetime(bucket))][0] += count
+
+        click_rows, state.last_click_id = self._aggregate_new_events(
+            AdClick, AdClick.clicked_at, state.last_click_id, settled_before
+        )
+        for ad_id, bucket, count in click_rows:
+            deltas[(ad_id, self._as_datetime(bucket))][1] += count
+
+        daily_deltas = defaultdict(lambda: [0, 0])
+        for (ad_id, bucket_start), (impressions, clicks) in deltas.items():
+            daily = daily_deltas[(ad_id, bucket_start.date())]
+            daily[0] += impressions
+            daily[1] += clicks
+
+        self._merge(AdStatHourly, AdStatHourly.bucket_start, "bucket_start", deltas)
+        self._merge(AdStatDaily, AdStatDaily.day, "day", daily_deltas)
+
+        state.rolled_up_at = datetime.now()
+        self.db_session.commit()
+        return sum(impressions + clicks for impressions, clicks in deltas.values())
+
+    def _merge(self, model, key_column, key_name: str, deltas: dict):
+        """Додає дельти до наявних рядків агрегату або створює нові."""
+        if not deltas:
+            return
+
+        ad_ids = {ad_id for ad_id, _ in deltas}
+        keys = {key for _, key in deltas}
+        existing = {
+            (row.ad_id, getattr(row, key_name)): row
+            for row in self.db_session.query(model)
+            .filter(model.ad_id.in_(ad_ids), key_column.in_(keys))
+            .all()
+        }
+
+        for (ad_id, key), (impressions, clicks) in deltas.items():
+            row = existing.get((ad_id, key))
+            if row is None:
+                self.db_session.add(
+                    model(
+                        ad_id=ad_id,
+                        impressions=impressions,
+                        clicks=clicks,
+                        **{key_name: key},
+                    )
+                )
+            else:
+                row.impressions += impressions
+                row.clicks += clicks
+
+    def prune_raw_events(self, older_than: datetime) -> int:
+        """
+        Видаляє вже агреговані сирі події, старші за older_than.
+        Повертає кількість видалених рядків.
+        """
+        state = self._get_state()
+        deleted = (
+            self.db_session.query(AdView)
+            .filter(AdView.id <= state.last_view_id, AdView.viewed_at < older_than)
+            .delete(synchronize_session=False)
+        )
+        deleted += (
+            self.db_session.query(AdClick)
+            .filter(AdClick.id <= state.last_click_id, AdClick.clicked_at < older_than)
+            .delete(synchronize_session=False)
+        )
+        self.db_session.commit()
+        return deleted
+
+    def get_time_series(self, ad_id: int, granularity: str, since: datetime):
+        """Ряд (початок періоду, покази, кліки) для оголошення з моменту since."""
+        if granularity == "hour":
+            model, key_column, since_key = (
+                AdStatHourly,
+                AdStatHourly.bucket_start,
+                since,
+            )
+        else:
+            model, key_column, since_key = AdStatDaily, AdStatDaily.day, since.date()
+
+        return (
+            self.db_session.query(key_column, model.impressions, model.clicks)
+            .filter(model.ad_id == ad_id, key_column >= since_key)
+            .order_by(key_column)
+            .all()
+        )
+
+    def get_period_totals(self, ad_id: int, since: date):
+        """(покази, кліки, днів з показами) оголошення з дня since."""
+        impressions, clicks, days_active = (
+            self.db_session.query(
+                func.coalesce(func.sum(AdStatDaily.impressions), 0),
+                func.coalesce(func.sum(AdStatDaily.clicks), 0),
+                func.count(AdStatDaily.id),
+            )
+            .filter(AdStatDaily.ad_id == ad_id, AdStatDaily.day >= since)
+            .one()
+        )
+        return int(impressions), int(clicks), days_active
+
+    def get_top_performing(self, since: date, limit: int = 5):
+        """Оголошення з найвищим CTR за період (id, title, покази, кліки)."""
+        impressions = func.sum(AdStatDaily.impressions)
+        clicks = func.sum(AdStatDaily.clicks)
+        return (
+            self.db_session.query(Ad.id, Ad.title, impressions, clicks)
+            .join(AdStatDaily, AdStatDaily.ad_id == Ad.id)
+            .filter(AdStatDaily.day >= since)
+            .group_by(Ad.id, Ad.title)
+            .having(impressions > 0)
+            .order_by((clicks * 1.0 / impressions).desc(), Ad.id)
+            .limit(limit)
+            .all()
+        )
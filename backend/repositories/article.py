@@ -1,22 +1,115 @@
 from typing import Optional
-from sqlalchemy import and_, desc, func, or_
+from sqlalchemy import and_, case, false, func, literal, or_, select, union_all
 from sqlalchemy.orm import Session
+from database.search import IArticleSearchIndex, get_search_index
 from repositories.repositories import BaseRepository
+from repositories.pagination import paginate
 from models.article import Article, ArticleInteraction, ArticleView
 from models.category import Category
-from models.author import Author
+from models.serialization import FieldSet
 from datetime import datetime, timedelta
 
 
 class ArticleRepository(BaseRepository):
-    def __init__(self, db_session: Session):
+    SEARCHABLE_FIELDS = {"title", "content", "author_id"}
+
+    # Профілі завантаження -> форми Article.SERIALIZER:
+    # card   — to_dict(metadata=True) для стрічок, без тексту статті;
+    # detail — повний to_dict() однієї статті;
+    # admin  — повні словники у списках адмін-панелі.
+    # Запит вибирає лише колонки та зв'язки, потрібні формі й FieldSet.
+    LOADER_PROFILES = {
+        "card": "card",
+        "detail": "default",
+        "admin": "default",
+    }
+
+    def __init__(
+        self, db_session: Session, search_index: IArticleSearchIndex | None = None
+    ):
         super().__init__(db_session, Article)
+        self.search_index = search_index or get_search_index(
+            db_session.get_bind().dialect.name
+        )
 
-    def get_by_id(self, article_id: int):
-        return self.get_by(id=article_id)
-
-    def get_all(self, page: int = 1, per_page: int = 10, filters: dict = None):
+    def _query(
+        self, profile: Optional[str] = None, fieldset: Optional[FieldSet] = None
+    ):
         query = self.db_session.query(Article)
+        if profile:
+            query = query.options(
+                *Article.SERIALIZER.load_options(
+                    Article, fieldset, self.LOADER_PROFILES[profile]
+                )
+            )
+        return query
+
+    def get_by_id(
+        self,
+        article_id: int,
+        profile: Optional[str] = None,
+        fieldset: Optional[FieldSet] = None,
+    ):
+        return self._query(profile, fieldset).filter_by(id=article_id).first()
+
+    def get_all_by(
+        self,
+        profile: Optional[str] = None,
+        fieldset: Optional[FieldSet] = None,
+        **kwargs,
+    ):
+        return self._query(profile, fieldset).filter_by(**kwargs).all()
+
+    def create(self, data: dict):
+        article = self.model(**data)
+        self.db_session.add(article)
+        self.db_session.flush()
+        self.search_index.index_article(self.db_session, article)
+        self.db_session.commit()
+        self.db_session.refresh(article)
+        return article
+
+    def update(self, article: Article, data: dict):
+        for key, value in data.items():
+            setattr(article, key, value)
+        if self.SEARCHABLE_FIELDS.intersection(data):
+            self.db_session.flush()
+            self.search_index.index_article(self.db_session, article)
+        self.db_session.commit()
+        self.db_session.refresh(article)
+        return article
+
+    def delete(self, article: Article):
+        self.search_index.remove_article(self.db_session, article.id)
+        self.db_session.delete(article)
+        self.db_session.commit()
+        return True
+
+    def reindex_author_articles(self, author_id: int):
+        """Оновлює пошуковий індекс статей автора (після зміни імені)."""
+        articles = self.db_session.query(Article).filter_by(author_id=author_id).all()
+        for article in articles:
+            self.search_index.index_article(self.db_session, article)
+        self.db_session.commit()
+        return len(articles)
+
+    def rebuild_search_index(self) -> int:
+        """Повністю перебудовує пошуковий індекс зі статей у БД."""
+        total = self.search_index.rebuild(self.db_session)
+        self.db_session.commit()
+        return total
+
+    def get_all(
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        filters: dict = None,
+        cursor: Optional[str] = None,
+        totals: str = "exact",
+        profile: Optional[str] = "card",
+        fieldset: Optional[FieldSet] = None,
+    ):
+        query = self._query(profile, fieldset)
 
         if filters:
             if filters.get("status"):
@@ -36,15 +129,15 @@ class ArticleRepository(BaseRepository):
                     Category.slug == filters["category_slug"]
                 )
 
-        offset = (page - 1) * per_page
-        total = query.count()
-        articles = (
-            query.order_by(desc(Article.created_at))
-            .offset(offset)
-            .limit(per_page)
-            .all()
+        return paginate(
+            query,
+            Article.created_at,
+            Article.id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            totals=totals,
         )
-        return articles, total
 
     def search(
         self,
@@ -54,22 +147,22 @@ class ArticleRepository(BaseRepository):
         user_permissions: dict = None,
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
+        cursor: Optional[str] = None,
+        totals: str = "exact",
+        profile: Optional[str] = "card",
+        fieldset: Optional[FieldSet] = None,
     ):
         """
-        Виконує повнотекстовий пошук по статтях та авторах
-        З УНІВЕРСАЛЬНИМ ігноруванням регістру.
+        Виконує повнотекстовий пошук по статтях та авторах через
+        пошуковий індекс БД (FTS5 / tsvector) з ранжуванням за релевантністю.
+        У курсорному режимі результати впорядковані за датою, а не релевантністю.
         """
-        search_term = f"%{query_string}%"
+        hits = self.search_index.match(query_string)
+        if hits is None:
+            return [], 0, None
 
-        query = self.db_session.query(Article).join(Article.author)
-
-        query = query.filter(
-            or_(
-                Article.title.like(search_term),
-                Article.content.like(search_term),
-                Author.first_name.like(search_term),
-                Author.last_name.like(search_term),
-            )
+        query = self._query(profile, fieldset).join(
+            hits, hits.c.article_id == Article.id
         )
 
         query = query.filter(Article.status == "published")
@@ -85,18 +178,17 @@ class ArticleRepository(BaseRepository):
         except ValueError:
             pass
 
-        total = query.count()
-        offset = (page - 1) * per_page
-
-        articles = (
-            query.order_by(desc(Article.created_at))
-            .offset(offset)
-            .limit(per_page)
-            .all()
+        return paginate(
+            query,
+            Article.created_at,
+            Article.id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            totals=totals,
+            offset_order=[hits.c.rank],
         )
 
-        return articles, total
-
     def save_article(self, user_id: int, article_id: int):
         """Зберігає статтю для користувача"""
         existing = (
@@ -112,6 +204,8 @@ class ArticleRepository(BaseRepository):
         )
 
         if existing:
+            if existing.value != 1:
+                self._increment_counter(article_id, Article.saves_count, 1)
             existing.value = 1
             existing.created_at = func.now()
         else:
@@ -122,12 +216,13 @@ class ArticleRepository(BaseRepository):
                 value=1,
             )
             self.db_session.add(interaction)
+            self._increment_counter(article_id, Article.saves_count, 1)
 
         self.db_session.commit()
         return True
 
-    def unsave_article(self, user_id: int, article_id: int):
-        """Прибирає статтю зі збережених"""
+    def unsave_article(self, user_id: int, article_id: int) -> bool:
+        """Прибирає статтю зі збережених. Повертає False, якщо її там не було."""
         existing = (
             self.db_session.query(ArticleInteraction)
             .filter(
@@ -140,16 +235,27 @@ class ArticleRepository(BaseRepository):
             .first()
         )
 
-        if existing:
-            self.db_session.delete(existing)
-            self.db_session.commit()
+        if not existing:
+            return False
 
+        if existing.value == 1:
+            self._increment_counter(article_id, Article.saves_count, -1)
+        self.db_session.delete(existing)
+        self.db_session.commit()
         return True
 
-    def get_saved_articles(self, user_id: int, page: int = 1, per_page: int = 10):
+    def get_saved_articles(
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        profile: Optional[str] = "card",
+        fieldset: Optional[FieldSet] = None,
+    ):
         """Отримує збережені статті користувача"""
         query = (
-            self.db_session.query(Article)
+            self._query(profile, fieldset)
             .join(ArticleInteraction)
             .filter(
                 and_(
@@ -160,18 +266,29 @@ class ArticleRepository(BaseRepository):
             )
         )
 
-        offset = (page - 1) * per_page
-        return (
-            query.order_by(desc(ArticleInteraction.created_at))
-            .offset(offset)
-            .limit(per_page)
-            .all()
+        articles, _, next_cursor = paginate(
+            query,
+            ArticleInteraction.created_at,
+            ArticleInteraction.id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            totals="none",
         )
+        return articles, next_cursor
 
-    def get_liked_articles(self, user_id: int, page: int = 1, per_page: int = 10):
+    def get_liked_articles(
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        profile: Optional[str] = "card",
+        fieldset: Optional[FieldSet] = None,
+    ):
         """Отримує статті, які лайкнув користувач"""
         query = (
-            self.db_session.query(Article)
+            self._query(profile, fieldset)
             .join(ArticleInteraction)
             .filter(
                 and_(
@@ -181,13 +298,16 @@ class ArticleRepository(BaseRepository):
             )
         )
 
-        offset = (page - 1) * per_page
-        return (
-            query.order_by(desc(ArticleInteraction.created_at))
-            .offset(offset)
-            .limit(per_page)
-            .all()
+        articles, _, next_cursor = paginate(
+            query,
+            ArticleInteraction.created_at,
+            ArticleInteraction.id,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+            totals="none",
         )
+        return articles, next_cursor
 
     def is_article_saved(self, user_id: int, article_id: int):
         """Перевіряє, чи збережена стаття"""
@@ -206,6 +326,23 @@ class ArticleRepository(BaseRepository):
 
         return saved is not None
 
+    def get_saved_article_ids(self, user_id: int, article_ids: list[int]) -> set[int]:
+        """Повертає ID статей зі списку, які користувач зберіг (одним запитом)"""
+        if not article_ids:
+            return set()
+
+        rows = (
+            self.db_session.query(ArticleInteraction.article_id)
+            .filter(
+                ArticleInteraction.user_id == user_id,
+                ArticleInteraction.article_id.in_(article_ids),
+                ArticleInteraction.interaction_type == "saved",
+                ArticleInteraction.value == 1,
+            )
+            .all()
+        )
+        return {row.article_id for row in rows}
+
     def is_article_liked(self, user_id: int, article_id: int):
         """Перевіряє, чи лайкнув користувач статтю"""
         liked = (
@@ -237,6 +374,7 @@ class ArticleRepository(BaseRepository):
 
         if existing:
             self.db_session.delete(existing)
+            self._increment_counter(article_id, Article.likes_count, -1)
             self.db_session.commit()
             return False
         else:
@@ -247,107 +385,193 @@ class ArticleRepository(BaseRepository):
                 value=1,
             )
             self.db_session.add(interaction)
+            self._increment_counter(article_id, Article.likes_count, 1)
             self.db_session.commit()
             return True
 
-    def get_user_interaction_article_ids(self, user_id: int) -> set[int]:
+    def _increment_counter(self, article_id: int, column, delta: int):
         """
-        Отримує ID всіх статей, з якими користувач взаємодіяв (лайк або перегляд).
+        Атомарно змінює лічильник статті на рівні БД (UPDATE ... SET x = x + delta),
+        без читання значення в Python, тож паралельні запити не гублять оновлень.
         """
-        liked_ids = (
-            self.db_session.query(ArticleInteraction.article_id)
-            .filter(
-                ArticleInteraction.user_id == user_id,
+        self.db_session.query(Article).filter(Article.id == article_id).update(
+            {column: column + delta}, synchronize_session=False
+        )
+
+    def reconcile_interaction_counters(self) -> int:
+        """
+        Перераховує likes_count та saves_count усіх статей з article_interactions.
+        Повертає кількість статей, лічильники яких було виправлено.
+        """
+        likes = (
+            select(func.count(ArticleInteraction.id))
+            .where(
+                ArticleInteraction.article_id == Article.id,
                 ArticleInteraction.interaction_type == "like",
             )
-            .all()
+            .scalar_subquery()
         )
-
-        viewed_ids = (
-            self.db_session.query(ArticleView.article_id)
-            .filter(ArticleView.user_id == user_id)
-            .all()
+        saves = (
+            select(func.count(ArticleInteraction.id))
+            .where(
+                ArticleInteraction.article_id == Article.id,
+                ArticleInteraction.interaction_type == "saved",
+                ArticleInteraction.value == 1,
+            )
+            .scalar_subquery()
         )
+        fixed = (
+            self.db_session.query(Article)
+            .filter(or_(Article.likes_count != likes, Article.saves_count != saves))
+            .update(
+                {Article.likes_count: likes, Article.saves_count: saves},
+                synchronize_session=False,
+            )
+        )
+        self.db_session.commit()
+        return fixed
+
+    def get_existing_ids(self, article_ids: list[int]) -> set[int]:
+        """Повертає ID зі списку, для яких існують статті (одним запитом)."""
+        if not article_ids:
+            return set()
 
-        return {row[0] for row in liked_ids + viewed_ids}
+        rows = (
+            self.db_session.query(Article.id).filter(Article.id.in_(article_ids)).all()
+        )
+        return {row.id for row in rows}
 
-    def get_features_from_articles(self, article_ids: set[int]) -> dict:
-        """
-        На основі ID статей збирає "ознаки" для рекомендацій: ID категорій та ID авторів.
-        """
+    def get_by_ids(
+        self,
+        article_ids: list[int],
+        profile: Optional[str] = "card",
+        fieldset: Optional[FieldSet] = None,
+    ):
+        """Отримує статті за списком ID, зберігаючи порядок списку."""
         if not article_ids:
-            return {"category_ids": set(), "author_ids": set()}
+            return []
 
         articles = (
-            self.db_session.query(Article.category_id, Article.author_id)
-            .filter(Article.id.in_(article_ids))
-            .all()
+            self._query(profile, fieldset).filter(Article.id.in_(article_ids)).all()
+        )
+        by_id = {article.id: article for article in articles}
+        return [by_id[article_id] for article_id in article_ids if article_id in by_id]
+
+    def _seen_by_user(self, user_id: Optional[int]):
+        """Умова: користувач уже лайкнув або переглядав статтю."""
+        if user_id is None:
+            return false()
+        liked = (
+            select(ArticleInteraction.id)
+            .where(
+                ArticleInteraction.article_id == Article.id,
+                ArticleInteraction.user_id == user_id,
+                ArticleInteraction.interaction_type == "like",
+            )
+            .exists()
+        )
+        viewed = (
+            select(ArticleView.id)
+            .where(ArticleView.article_id == Article.id, ArticleView.user_id == user_id)
+            .exists()
         )
+        return or_(liked, viewed)
 
-        category_ids = {row.category_id for row in articles if row.category_id}
-        author_ids = {row.author_id for row in articles if row.author_id}
+    def get_interest_weights(self, user_id: int):
+        """
+        Агрегує взаємодії користувача за парами (category_id, author_id).
+        Вага: лайк — 3, збереження — 2, перегляд — 1.
+        """
+        events = union_all(
+            select(
+                ArticleInteraction.article_id.label("article_id"),
+                case(
+                    (ArticleInteraction.interaction_type == "like", 3),
+                    (ArticleInteraction.interaction_type == "saved", 2),
+                    else_=0,
+                ).label("weight"),
+            ).where(ArticleInteraction.user_id == user_id),
+            select(
+                ArticleView.article_id.label("article_id"),
+                literal(1).label("weight"),
+            ).where(ArticleView.user_id == user_id),
+        ).subquery()
 
-        return {"category_ids": category_ids, "author_ids": author_ids}
+        return (
+            self.db_session.query(
+                Article.category_id,
+                Article.author_id,
+                func.sum(events.c.weight).label("weight"),
+            )
+            .join(events, events.c.article_id == Article.id)
+            .group_by(Article.category_id, Article.author_id)
+            .all()
+        )
 
-    def get_recommended(
+    def get_recommendation_candidates(
         self,
-        page: int = 1,
-        per_page: int = 10,
-        user_id: int = None,
+        user_id: Optional[int],
+        category_ids: set[int],
+        author_ids: set[int],
         favorite_category_slugs: list[str] = None,
-        filters: dict = None,
-        current_article_id: Optional[int] = None,
+        limit: int = 1000,
     ):
         """
-        Отримує розширений список рекомендованих статей.
+        Опубліковані статті, які користувач ще не бачив, з категорій/авторів
+        його інтересів (або найновіші, якщо інтересів немає).
+        Повертає рядки (id, category_id, author_id, category_slug, created_at).
         """
-        query = self.db_session.query(Article)
-
-        if filters:
-            if filters.get("status"):
-                query = query.filter_by(status=filters.get("status", "published"))
-            if filters.get("is_exclusive") is not None:
-                query = query.filter_by(is_exclusive=filters["is_exclusive"])
-
-        interacted_ids = self.get_user_interaction_article_ids(user_id)
-        if interacted_ids:
-            query = query.filter(Article.id.notin_(interacted_ids))
-            query = query.filter(
-                Article.id.notin_([current_article_id]) if current_article_id else True
+        query = (
+            self.db_session.query(
+                Article.id,
+                Article.category_id,
+                Article.author_id,
+                Category.slug.label("category_slug"),
+                Article.created_at,
             )
+            .outerjoin(Article.category)
+            .filter(Article.status == "published", ~self._seen_by_user(user_id))
+        )
 
-        recommend_conditions = []
-
+        conditions = []
+        if category_ids:
+            conditions.append(Article.category_id.in_(category_ids))
+        if author_ids:
+            conditions.append(Article.author_id.in_(author_ids))
         if favorite_category_slugs:
-            query = query.join(Article.category)
-            recommend_conditions.append(Category.slug.in_(favorite_category_slugs))
+            conditions.append(Category.slug.in_(favorite_category_slugs))
+        if conditions:
+            query = query.filter(or_(*conditions))
 
-        seed_features = self.get_features_from_articles(interacted_ids)
-        if seed_features["category_ids"]:
-            recommend_conditions.append(
-                Article.category_id.in_(seed_features["category_ids"])
-            )
-        if seed_features["author_ids"]:
-            recommend_conditions.append(
-                Article.author_id.in_(seed_features["author_ids"])
-            )
+        return (
+            query.order_by(Article.created_at.desc(), Article.id.desc())
+            .limit(limit)
+            .all()
+        )
 
-        if recommend_conditions:
-            query = query.filter(or_(*recommend_conditions))
-        else:
-            if favorite_category_slugs:
-                query = query.join(Article.category).filter(
-                    Category.slug.in_(["fallback-slug"])
-                )
-            pass
+    def filter_recommendable_ids(
+        self,
+        user_id: Optional[int],
+        article_ids: list[int],
+        filters: dict = None,
+        exclude_article_id: Optional[int] = None,
+    ) -> set[int]:
+        """
+        Відбирає з готового списку рекомендацій статті, які досі можна показати:
+        з урахуванням фільтрів і того, що користувач побачив після обчислення.
+        """
+        if not article_ids:
+            return set()
 
-        offset = (page - 1) * per_page
-        total = query.count()
-        articles = (
-            query.order_by(desc(Article.created_at))
-            .offset(offset)
-            .limit(per_page)
-            .all()
+        query = self.db_session.query(Article.id).filter(
+            Article.id.in_(article_ids), ~self._seen_by_user(user_id)
         )
+        if filters:
+            if filters.get("status"):
+                query = query.filter(Article.status == filters["status"])
+            if filters.get("is_exclusive") is not None:
+                query = query.filter(Article.is_exclusive == filters["is_exclusive"])
+        if exclude_article_id:
+            query = query.filter(Article.id != exclude_article_id)
 
-        return articles, total
+        return {row.id for row in query.all()}
@@ -1,14 +1,45 @@
 from repositories.repositories import BaseRepository
-from models.author import Author
+from models.author import Author, author_followers
+from models.serialization import FieldSet
 from sqlalchemy.orm import Session
 from sqlalchemy import asc, or_
+from repositories.totals import count_total
 
 
 class AuthorRepository(BaseRepository):
     def __init__(self, db_session: Session):
         super().__init__(db_session, Author)
 
-    def get_paginated_authors(self, page: int, per_page: int, search_query: str | None):
+    def _query(self, fieldset: FieldSet | None = None):
+        # Лічильник статей рахується підзапитом, лише якщо total_articles запитано
+        return self.db_session.query(self.model).options(
+            *self._serialized_options(fieldset)
+        )
+
+    def get_all(self, fieldset: FieldSet | None = None):
+        """Отримує всіх авторів разом з лічильником статей (одним запитом)."""
+        return self._query(fieldset).all()
+
+    def get_by_id(self, author_id: int, fieldset: FieldSet | None = None):
+        return self._query(fieldset).filter_by(id=author_id).first()
+
+    def get_followed_by(self, user_id: int, fieldset: FieldSet | None = None):
+        """Автори, на яких підписаний користувач."""
+        return (
+            self._query(fieldset)
+            .join(author_followers, author_followers.c.author_id == Author.id)
+            .filter(author_followers.c.user_id == user_id)
+            .all()
+        )
+
+    def get_paginated_authors(
+        self,
+        page: int,
+        per_page: int,
+        search_query: str | None,
+        totals: str = "exact",
+        fieldset: FieldSet | None = None,
+    ):
         """
         Отримує пагінований список авторів з пошуком.
         """
@@ -24,11 +55,12 @@ class AuthorRepository(BaseRepository):
                 )
             )
 
-        total = query.count()
+        total = count_total(query, totals)
         offset = (page - 1) * per_page
 
         authors = (
-            query.order_by(asc(self.model.last_name))
+            query.options(*self._serialized_options(fieldset))
+            .order_by(asc(self.model.last_name))
             .offset(offset)
             .limit(per_page)
             .all()
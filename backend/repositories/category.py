@@ -1,8 +1,21 @@
 from repositories.repositories import BaseRepository
 from models.category import Category
+from models.serialization import FieldSet
 from sqlalchemy.orm import Session
 
 
 class CategoryRepository(BaseRepository):
     def __init__(self, db_session: Session):
         super().__init__(db_session, Category)
+
+    def _query(self, fieldset: FieldSet | None = None):
+        return self.db_session.query(self.model).options(
+            *self._serialized_options(fieldset)
+        )
+
+    def get_all(self, fieldset: FieldSet | None = None):
+        """Отримує всі категорії разом з лічильником статей (одним запитом)."""
+        return self._query(fieldset).all()
+
+    def get_by_slug(self, slug: str, fieldset: FieldSet | None = None):
+        return self._query(fieldset).filter_by(slug=slug).first()
@@ -1,24 +1,36 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import desc, update
 from .repositories import BaseRepository
+from .totals import count_total
 from models.notification import Notification
+from models.serialization import FieldSet
 
 
 class NotificationRepository(BaseRepository):
     def __init__(self, db_session: Session):
         super().__init__(db_session, Notification)
 
-    def get_unread_by_user(self, user_id: int, limit: int = 10):
+    def get_unread_by_user(
+        self, user_id: int, limit: int = 10, fieldset: FieldSet | None = None
+    ):
         """Отримує останні N непрочитаних сповіщень для користувача."""
         return (
             self.db_session.query(self.model)
+            .options(*self._serialized_options(fieldset))
             .filter_by(user_id=user_id, is_read=False)
             .order_by(desc(self.model.created_at))
             .limit(limit)
             .all()
         )
 
-    def get_all_by_user(self, user_id: int, page: int = 1, per_page: int = 10):
+    def get_all_by_user(
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 10,
+        totals: str = "exact",
+        fieldset: FieldSet | None = None,
+    ):
         """Отримує всі сповіщення для користувача з пагінацією."""
         query = (
             self.db_session.query(self.model)
@@ -26,10 +38,15 @@ class NotificationRepository(BaseRepository):
             .order_by(desc(self.model.created_at))
         )
 
-        total = query.count()
+        total = count_total(query, totals)
 
         offset = (page - 1) * per_page
-        notifications = query.offset(offset).limit(per_page).all()
+        notifications = (
+            query.options(*self._serialized_options(fieldset))
+            .offset(offset)
+            .limit(per_page)
+            .all()
+        )
 
         return notifications, total
 
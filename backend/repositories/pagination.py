@@ -0,0 +1,142 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import desc, func, select, tuple_
+from repositories.totals import count_total
+
+
+class InvalidCursorError(ValueError):
+    """Пошкоджений або підроблений токен курсора (відповідь 400)."""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Кодує ключ (created_at, id) останнього рядка у непрозорий токен."""
+    payload = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Розкодовує токен курсора. Викидає InvalidCursorError, якщо він пошкоджений."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Невірний курсор пагінації")
+
+
+def paginate(
+    query,
+    created_col,
+    id_col,
+    page: int = 1,
+    per_page: int = 10,
+    cursor: str | None = None,
+    totals: str = "exact",
+    offset_order: list | None = None,
+):
+    """
+    Пагінація за ключем (created_at, id) у спадному порядку.
+
+    cursor=None — класичний OFFSET-режим (page), cursor="" — перша сторінка
+    курсорного режиму, інакше — сторінка після рядка з курсора.
+    offset_order — додаткове сортування лише для OFFSET-режиму (напр. релевантність);
+    тоді next_cursor не повертається, бо порядок не збігається з ключем.
+
+    totals — режим підрахунку total (exact / estimate / none, див. TotalsCounter).
+
+    Повертає (items, total, next_cursor); total=None, якщо totals="none".
+    per_page < 1 дає порожню сторінку.
+    """
+    total = count_total(query, totals)
+    if per_page < 1:
+        return [], total, None
+
+    keyset_order = [desc(created_col), desc(id_col)]
+    if cursor is not None:
+        query = query.order_by(*keyset_order)
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            # Значення created_at беремо з самого рядка: SQLite зберігає
+            # server_default now() без мікросекунд, і прив'язаний datetime
+            # порівнювався б як рядок іншого формату.
+            stored_created_at = (
+                select(created_col)
+                .where(id_col == row_id)
+                .correlate(None)
+                .scalar_subquery()
+            )
+            query = query.filter(
+                tuple_(created_col, id_col)
+                < tuple_(func.coalesce(stored_created_at, created_at), row_id)
+            )
+    else:
+        query = query.order_by(*(offset_order or []), *keyset_order).offset(
+            (page - 1) * per_page
+        )
+
+    rows = query.add_columns(created_col, id_col).limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    next_cursor = None
+    if has_more and not (cursor is None and offset_order):
+        _, last_created_at, last_id = rows[-1]
+        next_cursor = encode_cursor(last_created_at, last_id)
+
+    return [row[0] for row in rows], total, next_cursor
+
+
+def encode_rank_cursor(position: int, row_id: int) -> str:
+    """Кодує позицію та ID останнього елемента ранжованого списку."""
+    payload = json.dumps([position, row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> tuple[int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return int(position), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursorError("Невірний курсор пагінації")
+
+
+def paginate_ids(
+    ids: list[int],
+    page: int = 1,
+    per_page: int = 10,
+    cursor: str | None = None,
+    totals: str = "exact",
+):
+    """
+    Пагінація готового ранжованого списку ID (без запитів до БД).
+
+    Курсор запам'ятовує позицію та ID останнього елемента: якщо список між
+    запитами перерахували, продовжуємо після того ж ID, а за його відсутності —
+    з тієї ж позиції.
+
+    Повертає (page_ids, total, next_cursor); per_page < 1 дає порожню сторінку.
+    """
+    total = len(ids) if totals != "none" else None
+    if per_page < 1:
+        return [], total, None
+
+    start = (page - 1) * per_page
+    if cursor is not None:
+        start = 0
+        if cursor:
+            position, row_id = decode_rank_cursor(cursor)
+            if position < len(ids) and ids[position] == row_id:
+                start = position + 1
+            elif row_id in ids:
+                start = ids.index(row_id) + 1
+            else:
+                start = position
+
+    page_ids = ids[start : start + per_page]
+    next_cursor = None
+    if page_ids and start + per_page < len(ids):
+        next_cursor = encode_rank_cursor(start + per_page - 1, page_ids[-1])
+
+    return page_ids, total, next_cursor
@@ -0,0 +1,137 @@
+from datetime import datetime
+from repositories.repositories import BaseRepository
+from models.article import Article, ArticleInteraction, ArticleView
+from models.recommendation import UserRecommendation
+from models.user import User
+from sqlalchemy import Text, cast, exists, or_, select, union
+from sqlalchemy.orm import Session
+
+
+class RecommendationRepository(BaseRepository):
+    def __init__(self, db_session: Session):
+        super().__init__(db_session, UserRecommendation)
+
+    def get_for_user(self, user_id: int) -> UserRecommendation | None:
+        return self.get_by(user_id=user_id)
+
+    def save_for_user(self, user_id: int, article_ids: list[int]) -> UserRecommendation:
+        """Зберігає (або замінює) ранжований список рекомендацій користувача."""
+        entry = self.get_for_user(user_id)
+        if entry is None:
+            entry = UserRecommendation(user_id=user_id)
+            self.db_session.add(entry)
+
+        entry.article_ids = article_ids
+        entry.is_stale = False
+        entry.computed_at = datetime.now()
+        self.db_session.commit()
+        return entry
+
+    def mark_stale(self, user_id: int | None = None, commit: bool = False):
+        """
+        Позначає списки застарілими (усі, якщо user_id не задано).
+        Без commit зміна фіксується разом з транзакцією, що її спричинила.
+        """
+        query = self.db_session.query(UserRecommendation)
+        if user_id is not None:
+            query = query.filter(UserRecommendation.user_id == user_id)
+        query.update({UserRecommendation.is_stale: True}, synchronize_session=False)
+        if commit:
+            self.db_session.commit()
+
+    def add_article(self, article: Article, max_stored: int) -> tuple[int, int]:
+        """
+        Вносить нову статтю лише у списки, до яких вона може потрапити
+        (кандидати обмежені категоріями та авторами інтересів користувача):
+
+        - користувачам, що взаємодіяли з її категорією чи автором або мають
+          її категорію в улюблених, список позначається застарілим;
+        - користувачам без жодних інтересів (їхній список — найновіші
+          статті) ID статті додається на початок.
+
+        Не комітить. Повертає (позначено застарілими, доповнено).
+        """
+        related = [Article.author_id == article.author_id]
+        if article.category_id is not None:
+            related.append(Article.category_id == article.category_id)
+        interested = [
+            UserRecommendation.user_id.in_(
+                select(ArticleInteraction.user_id)
+                .join(Article, Article.id == ArticleInteraction.article_id)
+                .where(or_(*related))
+            ),
+            UserRecommendation.user_id.in_(
+                select(ArticleView.user_id)
+                .join(Article, Article.id == ArticleView.article_id)
+                .where(ArticleView.user_id.isnot(None), or_(*related))
+            ),
+        ]
+        if article.category is not None:
+            # Пошук у тексті JSON може дати зайві збіги — це лише зайвий перерахунок
+            interested.append(
+                UserRecommendation.user_id.in_(
+                    select(User.id).where(
+                        cast(User.preferences, Text).like(
+                            f'%"{article.category.slug}"%'
+                        )
+                    )
+                )
+            )
+        marked = (
+            self.db_session.query(UserRecommendation)
+            .filter(UserRecommendation.is_stale.is_(False), or_(*interested))
+            .update({UserRecommendation.is_stale: True}, synchronize_session=False)
+        )
+
+        without_interests = (
+            self.db_session.query(UserRecommendation, User.preferences)
+            .join(User, User.id == UserRecommendation.user_id)
+            .filter(
+                UserRecommendation.is_stale.is_(False),
+                ~exists().where(ArticleInteraction.user_id == User.id),
+                ~exists().where(ArticleView.user_id == User.id),
+            )
+            .all()
+        )
+        extended = 0
+        for entry, preferences in without_interests:
+            if (preferences or {}).get("favorite_categories"):
+                continue
+            if article.id not in entry.article_ids:
+                entry.article_ids = [article.id, *entry.article_ids][:max_stored]
+                extended += 1
+        return marked, extended
+
+    def get_user_ids_to_refresh(
+        self, active_since: datetime, computed_before: datetime
+    ) -> list[int]:
+        """
+        ID активних користувачів (взаємодії або перегляди після active_since),
+        у яких список відсутній, застарілий або обчислений до computed_before.
+        """
+        active_users = union(
+            select(ArticleInteraction.user_id.label("user_id")).where(
+                ArticleInteraction.created_at >= active_since
+            ),
+            select(ArticleView.user_id.label("user_id")).where(
+                ArticleView.user_id.isnot(None),
+                ArticleView.viewed_at >= active_since,
+            ),
+        ).subquery()
+
+        rows = (
+            self.db_session.query(active_users.c.user_id)
+            .outerjoin(
+                UserRecommendation,
+                UserRecommendation.user_id == active_users.c.user_id,
+            )
+            .filter(
+                or_(
+                    UserRecommendation.id.is_(None),
+                    UserRecommendation.is_stale.is_(True),
+                    UserRecommendation.computed_at < computed_before,
+                )
+            )
+            .all()
+        )
+        return [row.user_id for row in rows]
@@ -1,4 +1,6 @@
 from sqlalchemy.orm import Session
+from models.serialization import FieldSet
+from repositories.totals import count_total
 
 
 class BaseRepository:
@@ -9,8 +11,19 @@ class BaseRepository:
     def get_by(self, **kwargs):
         return self.db_session.query(self.model).filter_by(**kwargs).first()
 
-    def get_all(self):
-        return self.db_session.query(self.model).all()
+    def _serialized_options(self, fieldset: FieldSet | None = None) -> list:
+        """Опції запиту лише під поля серіалізації моделі (з урахуванням FieldSet)."""
+        return self.model.SERIALIZER.load_options(self.model, fieldset)
+
+    def get_all(self, fieldset: FieldSet | None = None):
+        """
+        Отримує всі записи. З fieldset вибираються лише поля, потрібні
+        серіалізації (див. Serializer.load_options).
+        """
+        query = self.db_session.query(self.model)
+        if fieldset is not None:
+            query = query.options(*self._serialized_options(fieldset))
+        return query.all()
 
     def get_all_by(self, **kwargs):
         return self.db_session.query(self.model).filter_by(**kwargs).all()
@@ -21,10 +34,13 @@ class BaseRepository:
         per_page: int = 10,
         order_by_col: str = "id",
         order_desc: bool = True,
+        totals: str = "exact",
+        fieldset: FieldSet | None = None,
     ):
+        """Сторінка записів для серіалізації: вибираються лише поля відповіді."""
         base_query = self.db_session.query(self.model)
 
-        total = base_query.count()
+        total = count_total(base_query, totals)
 
         order_column = getattr(self.model, order_by_col, self.model.id)
         if order_desc:
@@ -33,7 +49,11 @@ class BaseRepository:
         offset = (page - 1) * per_page
 
         instances = (
-            base_query.order_by(order_column).offset(offset).limit(per_page).all()
+            base_query.options(*self._serialized_options(fieldset))
+            .order_by(order_column)
+            .offset(offset)
+            .limit(per_page)
+            .all()
         )
 
         return instances, total
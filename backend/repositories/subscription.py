@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from repositories.repositories import BaseRepository
 from database import IDatabaseConnection
 from models.subscription import SubscriptionPlan, UserSubscriptionPlan
+from models.user import User
 from sqlalchemy import asc
 
 
@@ -43,10 +44,34 @@ class SubscriptionRepository(BaseRepository):
 
         new_sub = UserSubscriptionPlan(user_id=user_id, plan_id=plan_id, is_active=True)
         self.db_session.add(new_sub)
+        self._bump_permissions_versions([user_id])
         self.db_session.commit()
         self.db_session.refresh(new_sub)
         return new_sub
 
+    def bump_plan_subscribers(self, plan_id: int) -> list[int]:
+        """
+        Позначає застарілими токени всіх активних підписників плану (після
+        зміни його прав). Повертає ID цих користувачів.
+        """
+        user_ids = [
+            user_id
+            for (user_id,) in self.db_session.query(UserSubscriptionPlan.user_id)
+            .filter_by(plan_id=plan_id, is_active=True)
+            .distinct()
+        ]
+        self._bump_permissions_versions(user_ids)
+        self.db_session.commit()
+        return user_ids
+
+    def _bump_permissions_versions(self, user_ids: list[int]):
+        if not user_ids:
+            return
+        self.db_session.query(User).filter(User.id.in_(user_ids)).update(
+            {User.permissions_version: User.permissions_version + 1},
+            synchronize_session=False,
+        )
+
     def get_user_subscription_history(self, user_id: int):
         return (
             self.db_session.query(UserSubscriptionPlan)
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import uuid
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+from cache import ICacheBackend
+
+TOTALS_MODES = ("exact", "estimate", "none")
+
+
+def parse_totals_mode(args) -> str:
+    """
+    Режим підрахунку total з параметрів запиту: ?totals=exact|estimate|none.
+    ?with_total=false залишається синонімом totals=none.
+    """
+    if args.get("with_total", "true").lower() == "false":
+        return "none"
+    mode = args.get("totals", "exact")
+    return mode if mode in TOTALS_MODES else "exact"
+
+
+class TotalsCounter:
+    """
+    Стратегія підрахунку total для пагінованих запитів.
+
+    exact    — точний COUNT, кешований за сигнатурою запиту (SQL + параметри).
+               Ключ містить токени поколінь усіх таблиць запиту; після коміту,
+               що змінив таблицю, її токен оновлюється і старі значення
+               більше не використовуються.
+    estimate — оцінка планувальника PostgreSQL (EXPLAIN); на малих таблицях
+               та інших СУБД — як exact.
+    none     — total не рахується взагалі.
+
+    Токени поколінь зберігаються в backend. InMemoryLRUCache — окремий у
+    кожному процесі, тож коміт у одному воркері gunicorn не інвалідовує
+    total в інших: там вони лишаються застарілими до ttl секунд. Точні
+    total між воркерами дає лише спільний бекенд (Redis).
+    """
+
+    KEY_PREFIX = "count:"
+    GENERATION_PREFIX = "count-gen:"
+    # Лічильники, які оновлюються на кожен показ/лайк/збереження, але не
+    # фільтрують пагіновані запити: такі UPDATE кешованих total не змінюють
+    COUNTER_COLUMNS = {
+        "articles": frozenset({"views_count", "likes_count", "saves_count"}),
+        "ads": frozenset({"impressions_count", "clicks_count"}),
+    }
+    # Нижче цього порогу оцінка неточна, а точний COUNT і так дешевий
+    ESTIMATE_EXACT_BELOW = 1000
+
+    def __init__(self, backend: ICacheBackend | None = None, ttl: int = 300):
+        self.backend = backend
+        self.ttl = ttl
+
+    def count(self, query, mode: str = "exact") -> int | None:
+        if mode == "none":
+            return None
+
+        query = query.order_by(None)
+        if mode == "estimate":
+            estimate = self._estimate(query)
+            if estimate is not None and estimate >= self.ESTIMATE_EXACT_BELOW:
+                return estimate
+
+        return self._exact(query)
+
+    def _exact(self, query) -> int:
+        if self.backend is None:
+            return query.count()
+
+        statement = query.statement
+        compiled = statement.compile(bind=query.session.get_bind())
+        tables = sorted({table.name for table in find_tables(statement, include_joins=True)})
+        signature = json.dumps(
+            [str(compiled), compiled.params, self._generations(tables)],
+            sort_keys=True,
+            default=str,
+        )
+        key = self.KEY_PREFIX + hashlib.sha1(signature.encode()).hexdigest()
+
+        total = self.backend.get(key)
+        if total is None:
+            total = query.count()
+            self.backend.set(key, total, self.ttl)
+        return total
+
+    def _estimate(self, query) -> int | None:
+        bind = query.session.get_bind()
+        if bind.dialect.name != "postgresql":
+            return None
+
+        # IN (...) у PostgreSQL компілюється як POSTCOMPILE-заглушка, яку
+        # розгортає лише execute(); для сирого SQL параметри розгортаються тут
+        compiled = query.statement.compile(
+            bind=bind, compile_kwargs={"render_postcompile": True}
+        )
+        plan = (
+            query.session.connection()
+            .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+            .scalar()
+        )
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _generations(self, tables: list[str]) -> list[str]:
+        keys = [self.GENERATION_PREFIX + table for table in tables]
+        tokens = self.backend.get_many(keys)
+        for index, token in enumerate(tokens):
+            if token is None:
+                tokens[index] = uuid.uuid4().hex
+                self.backend.set(keys[index], tokens[index])
+        return tokens
+
+    def invalidate(self, tables):
+        """Оновлює токени поколінь таблиць — кешовані total для них застарівають."""
+        if self.backend is None:
+            return
+        for table in tables:
+            self.backend.set(self.GENERATION_PREFIX + table, uuid.uuid4().hex)
+
+    def install(self, session_factory):
+        """
+        Підключає інвалідацію до сесій session_factory (sessionmaker цього
+        з'єднання з БД): таблиці, змінені через flush або bulk
+        INSERT/UPDATE/DELETE, інвалідовуються після коміту транзакції.
+        UPDATE лише лічильників (COUNTER_COLUMNS) таблицю не інвалідовує.
+        """
+        if not event.contains(session_factory, "after_commit", self._after_commit):
+            event.listen(session_factory, "after_flush", self._after_flush)
+            event.listen(session_factory, "do_orm_execute", self._on_execute)
+            event.listen(session_factory, "after_commit", self._after_commit)
+            event.listen(session_factory, "after_rollback", self._after_rollback)
+
+    @staticmethod
+    def _written_tables(session: Session) -> set:
+        return session.info.setdefault("written_tables", set())
+
+    def _only_counters(self, table: str, columns) -> bool:
+        counters = self.COUNTER_COLUMNS.get(table)
+        return bool(counters and columns) and counters.issuperset(columns)
+
+    def _after_flush(self, session: Session, flush_context):
+        written = self._written_tables(session)
+        for instance in (*session.new, *session.deleted):
+            written.update(table.name for table in inspect(instance).mapper.tables)
+        for instance in session.dirty:
+            state = inspect(instance)
+            changed = {attr.key for attr in state.attrs if attr.history.has_changes()}
+            written.update(
+                table.name
+                for table in state.mapper.tables
+                if not self._only_counters(table.name, changed)
+            )
+
+    @staticmethod
+    def _updated_columns(statement) -> set | None:
+        """Назви колонок у SET оператора UPDATE або None, якщо їх не видно."""
+        values = statement._values or dict(statement._ordered_values or ())
+        if not values:
+            return None
+        return {getattr(column, "key", column) for column in values}
+
+    def _on_execute(self, orm_execute_state):
+        if not (
+            orm_execute_state.is_insert
+            or orm_execute_state.is_update
+            or orm_execute_state.is_delete
+        ):
+            return
+        table = orm_execute_state.statement.table.name
+        if orm_execute_state.is_update and self._only_counters(
+            table, self._updated_columns(orm_execute_state.statement)
+        ):
+            return
+        self._written_tables(orm_execute_state.session).add(table)
+
+    def _after_commit(self, session: Session):
+        tables = session.info.pop("written_tables", None)
+        if tables:
+            self.invalidate(tables)
+
+    def _after_rollback(self, session: Session):
+        session.info.pop("written_tables", None)
+
+
+def count_total(query, mode: str = "exact") -> int | None:
+    """Рахує total запиту обраною стратегією (див. TotalsCounter)."""
+    if has_app_context():
+        counter = current_app.container.resolve(TotalsCounter)
+    else:
+        counter = TotalsCounter()
+    return counter.count(query, mode)
@@ -21,6 +21,14 @@ class UserRepository(BaseRepository):
     def get_by_email(self, email: str):
         return self.db_session.query(User).filter_by(email=email).first()
 
+    def get_permissions_version(self, user_id: int):
+        """Поточна версія прав користувача або None, якщо його немає."""
+        return (
+            self.db_session.query(User.permissions_version)
+            .filter_by(id=user_id)
+            .scalar()
+        )
+
     def get_paginated_users(self, page: int, per_page: int):
         """
         Отримує пагінований список користувачів, сортованих за username.
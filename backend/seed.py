@@ -23,13 +23,19 @@ def clear_data(session: Session):
     """Видаляє всі дані з таблиць у правильному порядку."""
     print("Очищення бази даних...")
     session.execute(author_followers.delete())
+    session.query(UserRecommendation).delete()
     session.query(ArticleInteraction).delete()
     session.query(Comment).delete()
     session.query(ArticleView).delete()
     session.query(AdView).delete()
+    session.query(AdClick).delete()
+    session.query(AdStatHourly).delete()
+    session.query(AdStatDaily).delete()
+    session.query(AdRollupState).delete()
     session.query(UserSubscriptionPlan).delete()
     session.query(Notification).delete()
     session.query(NewsletterSubscription).delete()
+    ArticleRepository(session).search_index.clear(session)
     session.query(Article).delete()
     session.query(Ad).delete()
     session.query(Author).delete()
@@ -1216,6 +1222,8 @@ def seed_database():
                 )
 
             db_session.add_all(interactions_to_add)
+            db_session.flush()
+            article_repo.reconcile_interaction_counters()
             print(f"✓ Взаємодій створено: {len(interactions_to_add)}")
 
             # ============================================================
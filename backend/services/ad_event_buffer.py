@@ -0,0 +1,158 @@
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+from flask import current_app
+from database import IDatabaseConnection
+from repositories.ad import AdRepository
+from services.impression_buffer import WriteBehindBuffer
+
+
+class AdEventBuffer(WriteBehindBuffer):
+    """
+    Буфер показів і кліків реклами.
+
+    Покази (рядки ad_views) та кліки (ad_clicks) накопичуються в пам'яті,
+    а скидання — це масові INSERT і по одному атомарному UPDATE лічильника
+    на оголошення замість читання-зміни-запису на кожну подію.
+    pending_counts() віддає ще не записані дельти, щоб статистика
+    в адмін-панелі враховувала їх.
+
+    Якщо max_pending вичерпано (БД довго недоступна), кліки мають
+    пріоритет: після невдалого скидання першими відкидаються покази.
+    """
+
+    worker_name = "ad-event-flusher"
+
+    def __init__(
+        self,
+        db_connection: IDatabaseConnection,
+        max_size: int = 500,
+        flush_interval: float = 5.0,
+        max_pending: Optional[int] = None,
+    ):
+        super().__init__(db_connection, max_size, flush_interval, max_pending)
+        self._views: list[dict] = []
+        self._clicks: list[dict] = []
+        # Події, які зараз записуються: до коміту їх теж показуємо як очікувані
+        self._in_flight: tuple[list[dict], list[dict]] = ([], [])
+
+    def add_impressions(
+        self,
+        ad_ids: list[int],
+        user_id: Optional[int] = None,
+        session_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ):
+        self._ensure_worker()
+        viewed_at = datetime.now()
+        with self._lock:
+            accepted = self._room(self._size(), len(ad_ids))
+            self._views.extend(
+                {
+                    "ad_id": ad_id,
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "ip_address": ip_address,
+                    "viewed_at": viewed_at,
+                }
+                for ad_id in ad_ids[:accepted]
+            )
+            is_full = self._should_flush(self._size())
+
+        if is_full:
+            self.flush()
+
+    def add_click(self, ad_id: int):
+        self._ensure_worker()
+        with self._lock:
+            if self._room(self._size(), 1):
+                self._clicks.append({"ad_id": ad_id, "clicked_at": datetime.now()})
+            is_full = self._should_flush(self._size())
+
+        if is_full:
+            self.flush()
+
+    def _size(self) -> int:
+        return len(self._views) + len(self._clicks)
+
+    def pending_counts(self) -> dict[int, tuple[int, int]]:
+        """Ще не записані (покази, кліки) за ID оголошення."""
+        with self._lock:
+            views = self._views + self._in_flight[0]
+            click_events = self._clicks + self._in_flight[1]
+
+        impressions = Counter(view["ad_id"] for view in views)
+        clicks = Counter(click["ad_id"] for click in click_events)
+        return {
+            ad_id: (impressions[ad_id], clicks[ad_id])
+            for ad_id in impressions.keys() | clicks.keys()
+        }
+
+    def live_counts(self, ads) -> dict[int, tuple[int, int]]:
+        """(покази, кліки) оголошень: записані значення плюс очікувані дельти."""
+        pending = self.pending_counts()
+        result = {}
+        for ad in ads:
+            pending_impressions, pending_clicks = pending.get(ad.id, (0, 0))
+            result[ad.id] = (
+                ad.impressions_count + pending_impressions,
+                ad.clicks_count + pending_clicks,
+            )
+        return result
+
+    def load_live_counts(self, ad_ids: list[int]) -> dict[int, tuple[int, int]]:
+        """
+        Актуальні (покази, кліки) оголошень за ID: значення з БД плюс
+        очікувані дельти. Працює поза контекстом запиту (власна сесія).
+        """
+        db_session = self.db_connection.get_session()
+        try:
+            counters = AdRepository(db_session).get_counters(ad_ids)
+        finally:
+            db_session.close()
+
+        pending = self.pending_counts()
+        result = {}
+        for ad_id, (impressions, clicks) in counters.items():
+            pending_impressions, pending_clicks = pending.get(ad_id, (0, 0))
+            result[ad_id] = (impressions + pending_impressions, clicks + pending_clicks)
+        return result
+
+    def flush(self) -> int:
+        """Записує накопичені події в БД. Повертає кількість записаних подій."""
+        with self._flush_lock:
+            with self._lock:
+                views, self._views = self._views, []
+                clicks, self._clicks = self._clicks, []
+                self._in_flight = (views, clicks)
+            if not views and not clicks:
+                return 0
+
+            db_session = self.db_connection.get_session()
+            try:
+                recorded = AdRepository(db_session).record_events(views, clicks)
+                self._flush_succeeded()
+                return recorded
+            except Exception as e:
+                db_session.rollback()
+                with self._lock:
+                    self._clicks = self._requeue(
+                        clicks, self._clicks, self.max_pending
+                    )
+                    self._views = self._requeue(
+                        views, self._views, self.max_pending - len(self._clicks)
+                    )
+                self._flush_failed()
+                print(
+                    f"ПОМИЛКА під час запису подій реклами: {e} "
+                    f"(відкинуто подій: {self.dropped})"
+                )
+                return 0
+            finally:
+                with self._lock:
+                    self._in_flight = ([], [])
+                db_session.close()
+
+
+def get_ad_event_buffer() -> AdEventBuffer:
+    return current_app.container.resolve(AdEventBuffer)
@@ -0,0 +1,127 @@
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Callable, Optional
+from flask import current_app
+from cache import ICacheBackend
+from database import IDatabaseConnection
+from models.ad import Ad
+from services.ad_timeline import AdStatusCounts, AdTimeline, AdTimelineEvent
+
+
+class AdInventorySnapshot:
+    """
+    Знімок рекламних оголошень: шкала розкладу увімкнених
+    оголошень (AdTimeline) та лічильники статусів усіх оголошень.
+    """
+
+    def __init__(self, ads: list[Ad], version: Optional[str]):
+        self.version = version
+        self.ads = [ad for ad in ads if ad.is_active]
+        self.timeline = AdTimeline(self.ads)
+        self.status_counts = AdStatusCounts(ads)
+
+
+class AdInventory:
+    """
+    Індекс активних рекламних оголошень у пам'яті процесу.
+
+    Оголошення завантажуються одним запитом і перечитуються, коли змінюється
+    версія інвентарю в кеш-бекенді (адмін-панель викликає invalidate()) або
+    минає ttl секунд — на випадок змін в обхід адмін-панелі.
+    Повернені об'єкти від'єднані від сесії і призначені лише для читання.
+
+    Коли запит переходить межу розкладу (початок чи кінець показу),
+    підписники subscribe() отримують події AdTimelineEvent — кеші
+    оновлюються лише для зачеплених оголошень, без повторного перебору.
+    """
+
+    VERSION_KEY = "ads:inventory-version"
+
+    def __init__(
+        self,
+        db_connection: IDatabaseConnection,
+        version_backend: Optional[ICacheBackend] = None,
+        ttl: float = 60,
+    ):
+        self.db_connection = db_connection
+        self.version_backend = version_backend
+        self.ttl = ttl
+        self._snapshot: Optional[AdInventorySnapshot] = None
+        self._listeners: list[Callable[[list[AdTimelineEvent]], None]] = []
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_active_ads(
+        self, ad_type: Optional[str] = None, now: Optional[datetime] = None
+    ) -> tuple[Ad, ...]:
+        """Активні на момент now оголошення типу ad_type (усі, якщо None)."""
+        return self._active_by_type(now).get(ad_type, ())
+
+    def get_active_ads_by_type(
+        self, ad_types: list[str], now: Optional[datetime] = None
+    ) -> dict[str, tuple[Ad, ...]]:
+        """Активні оголошення для кількох типів з одного знімка інвентарю."""
+        by_type = self._active_by_type(now)
+        return {ad_type: by_type.get(ad_type, ()) for ad_type in ad_types}
+
+    def get_status_counts(self, now: Optional[datetime] = None) -> dict:
+        """Кількість оголошень за статусами (див. ad_status) на момент now."""
+        return self._current_snapshot().status_counts.at(now or datetime.now())
+
+    def subscribe(self, listener: Callable[[list[AdTimelineEvent]], None]):
+        """Підписує listener на події активації та завершення показу."""
+        self._listeners.append(listener)
+
+    def _active_by_type(self, now: Optional[datetime]) -> dict:
+        by_type, events = self._current_snapshot().timeline.active_by_type(
+            now or datetime.now()
+        )
+        if events:
+            for listener in self._listeners:
+                listener(events)
+        return by_type
+
+    def invalidate(self):
+        """Видає інвентарю нову версію: усі процеси перечитають оголошення."""
+        if self.version_backend is not None:
+            self.version_backend.set(self.VERSION_KEY, uuid.uuid4().hex)
+        self._expires_at = 0.0
+
+    def _current_version(self) -> Optional[str]:
+        if self.version_backend is None:
+            return None
+        return self.version_backend.get(self.VERSION_KEY)
+
+    def _current_snapshot(self) -> AdInventorySnapshot:
+        version = self._current_version()
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot, version):
+            return snapshot
+
+        with self._lock:
+            if not self._is_fresh(self._snapshot, version):
+                self._snapshot = AdInventorySnapshot(self._load_ads(), version)
+                self._expires_at = time.monotonic() + self.ttl
+            return self._snapshot
+
+    def _is_fresh(self, snapshot, version) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == version
+            and time.monotonic() < self._expires_at
+        )
+
+    def _load_ads(self) -> list[Ad]:
+        db_session = self.db_connection.get_session()
+        try:
+            ads = db_session.query(Ad).order_by(Ad.id).all()
+            db_session.expunge_all()
+            return ads
+        finally:
+            db_session.close()
+
+
+def get_ad_inventory() -> AdInventory:
+    return current_app.container.resolve(AdInventory)
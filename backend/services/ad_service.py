@@ -5,17 +5,41 @@ from services.ad_strategy import (
     DefaultAdStrategy,
     RotationAdStrategy,
     RandomAdStrategy,
+    get_weighted_ctr_strategy,
+    get_weighted_strategy,
 )
+from models.serialization import FieldSet
 from repositories.ad import AdRepository
+from services.ad_inventory import AdInventory, get_ad_inventory
+from services.ad_slates import AdSlates, get_ad_slates
+from services.ad_timeline import ad_status
+from services.ad_event_buffer import AdEventBuffer, get_ad_event_buffer
+from services.rotation_state import IRotationStateBackend, get_rotation_state
+from services.frequency_cap import AdFrequencyCapper, get_frequency_capper, viewer_key
 
 
 class AdService:
-    def __init__(self, ad_repo: AdRepository):
+    def __init__(
+        self,
+        ad_repo: AdRepository,
+        ad_inventory: Optional[AdInventory] = None,
+        ad_event_buffer: Optional[AdEventBuffer] = None,
+        rotation_state: Optional[IRotationStateBackend] = None,
+        frequency_capper: Optional[AdFrequencyCapper] = None,
+        ad_slates: Optional[AdSlates] = None,
+    ):
         self.ad_repo = ad_repo
+        self.ad_inventory = ad_inventory or get_ad_inventory()
+        self.ad_event_buffer = ad_event_buffer or get_ad_event_buffer()
+        self.frequency_capper = frequency_capper or get_frequency_capper()
+        self.ad_slates = ad_slates or get_ad_slates()
         self.strategies: Dict[str, AdSelectionStrategy] = {
             "default": DefaultAdStrategy(),
-            "rotation": RotationAdStrategy(),
+            "rotation": RotationAdStrategy(rotation_state or get_rotation_state()),
             "random": RandomAdStrategy(),
+            # Зважені стратегії тримають індекси між запитами — один екземпляр на процес
+            "weighted": get_weighted_strategy(),
+            "weighted_ctr": get_weighted_ctr_strategy(),
         }
 
     def _get_strategy(self, strategy_name: Optional[str] = "default"):
@@ -23,7 +47,7 @@ class AdService:
         return self.strategies.get(strategy_name, self.strategies["default"])
 
     def should_show_ads(self, user_permissions: dict) -> bool:
-        return not user_permissions.get("no_ads", False)
+        return not (user_permissions or {}).get("no_ads", False)
 
     def get_ads_for_user(
         self,
@@ -31,49 +55,62 @@ class AdService:
         user_permissions: Optional[dict] = None,
         limit: int = 5,
         strategy: str = "default",
+        viewer: Optional[str] = None,
     ) -> List:
+        """viewer — ключ глядача (viewer_key) для частотних обмежень."""
         if user_permissions and not self.should_show_ads(user_permissions):
             return []
 
-        current_time = datetime.now()
-        ads = self.ad_repo.get_all()
-
-        active_ads = [
-            ad
-            for ad in ads
-            if ad.is_active
-            and (not ad.start_date or ad.start_date <= current_time)
-            and (not ad.end_date or ad.end_date >= current_time)
-        ]
-
-        if ad_type:
-            active_ads = [ad for ad in active_ads if ad.ad_type == ad_type]
+        active_ads = self.ad_inventory.get_active_ads(ad_type or None)
 
         selection_strategy = self._get_strategy(strategy)
-        selected_ads = selection_strategy.select_ads(active_ads, limit)
+        selected_ads = selection_strategy.select_ads(
+            active_ads, limit, self.frequency_capper.capped_ad_ids(viewer)
+        )
 
         return selected_ads
 
+    def get_ad_payloads(
+        self,
+        ad_type: Optional[str] = None,
+        limit: int = 5,
+        strategy: str = "default",
+        viewer: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Серіалізовані оголошення з готової добірки місця розміщення.
+        Права користувача перевіряє викликач; БД не використовується.
+        """
+        slate = self.ad_slates.get_slate(ad_type or None)
+        selected_ads = self._get_strategy(strategy).select_ads(
+            slate.ads, limit, self.frequency_capper.capped_ad_ids(viewer)
+        )
+        return slate.render(selected_ads)
+
     def get_ads_by_placement(
         self,
         user_permissions: Optional[dict] = None,
         placements: List[str] = ["banner", "sidebar", "popup", "inline", "video"],
         strategy: str = "default",
+        limit: int = 3,
+        viewer: Optional[str] = None,
     ) -> Dict[str, List]:
+        """
+        Обирає рекламу для кількох місць розміщення за одне звернення до
+        інвентарю: активні оголошення розбиваються за типом, і стратегія
+        застосовується до кожного місця окремо.
+        """
         if user_permissions and not self.should_show_ads(user_permissions):
             return {p: [] for p in placements}
 
-        result = {}
-
-        for ad_type in placements:
-            result[ad_type] = self.get_ads_for_user(
-                ad_type=ad_type,
-                user_permissions=user_permissions,
-                limit=3,
-                strategy=strategy,
-            )
+        selection_strategy = self._get_strategy(strategy)
+        eligible = self.ad_inventory.get_active_ads_by_type(placements)
+        capped_ids = self.frequency_capper.capped_ad_ids(viewer)
 
-        return result
+        return {
+            ad_type: selection_strategy.select_ads(ads, limit, capped_ids)
+            for ad_type, ads in eligible.items()
+        }
 
     def record_impression(
         self,
@@ -94,39 +131,46 @@ class AdService:
         Returns:
             True якщо показ зареєстровано успішно
         """
-        try:
-
-            ad = self.ad_repo.get_by(id=ad_id)
-            if not ad:
-                raise ValueError(f"Рекламне оголошення з ID {ad_id} не знайдено")
-
-            self.ad_repo.update(ad, {"impressions_count": ad.impressions_count + 1})
-
-            from repositories import get_ad_view_repo
+        return bool(
+            self.record_impressions([ad_id], user_id, session_id, ip_address)
+        )
 
-            ad_view_repo = get_ad_view_repo()
-            ad_view_repo.create(
-                {
-                    "ad_id": ad_id,
-                    "user_id": user_id,
-                    "session_id": session_id,
-                    "ip_address": ip_address,
-                    "viewed_at": datetime.now(),
-                }
-            )
+    def record_impressions(
+        self,
+        ad_ids: List[int],
+        user_id: Optional[int] = None,
+        session_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ) -> List[int]:
+        """
+        Реєструє покази кількох оголошень. Покази буферизуються і
+        записуються в БД пакетами (див. AdEventBuffer). Дублікати та покази
+        понад частотний ліміт глядача приймаються, але не зараховуються.
 
-            return True
+        Returns:
+            Список ID прийнятих показів (неіснуючі оголошення пропускаються)
+        """
+        try:
+            existing_ids = self.ad_repo.get_existing_ids(ad_ids)
         except Exception as e:
+            self.ad_repo.db_session.rollback()
             print(f"Помилка при реєстрації показу реклами: {str(e)}")
-            return False
+            return []
+
+        accepted = [ad_id for ad_id in ad_ids if ad_id in existing_ids]
+        counted = self.frequency_capper.admit(viewer_key(user_id, session_id), accepted)
+        if counted:
+            self.ad_event_buffer.add_impressions(
+                counted, user_id=user_id, session_id=session_id, ip_address=ip_address
+            )
+        return accepted
 
     def record_click(self, ad_id: int) -> bool:
         try:
-            ad = self.ad_repo.get_by(id=ad_id)
-            if not ad:
+            if not self.ad_repo.get_existing_ids([ad_id]):
                 raise ValueError(f"Рекламне оголошення з ID {ad_id} не знайдено")
 
-            self.ad_repo.update(ad, {"clicks_count": ad.clicks_count + 1})
+            self.ad_event_buffer.add_click(ad_id)
 
             return True
         except Exception as e:
@@ -138,46 +182,53 @@ class AdService:
         if not ad:
             raise ValueError(f"Рекламне оголошення з ID {ad_id} не знайдено")
 
-        ctr = (
-            round((ad.clicks_count / ad.impressions_count * 100), 2)
-            if ad.impressions_count > 0
-            else 0
-        )
+        impressions, clicks = self.ad_event_buffer.live_counts([ad])[ad.id]
+        ctr = round((clicks / impressions * 100), 2) if impressions > 0 else 0
 
         return {
             "ad_id": ad.id,
             "title": ad.title,
-            "impressions": ad.impressions_count,
-            "clicks": ad.clicks_count,
+            "impressions": impressions,
+            "clicks": clicks,
             "ctr": ctr,
             "is_active": ad.is_active,
             "ad_type": ad.ad_type,
         }
 
     def get_paginated_ads_for_admin(
-        self, page: int, per_page: int, status: str | None, ad_type: str | None
+        self,
+        page: int,
+        per_page: int,
+        status: str | None,
+        ad_type: str | None,
+        fieldset: FieldSet | None = None,
     ):
         """
         Отримує пагінований список оголошень для адмін-панелі.
+        Живі лічильники, ctr і статус додаються, якщо їх запитано у fieldset.
         """
+        now = datetime.now()
         ads, total = self.ad_repo.get_paginated_ads(
-            page=page, per_page=per_page, status=status, ad_type=ad_type
+            page=page, per_page=per_page, status=status, ad_type=ad_type, now=now
         )
 
+        live_counts = self.ad_event_buffer.live_counts(ads)
         result = []
         for ad in ads:
-            ad_data = ad.to_dict()
-
-            ad_data["ctr"] = (
-                round((ad.clicks_count / ad.impressions_count * 100), 2)
-                if ad.impressions_count > 0
-                else 0
+            ad_data = ad.to_dict(fieldset)
+
+            impressions, clicks = live_counts[ad.id]
+            extra = {
+                "impressions_count": impressions,
+                "clicks_count": clicks,
+                "ctr": round((clicks / impressions * 100), 2) if impressions > 0 else 0,
+                "status": ad_status(ad, now),
+            }
+            ad_data.update(
+                (name, value)
+                for name, value in extra.items()
+                if fieldset is None or fieldset.wants(name, False, True)
             )
-            ad_data["status"] = "inactive"  # Default
-            if ad.is_active and (not ad.end_date or ad.end_date > datetime.now()):
-                ad_data["status"] = "active"
-            if ad.end_date and ad.end_date < datetime.now():
-                ad_data["status"] = "expired"
 
             result.append(ad_data)
 
@@ -0,0 +1,95 @@
+import threading
+from typing import Optional
+from flask import current_app
+from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
+from models.ad import Ad
+from services.ad_inventory import AdInventory
+from services.beacon import BeaconSigner
+
+
+class AdSlate:
+    """
+    Готова добірка місця розміщення: активні оголошення та їхні серіалізовані
+    словники. Будується один раз на вікно інвентарю, тож запит лише обирає
+    ID стратегією і бере готові словники — без запитів до БД і to_dict().
+    Словники спільні для всіх запитів і призначені лише для читання.
+    """
+
+    __slots__ = ("ads", "payloads")
+
+    def __init__(self, ads: tuple[Ad, ...], beacon_signer: BeaconSigner):
+        self.ads = ads
+        self.payloads = {
+            ad.id: {**ad.to_dict(), "beacon": beacon_signer.sign("ad", ad.id)}
+            for ad in ads
+        }
+
+    def render(self, selected_ads: list[Ad]) -> list[dict]:
+        return [self.payloads[ad.id] for ad in selected_ads]
+
+
+class AdSlates:
+    """
+    Добірки реклами за ad_type поверх AdInventory.
+
+    Добірка перебудовується, лише коли інвентар віддає новий кортеж активних
+    оголошень (перезавантаження або перехід через межу показу). Також видає
+    підписані токени добірок для відкладеного завантаження реклами
+    (ads=deferred): токен описує місце, кількість, стратегію та глядача,
+    а клієнт отримує рекламу окремим запитом /ads/slate/<token>.
+    """
+
+    TOKEN_SALT = "ad-slate"
+
+    def __init__(
+        self,
+        ad_inventory: AdInventory,
+        secret_key: str,
+        beacon_signer: BeaconSigner,
+        token_ttl: int = 300,
+    ):
+        self.ad_inventory = ad_inventory
+        self.beacon_signer = beacon_signer
+        self.token_ttl = token_ttl
+        self._serializer = URLSafeTimedSerializer(secret_key, salt=self.TOKEN_SALT)
+        self._slates: dict[Optional[str], AdSlate] = {}
+        self._lock = threading.Lock()
+        ad_inventory.subscribe(self._on_schedule_events)
+
+    def get_slate(self, ad_type: Optional[str]) -> AdSlate:
+        ads = self.ad_inventory.get_active_ads(ad_type)
+        slate = self._slates.get(ad_type)
+        if slate is not None and slate.ads is ads:
+            return slate
+
+        slate = AdSlate(ads, self.beacon_signer)
+        with self._lock:
+            self._slates[ad_type] = slate
+        return slate
+
+    def _on_schedule_events(self, events):
+        """Відкидає добірки типів, у яких почався чи завершився показ."""
+        with self._lock:
+            for ad_type in {event.ad.ad_type for event in events} | {None}:
+                self._slates.pop(ad_type, None)
+
+    def issue_token(
+        self, ad_type: Optional[str], limit: int, strategy: str, viewer: Optional[str]
+    ) -> str:
+        return self._serializer.dumps([ad_type, limit, strategy, viewer])
+
+    def read_token(self, token: str) -> tuple[Optional[str], int, str, Optional[str]]:
+        """(ad_type, limit, strategy, viewer) з токена добірки."""
+        try:
+            ad_type, limit, strategy, viewer = self._serializer.loads(
+                token, max_age=self.token_ttl
+            )
+        except SignatureExpired:
+            raise ValueError("Термін дії токена добірки реклами минув")
+        except (BadSignature, ValueError, TypeError):
+            raise ValueError("Недійсний токен добірки реклами")
+        return ad_type, limit, strategy, viewer
+
+
+def get_ad_slates() -> AdSlates:
+    return current_app.container.resolve(AdSlates)
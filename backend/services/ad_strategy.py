@@ -1,56 +1,264 @@
+import math
 import random
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List
-from collections import defaultdict
-
-rotation_state = defaultdict(int)
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from flask import current_app
+from services.rotation_state import IRotationStateBackend, InProcessRotationState
+from services.weighted_sampling import FenwickTree
 
 
 class AdSelectionStrategy(ABC):
     """Абстрактний базовий клас для всіх стратегій вибору реклами."""
 
     @abstractmethod
-    def select_ads(self, ads: List, limit: int) -> List:
-        """Метод, який обирає та повертає рекламні оголошення."""
+    def select_ads(
+        self, ads: List, limit: int, excluded_ids: frozenset = frozenset()
+    ) -> List:
+        """
+        Метод, який обирає та повертає рекламні оголошення.
+        excluded_ids — оголошення, які не можна показувати (частотні обмеження).
+        """
         pass
 
+    @staticmethod
+    def _without(ads: List, excluded_ids: frozenset) -> List:
+        if not excluded_ids:
+            return ads
+        return [ad for ad in ads if ad.id not in excluded_ids]
+
 
 class DefaultAdStrategy(AdSelectionStrategy):
     """Стандартна стратегія: повертає перші `limit` оголошень."""
 
-    def select_ads(self, ads: List, limit: int) -> List:
-        return ads[:limit]
+    def select_ads(
+        self, ads: List, limit: int, excluded_ids: frozenset = frozenset()
+    ) -> List:
+        return list(self._without(ads, excluded_ids)[:limit])
 
 
 class RotationAdStrategy(AdSelectionStrategy):
     """
     Стратегія ротації: показує оголошення по черзі.
-    Зберігає індекс останнього показаного оголошення для кожного типу.
+    Позиція ротації для кожного типу зберігається в IRotationStateBackend,
+    тож при спільному сховищі воркери продовжують одну чергу.
     """
 
-    def select_ads(self, ads: List, limit: int) -> List:
+    def __init__(self, state: Optional[IRotationStateBackend] = None):
+        self.state = state or InProcessRotationState()
+
+    def select_ads(
+        self, ads: List, limit: int, excluded_ids: frozenset = frozenset()
+    ) -> List:
+        ads = self._without(ads, excluded_ids)
         if not ads:
             return []
 
-        ad_type_key = ads[0].ad_type
-
-        start_index = rotation_state[ad_type_key]
-
         num_ads = len(ads)
-        selected = []
-        for i in range(num_ads):
-            index = (start_index + i) % num_ads
-            selected.append(ads[index])
-            if len(selected) == limit:
-                break
-
-        rotation_state[ad_type_key] = (start_index + len(selected)) % num_ads
+        count = min(limit, num_ads)
+        start_index = self.state.advance(ads[0].ad_type, count) % num_ads
 
-        return selected
+        return [ads[(start_index + i) % num_ads] for i in range(count)]
 
 
 class RandomAdStrategy(AdSelectionStrategy):
     """Стратегія випадкового вибору: повертає випадкові оголошення."""
 
-    def select_ads(self, ads: List, limit: int) -> List:
+    def select_ads(
+        self, ads: List, limit: int, excluded_ids: frozenset = frozenset()
+    ) -> List:
+        ads = self._without(ads, excluded_ids)
         return random.sample(ads, min(limit, len(ads)))
+
+
+class WeightedAdStrategy(AdSelectionStrategy):
+    """
+    Зважений вибір з урахуванням бюджету показів (pacing).
+
+    Ефективна вага оголошення = weight * множник pacing. Ваги тримаються в
+    дереві Фенвіка, тож вибір кожного оголошення — O(log n). Індекс
+    будується заново лише коли інвентар віддає новий набір оголошень
+    (множники pacing при цьому переносяться), а лічильники показів
+    перечитуються не частіше ніж раз на pacing_refresh секунд і оновлюють
+    лише ті ваги, що змінилися. Набори оголошень розпізнаються за
+    ідентичністю кортежу з AdInventory.
+
+    epsilon — режим epsilon-greedy за CTR: з імовірністю 1 - epsilon місце
+    отримує оголошення з найкращим згладженим CTR, інакше — зважений вибір.
+    None вимикає режим.
+    """
+
+    # Наскільки (частка бюджету) показ може випереджати графік, перш ніж
+    # вага впаде до нуля
+    PACING_TOLERANCE = 0.1
+    # Згладжування CTR для оголошень з малою кількістю показів
+    CTR_PRIOR_CLICKS = 1
+    CTR_PRIOR_IMPRESSIONS = 100
+    MAX_INDEXES = 16
+
+    def __init__(
+        self,
+        counters_loader: Optional[Callable[[List[int]], Dict]] = None,
+        epsilon: Optional[float] = None,
+        pacing_refresh: float = 5.0,
+        rng: Optional[random.Random] = None,
+    ):
+        self.counters_loader = counters_loader
+        self.epsilon = epsilon
+        self.pacing_refresh = pacing_refresh
+        self.rng = rng or random.Random()
+        self._indexes: List[_WeightedIndex] = []
+        # Множники pacing за ID оголошення, спільні для всіх наборів
+        self._pacing: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def select_ads(
+        self, ads: List, limit: int, excluded_ids: frozenset = frozenset()
+    ) -> List:
+        if not ads:
+            return []
+
+        # Виключені оголошення не фільтруються з кортежу, щоб не втратити
+        # кешований індекс, — їх вага обнуляється лише на час вибору
+        with self._lock:
+            index = self._get_index(ads)
+            positions = index.draw(limit, self.rng, self.epsilon, excluded_ids)
+        return [ads[position] for position in positions]
+
+    def _get_index(self, ads) -> "_WeightedIndex":
+        index = next((index for index in self._indexes if index.ads is ads), None)
+        if index is None:
+            index = _WeightedIndex(ads, self._pacing)
+            self._indexes = [index, *self._indexes[: self.MAX_INDEXES - 1]]
+
+        if time.monotonic() - index.refreshed_at >= self.pacing_refresh:
+            counters = (
+                self.counters_loader([ad.id for ad in ads])
+                if self.counters_loader
+                else {}
+            )
+            index.refresh(counters, datetime.now(), self)
+        return index
+
+    def pacing_multiplier(self, ad, impressions: int, now: datetime) -> float:
+        """
+        1.0 — показ іде за графіком або бюджету немає; 0.0 — бюджет вичерпано
+        або показ випереджає рівномірний графік на PACING_TOLERANCE бюджету.
+        """
+        budget = ad.impression_budget
+        if not budget:
+            return 1.0
+        if impressions >= budget:
+            return 0.0
+        if not ad.start_date or not ad.end_date or ad.end_date <= ad.start_date:
+            return 1.0
+
+        elapsed = (now - ad.start_date) / (ad.end_date - ad.start_date)
+        expected = budget * min(max(elapsed, 0.0), 1.0)
+        if impressions <= expected:
+            return 1.0
+
+        ahead = (impressions - expected) / budget
+        return max(0.0, 1.0 - ahead / self.PACING_TOLERANCE)
+
+    def smoothed_ctr(self, impressions: int, clicks: int) -> float:
+        return (clicks + self.CTR_PRIOR_CLICKS) / (
+            impressions + self.CTR_PRIOR_IMPRESSIONS
+        )
+
+
+def _base_weight(ad) -> float:
+    """Вага оголошення; від'ємна, NaN чи нескінченна (старі дані) — нуль."""
+    weight = ad.weight or 0.0
+    return weight if math.isfinite(weight) and weight > 0 else 0.0
+
+
+class _WeightedIndex:
+    """Ваги одного набору оголошень (кортежу з інвентаря)."""
+
+    def __init__(self, ads, pacing: Dict[int, float]):
+        self.ads = ads
+        self.pacing = pacing
+        self.tree = FenwickTree(
+            [_base_weight(ad) * pacing.get(ad.id, 1.0) for ad in ads]
+        )
+        self.ctr_order = list(range(len(ads)))
+        self.position_by_id = {ad.id: position for position, ad in enumerate(ads)}
+        self.refreshed_at = float("-inf")
+
+    def refresh(self, counters: Dict, now: datetime, strategy: WeightedAdStrategy):
+        ctr = {}
+        for position, ad in enumerate(self.ads):
+            impressions, clicks = counters.get(
+                ad.id, (ad.impressions_count, ad.clicks_count)
+            )
+            pacing = strategy.pacing_multiplier(ad, impressions, now)
+            self.pacing[ad.id] = pacing
+            self.tree.set(position, _base_weight(ad) * pacing)
+            ctr[position] = strategy.smoothed_ctr(impressions, clicks)
+
+        self.ctr_order.sort(key=lambda position: ctr[position], reverse=True)
+        self.refreshed_at = time.monotonic()
+
+    def draw(
+        self,
+        limit: int,
+        rng: random.Random,
+        epsilon: Optional[float],
+        excluded_ids: frozenset = frozenset(),
+    ) -> List[int]:
+        """
+        Вибирає до limit різних позицій. Вибрані та виключені позиції
+        тимчасово отримують нульову вагу.
+        """
+        chosen = []
+        removed = []
+        for ad_id in excluded_ids:
+            position = self.position_by_id.get(ad_id)
+            if position is not None:
+                removed.append((position, self.tree.weights[position]))
+                self.tree.set(position, 0.0)
+
+        for _ in range(min(limit, len(self.ads))):
+            position = None
+            if epsilon is not None and rng.random() >= epsilon:
+                position = next(
+                    (
+                        candidate
+                        for candidate in self.ctr_order
+                        if self.tree.weights[candidate] > 0
+                    ),
+                    None,
+                )
+            if position is None:
+                total = self.tree.total()
+                if total <= 0:
+                    break
+                position = self.tree.find(rng.random() * total)
+                if self.tree.weights[position] <= 0:
+                    break
+
+            chosen.append(position)
+            removed.append((position, self.tree.weights[position]))
+            self.tree.set(position, 0.0)
+
+        for position, weight in removed:
+            self.tree.set(position, weight)
+        return chosen
+
+
+class WeightedCtrAdStrategy(WeightedAdStrategy):
+    """Зважений вибір з pacing та epsilon-greedy за CTR (epsilon = 0.1)."""
+
+    def __init__(self, counters_loader=None, epsilon: float = 0.1, **kwargs):
+        super().__init__(counters_loader, epsilon=epsilon, **kwargs)
+
+
+def get_weighted_strategy() -> WeightedAdStrategy:
+    return current_app.container.resolve(WeightedAdStrategy)
+
+
+def get_weighted_ctr_strategy() -> WeightedCtrAdStrategy:
+    return current_app.container.resolve(WeightedCtrAdStrategy)
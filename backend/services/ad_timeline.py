@@ -0,0 +1,177 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Optional
+from models.ad import Ad
+
+# Кінець показу включний (end_date >= now), тож оголошення зникає
+# з наступної мікросекунди після end_date
+END_BOUNDARY_SHIFT = timedelta(microseconds=1)
+
+ACTIVATED = "activated"
+EXPIRED = "expired"
+
+
+def ad_status(ad: Ad, now: datetime) -> str:
+    """
+    Статус оголошення для адмін-панелі: active, inactive або expired.
+    Кінець показу включний, як і в AdTimeline: при end_date == now
+    оголошення ще показується і має статус active.
+    """
+    if ad.end_date and ad.end_date < now:
+        return "expired"
+    if ad.is_active and (not ad.end_date or ad.end_date >= now):
+        return "active"
+    return "inactive"
+
+
+class AdTimelineEvent:
+    """Оголошення ad стало активним (activated) або перестало (expired) в момент at."""
+
+    __slots__ = ("at", "kind", "ad")
+
+    def __init__(self, at: datetime, kind: str, ad: Ad):
+        self.at = at
+        self.kind = kind
+        self.ad = ad
+
+    def __repr__(self):
+        return f"AdTimelineEvent({self.kind}, ad={self.ad.id}, at={self.at})"
+
+
+class AdTimeline:
+    """
+    Відсортована шкала подій розкладу показу: початок показу (start_date)
+    і завершення (end_date + 1 мкс) кожного увімкненого оголошення.
+
+    Курсор стоїть на кількості подій, що вже настали. Поки момент запиту
+    лишається між двома сусідніми подіями, активні оголошення віддаються
+    без жодних обчислень; при переході курсор зсувається бінарним пошуком
+    (O(log n)), застосовуються лише пропущені події, а кортежі
+    перебудовуються тільки для типів, яких вони стосуються.
+    Зсув назад у часі (запит з явним now) відкочує події так само.
+    """
+
+    def __init__(self, ads: list[Ad]):
+        events = [(ad.start_date, 0, ad) for ad in ads if ad.start_date] + [
+            (ad.end_date + END_BOUNDARY_SHIFT, 1, ad) for ad in ads if ad.end_date
+        ]
+        events.sort(key=lambda event: (event[0], event[1], event[2].id))
+        self._times = [at for at, _, _ in events]
+        self._events = events
+
+        self._ads = {ad.id: ad for ad in ads}
+        self._started = {ad.id: ad.start_date is None for ad in ads}
+        self._expired = {ad.id: False for ad in ads}
+        # Відсортовані ID активних оголошень за типом (None — усі типи)
+        self._active_ids: dict[Optional[str], list[int]] = {None: []}
+        for ad in sorted(ads, key=lambda ad: ad.id):
+            if self._started[ad.id]:
+                self._active_ids.setdefault(ad.ad_type, []).append(ad.id)
+                self._active_ids[None].append(ad.id)
+
+        self._cursor = 0
+        # (нижня межа, верхня межа, кортежі за типом) поточного вікна;
+        # замінюється цілком, тож читачі бачать узгоджений стан без локу
+        self._window = (
+            None,
+            self._times[0] if self._times else None,
+            {ad_type: self._ordered(ids) for ad_type, ids in self._active_ids.items()},
+        )
+        self._lock = threading.Lock()
+
+    def _ordered(self, ad_ids: list[int]) -> tuple[Ad, ...]:
+        # Кортежі впорядковані за ID і незмінні до наступної події, тож
+        # стратегії можуть кешувати за ними свої індекси
+        return tuple(map(self._ads.__getitem__, ad_ids))
+
+    @staticmethod
+    def _contains(window, now: datetime) -> bool:
+        lower, upper, _ = window
+        return (lower is None or lower <= now) and (upper is None or now < upper)
+
+    def active_by_type(
+        self, now: datetime
+    ) -> tuple[dict[Optional[str], tuple[Ad, ...]], list[AdTimelineEvent]]:
+        """
+        Активні в момент now оголошення за типом (None — усі типи) та
+        події, через які довелося пройти від попереднього запиту.
+        """
+        window = self._window
+        if self._contains(window, now):
+            return window[2], []
+
+        with self._lock:
+            if self._contains(self._window, now):
+                return self._window[2], []
+            events = self._move_to(bisect_right(self._times, now))
+            return self._window[2], events
+
+    def _move_to(self, cursor: int) -> list[AdTimelineEvent]:
+        if cursor >= self._cursor:
+            crossed, applied = self._events[self._cursor : cursor], True
+        else:
+            crossed, applied = reversed(self._events[cursor : self._cursor]), False
+
+        was_active = {}
+        for at, kind, ad in crossed:
+            was_active.setdefault(ad.id, (at, ad, self._is_active(ad.id)))
+            flags = self._started if kind == 0 else self._expired
+            flags[ad.id] = applied
+
+        by_type = dict(self._window[2])
+        changed_types = set()
+        timeline_events = []
+        for ad_id, (at, ad, before) in was_active.items():
+            after = self._is_active(ad_id)
+            if after == before:
+                continue
+            for ad_type in (ad.ad_type, None):
+                ad_ids = self._active_ids.setdefault(ad_type, [])
+                if after:
+                    insort(ad_ids, ad_id)
+                else:
+                    del ad_ids[bisect_left(ad_ids, ad_id)]
+                changed_types.add(ad_type)
+            timeline_events.append(
+                AdTimelineEvent(at, ACTIVATED if after else EXPIRED, ad)
+            )
+
+        for ad_type in changed_types:
+            by_type[ad_type] = self._ordered(self._active_ids[ad_type])
+
+        self._cursor = cursor
+        self._window = (
+            self._times[cursor - 1] if cursor else None,
+            self._times[cursor] if cursor < len(self._times) else None,
+            by_type,
+        )
+        return timeline_events
+
+    def _is_active(self, ad_id: int) -> bool:
+        return self._started[ad_id] and not self._expired[ad_id]
+
+
+class AdStatusCounts:
+    """
+    Лічильники статусів оголошень (див. ad_status) для довільного моменту:
+    кінцеві дати відсортовані, тож кількість прострочених — бінарний пошук.
+    Прострочені — end_date < now (bisect_left) і для active, і для expired,
+    тож кожне увімкнене оголошення потрапляє рівно в один з них.
+    """
+
+    def __init__(self, ads: list[Ad]):
+        self.total = len(ads)
+        self.enabled = sum(1 for ad in ads if ad.is_active)
+        self._end_dates = sorted(ad.end_date for ad in ads if ad.end_date)
+        self._enabled_end_dates = sorted(
+            ad.end_date for ad in ads if ad.is_active and ad.end_date
+        )
+
+    def at(self, now: datetime) -> dict:
+        return {
+            "total_ads": self.total,
+            "active_ads": self.enabled - bisect_left(self._enabled_end_dates, now),
+            "inactive_ads": self.total - self.enabled,
+            "expired_ads": bisect_left(self._end_dates, now),
+        }
@@ -1,10 +1,17 @@
 from repositories.admin import AdminRepository
-from typing import Dict, Any, Tuple, List
+from models.admin import Admin
+from services.auth.principal_cache import PrincipalCache, get_principal_cache
+from typing import Dict, Any, Optional, Tuple, List
 
 
 class AdminUserService:
-    def __init__(self, admin_repo: AdminRepository):
+    def __init__(
+        self,
+        admin_repo: AdminRepository,
+        principal_cache: Optional[PrincipalCache] = None,
+    ):
         self.admin_repo = admin_repo
+        self.principal_cache = principal_cache or get_principal_cache()
 
     def get_admins_paginated(
         self, page: int, per_page: int
@@ -18,3 +25,14 @@ class AdminUserService:
 
         result = [admin.to_dict() for admin in admins]
         return result, total
+
+    def update_admin(self, admin: Admin, update_data: Dict[str, Any]) -> Admin:
+        """Оновлює адміністратора і скидає закешовані principal його токенів."""
+        updated_admin = self.admin_repo.update(admin, update_data)
+        self.principal_cache.invalidate("admin", [admin.id])
+        return updated_admin
+
+    def delete_admin(self, admin: Admin):
+        admin_id = admin.id
+        self.admin_repo.delete(admin)
+        self.principal_cache.invalidate("admin", [admin_id])
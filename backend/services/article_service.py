@@ -1,7 +1,8 @@
-from datetime import datetime
-from repositories import get_article_view_repo
+from repositories import get_recommendation_repo
 from repositories.article import ArticleRepository
 from typing import List, Dict, Optional
+from models.serialization import FieldSet
+from services.impression_buffer import get_article_impression_buffer
 
 
 class ArticleService:
@@ -9,10 +10,25 @@ class ArticleService:
         self.article_repo = article_repo
 
     def get_articles(
-        self, page: int = 1, per_page: int = 10, filters: dict = None
+        self,
+        page: int = 1,
+        per_page: int = 10,
+        filters: dict = None,
+        cursor: Optional[str] = None,
+        totals: str = "exact",
+        profile: Optional[str] = "card",
+        fieldset: Optional[FieldSet] = None,
     ) -> List:
         """Отримує список статей з фільтрами"""
-        return self.article_repo.get_all(page=page, per_page=per_page, filters=filters)
+        return self.article_repo.get_all(
+            page=page,
+            per_page=per_page,
+            filters=filters,
+            cursor=cursor,
+            totals=totals,
+            profile=profile,
+            fieldset=fieldset,
+        )
 
     def search_articles(
         self,
@@ -22,12 +38,15 @@ class ArticleService:
         user_permissions: dict = None,
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
+        cursor: Optional[str] = None,
+        totals: str = "exact",
+        fieldset: Optional[FieldSet] = None,
     ):
         """
         Сервісний шар для пошуку статей.
         """
         if not query or len(query) < 3:
-            return [], 0
+            return [], 0, None
 
         return self.article_repo.search(
             query,
@@ -36,19 +55,44 @@ class ArticleService:
             user_permissions=user_permissions,
             date_from=date_from,
             date_to=date_to,
+            cursor=cursor,
+            totals=totals,
+            fieldset=fieldset,
         )
 
-    def get_article_by_id(self, article_id: int, user_id: Optional[int] = None) -> Dict:
-        """Отримує статтю за ID з додатковою інформацією"""
-        article = self.article_repo.get_by_id(article_id)
+    def get_article_by_id(
+        self,
+        article_id: int,
+        user_id: Optional[int] = None,
+        fieldset: Optional[FieldSet] = None,
+        allow_exclusive: bool = True,
+    ) -> Dict:
+        """
+        Отримує статтю за ID з додатковою інформацією.
+        Доступ до ексклюзивної статті перевіряється за моделлю, тож не
+        залежить від запитаних полів; is_saved та is_liked запитуються лише,
+        якщо їх не відсікає fields=.
+        """
+        article = self.article_repo.get_by_id(
+            article_id, profile="detail", fieldset=fieldset
+        )
         if not article:
             raise ValueError("Статтю не знайдено")
+        if article.is_exclusive and not allow_exclusive:
+            raise PermissionError("Недостатньо прав для доступу до цього ресурсу")
 
-        result = article.to_dict()
+        result = article.to_dict(fieldset=fieldset)
 
         if user_id:
-            result["is_saved"] = self.article_repo.is_article_saved(user_id, article_id)
-            result["is_liked"] = self.article_repo.is_article_liked(user_id, article_id)
+            lookups = {
+                "is_saved": self.article_repo.is_article_saved,
+                "is_liked": self.article_repo.is_article_liked,
+            }
+            result.update(
+                (name, lookup(user_id, article_id))
+                for name, lookup in lookups.items()
+                if fieldset is None or fieldset.wants(name, False, True)
+            )
 
         return result
 
@@ -58,6 +102,7 @@ class ArticleService:
         if not article:
             raise ValueError("Статтю не знайдено")
 
+        get_recommendation_repo().mark_stale(user_id)
         self.article_repo.save_article(user_id, article_id)
         return {"message": "Статтю збережено", "is_saved": True}
 
@@ -67,39 +112,55 @@ class ArticleService:
         if not article:
             raise ValueError("Статтю не знайдено")
 
-        self.article_repo.unsave_article(user_id, article_id)
+        if self.article_repo.unsave_article(user_id, article_id):
+            get_recommendation_repo().mark_stale(user_id, commit=True)
         return {"message": "Статтю прибрано зі збережених", "is_saved": False}
 
     def get_saved_articles(
-        self, user_id: int, page: int = 1, per_page: int = 10
-    ) -> List[Dict]:
-        """Отримує збережені статті користувача"""
-        articles = self.article_repo.get_saved_articles(user_id, page, per_page)
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        fieldset: Optional[FieldSet] = None,
+    ):
+        """Отримує збережені статті користувача та курсор наступної сторінки"""
+        articles, next_cursor = self.article_repo.get_saved_articles(
+            user_id, page, per_page, cursor=cursor, fieldset=fieldset
+        )
         result = []
 
         for article in articles:
-            article_dict = article.to_dict(metadata=True)
+            article_dict = article.to_dict(metadata=True, fieldset=fieldset)
             article_dict["is_saved"] = True
             result.append(article_dict)
 
-        return result
+        return result, next_cursor
 
     def get_liked_articles(
-        self, user_id: int, page: int = 1, per_page: int = 10
-    ) -> List[Dict]:
-        """Отримує статті, які лайкнув користувач"""
-        articles = self.article_repo.get_liked_articles(user_id, page, per_page)
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 10,
+        cursor: Optional[str] = None,
+        fieldset: Optional[FieldSet] = None,
+    ):
+        """Отримує статті, які лайкнув користувач, та курсор наступної сторінки"""
+        articles, next_cursor = self.article_repo.get_liked_articles(
+            user_id, page, per_page, cursor=cursor, fieldset=fieldset
+        )
+        saved_ids = self.article_repo.get_saved_article_ids(
+            user_id, [article.id for article in articles]
+        )
         result = []
 
         for article in articles:
-            article_dict = article.to_dict(metadata=True)
+            article_dict = article.to_dict(metadata=True, fieldset=fieldset)
             article_dict["is_liked"] = True
-            article_dict["is_saved"] = self.article_repo.is_article_saved(
-                user_id, article.id
-            )
+            article_dict["is_saved"] = article.id in saved_ids
             result.append(article_dict)
 
-        return result
+        return result, next_cursor
 
     def toggle_save_article(self, user_id: int, article_id: int) -> Dict:
         """Перемикає статус збереження статті"""
@@ -116,6 +177,7 @@ class ArticleService:
         if not article:
             raise ValueError("Статтю не знайдено")
 
+        get_recommendation_repo().mark_stale(user_id)
         is_liked = self.article_repo.toggle_like_article(user_id, article_id)
 
         if is_liked:
@@ -123,27 +185,6 @@ class ArticleService:
         else:
             return {"message": "Лайк знято", "is_liked": False}
 
-    def get_recommended_articles(
-        self,
-        user_id: int,
-        page: int = 1,
-        per_page: int = 10,
-        favorite_category_slugs: list[str] = None,
-        filters: dict = None,
-        current_article_id: Optional[int] = None,
-    ):
-        """
-        Сервісний шар для виклику репозиторію рекомендованих статей.
-        """
-        return self.article_repo.get_recommended(
-            page=page,
-            per_page=per_page,
-            user_id=user_id,
-            favorite_category_slugs=favorite_category_slugs,
-            filters=filters,
-            current_article_id=current_article_id,
-        )
-
     def record_article_impression(
         self,
         article_id: int,
@@ -153,25 +194,37 @@ class ArticleService:
     ) -> bool:
         """
         Реєструє показ картки статті.
-        1. Збільшує лічильник views_count у статті.
-        2. Створює запис ArticleView.
+        Показ потрапляє в буфер і записується пакетно: запис ArticleView
+        та збільшення views_count (див. ArticleImpressionBuffer).
         """
-        article = self.article_repo.get_by(id=article_id)
-        if not article:
+        if not self.record_article_impressions(
+            [article_id], user_id, session_id, ip_address
+        ):
             raise ValueError("Статтю не знайдено")
-
-        self.article_repo.update(
-            article, {"views_count": (article.views_count or 0) + 1}
-        )
-
-        article_view_repo = get_article_view_repo()
-        article_view_repo.create(
-            {
-                "article_id": article_id,
-                "user_id": user_id,
-                "session_id": session_id,
-                "ip_address": ip_address,
-                "viewed_at": datetime.now(),
-            }
-        )
         return True
+
+    def record_article_impressions(
+        self,
+        article_ids: List[int],
+        user_id: Optional[int] = None,
+        session_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ) -> List[int]:
+        """
+        Реєструє покази кількох карток статей з тією ж семантикою, що й
+        record_article_impression. Неіснуючі ID пропускаються.
+        Повертає ID, для яких показ зареєстровано.
+        """
+        existing_ids = self.article_repo.get_existing_ids(article_ids)
+        buffer = get_article_impression_buffer()
+        recorded = []
+        for article_id in article_ids:
+            if article_id in existing_ids:
+                buffer.add(
+                    article_id,
+                    user_id=user_id,
+                    session_id=session_id,
+                    ip_address=ip_address,
+                )
+                recorded.append(article_id)
+        return recorded
@@ -1,7 +1,10 @@
-from werkzeug.security import generate_password_hash, check_password_hash
+from typing import Optional
 from flask_jwt_extended import decode_token
 from repositories.admin import AdminRepository
 from . import AuthStrategy
+from .password_hasher import PasswordHasher, get_password_hasher
+from .principal import AdminPrincipal
+from .principal_cache import PrincipalCache, get_principal_cache
 from .token import TokenFactoryProducer
 
 
@@ -9,8 +12,10 @@ class AdminAuthService(AuthStrategy):
     def __init__(
         self,
         admin_repo: AdminRepository,
+        password_hasher: Optional[PasswordHasher] = None,
     ):
         self.admin_repo = admin_repo
+        self.password_hasher = password_hasher or get_password_hasher()
 
     def register(self, email: str, password: str) -> dict:
         """
@@ -22,7 +27,7 @@ class AdminAuthService(AuthStrategy):
         if existing_user:
             raise ValueError("Адмін з таким email вже існує")
 
-        hashed_password = generate_password_hash(password)
+        hashed_password = self.password_hasher.hash(password)
 
         data = {
             "email": email,
@@ -45,8 +50,16 @@ class AdminAuthService(AuthStrategy):
     def authenticate(self, email: str, password: str) -> dict:
         """Існуючий метод для аутентифікації"""
         admin = self.admin_repo.get_by(email=email)
-        if not admin or not check_password_hash(admin.password, password):
+        if not admin:
+            raise ValueError("Невірний email або пароль")
+        is_valid, new_hash = self.password_hasher.verify_and_rehash(
+            admin.password, password
+        )
+        if not is_valid:
             raise ValueError("Невірний email або пароль")
+        if new_hash:
+            # Параметри хешування змінились — оновлюємо хеш, поки знаємо пароль
+            admin = self.admin_repo.update(admin, {"password": new_hash})
 
         token_producer = TokenFactoryProducer()
         tokens = token_producer.create_tokens_for_admin(admin)
@@ -67,3 +80,24 @@ class AdminAuthService(AuthStrategy):
         if not admin:
             raise ValueError("Користувача не знайдено")
         return admin
+
+    def get_principal(
+        self,
+        admin_id: int,
+        claims: dict,
+        principal_cache: Optional[PrincipalCache] = None,
+    ) -> AdminPrincipal:
+        """
+        Адміністратор запиту. Рядок Admin читається лише при промаху
+        PrincipalCache для пари (ID, jti токена); знімок дійсний, доки
+        адміністратора не змінили чи видалили в будь-якому процесі.
+        """
+        admin_id = int(admin_id)
+        cache = principal_cache or get_principal_cache()
+        jti = claims.get("jti")
+        generation = cache.generation("admin", admin_id)
+        snapshot = cache.get("admin", admin_id, jti, generation)
+        if snapshot is None:
+            snapshot = self.get_current_admin(admin_id).to_dict()
+            cache.put("admin", admin_id, jti, snapshot, generation)
+        return AdminPrincipal(snapshot, lambda: self.get_current_admin(admin_id))
@@ -0,0 +1,89 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHashingBusyError(RuntimeError):
+    """Черга хешування паролів заповнена (відповідь 503)."""
+
+
+class PasswordHasher:
+    """
+    Хешування та перевірка паролів в окремому пулі потоків.
+
+    hashlib (scrypt, PBKDF2) відпускає GIL на час обчислення, тож потоки
+    пулу не блокують інші запити процесу, а кількість одночасних хешувань
+    обмежена max_workers.
+
+    Потік запиту чекає на результат, тож кожне хешування (і те, що
+    рахується, і те, що в черзі) займає потік воркера. max_concurrent
+    обмежує їх разом і має бути меншим за кількість потоків воркера
+    (gunicorn --threads), щоб решта лишалась для читань; надлишкові входи
+    відхиляються одразу PasswordHashingBusyError.
+
+    method — параметри werkzeug (наприклад "scrypt:32768:8:1" або
+    "pbkdf2:sha256:600000"); None — типові параметри werkzeug.
+    Хеші з іншими параметрами needs_rehash() позначає для перехешування.
+    """
+
+    def __init__(
+        self,
+        method: Optional[str] = None,
+        max_workers: int = 2,
+        max_concurrent: int = 4,
+    ):
+        self.method = method or "scrypt"
+        # Повний префікс хеша (з типовими параметрами werkzeug), з яким
+        # порівнюються збережені хеші
+        self.prefix = generate_password_hash("", self.method).split("$", 1)[0]
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(max(max_concurrent, 1))
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusyError(
+                "Сервер перевантажений, спробуйте увійти пізніше"
+            )
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return password_hash.split("$", 1)[0] != self.prefix
+
+    def verify_and_rehash(
+        self, password_hash: str, password: str
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Перевіряє пароль і, якщо хеш має застарілі параметри, рахує новий.
+
+        Returns:
+            (чи пароль правильний, новий хеш або None)
+        """
+        if not self.verify(password_hash, password):
+            return False, None
+        if not self.needs_rehash(password_hash):
+            return True, None
+        try:
+            return True, self.hash(password)
+        except PasswordHashingBusyError:
+            # Перехешування не обов'язкове: зробимо при наступному вході
+            return True, None
+
+
+def get_password_hasher() -> PasswordHasher:
+    return current_app.container.resolve(PasswordHasher)
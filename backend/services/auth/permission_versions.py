@@ -0,0 +1,52 @@
+from typing import Optional
+from flask import current_app
+from cache import ICacheBackend
+from database import IDatabaseConnection
+from repositories.user import UserRepository
+
+
+class PermissionVersions:
+    """
+    Актуальні версії прав користувачів (User.permissions_version) для
+    перевірки claim pv access-токена без завантаження користувача.
+
+    Версія кешується в кеш-бекенді на ttl секунд; invalidate() після зміни
+    прав видаляє запис, і наступний запит перечитує версію з БД. З бекендом
+    memory інші процеси побачать зміну не пізніше ніж через ttl секунд.
+    """
+
+    KEY_PREFIX = "perm-version:"
+
+    def __init__(
+        self,
+        db_connection: IDatabaseConnection,
+        backend: ICacheBackend,
+        ttl: int = 60,
+    ):
+        self.db_connection = db_connection
+        self.backend = backend
+        self.ttl = ttl
+
+    def current(self, user_id: int) -> Optional[int]:
+        """Поточна версія прав або None, якщо користувача не існує."""
+        key = f"{self.KEY_PREFIX}{user_id}"
+        version = self.backend.get(key)
+        if version is not None:
+            return version
+
+        db_session = self.db_connection.get_session()
+        try:
+            version = UserRepository(db_session).get_permissions_version(user_id)
+        finally:
+            db_session.close()
+        if version is not None:
+            self.backend.set(key, version, self.ttl)
+        return version
+
+    def invalidate(self, user_ids):
+        for user_id in user_ids:
+            self.backend.delete(f"{self.KEY_PREFIX}{user_id}")
+
+
+def get_permission_versions() -> PermissionVersions:
+    return current_app.container.resolve(PermissionVersions)
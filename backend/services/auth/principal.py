@@ -0,0 +1,79 @@
+from typing import Callable
+from models.admin import Admin
+from models.user import User
+
+
+class UserPrincipal:
+    """
+    Користувач запиту, відновлений з claims access-токена: id та права
+    доступні без звернення до БД. Решта атрибутів (preferences,
+    followed_authors, to_dict() тощо) завантажує User при першому зверненні.
+    """
+
+    is_admin = False
+
+    def __init__(self, user_id: int, permissions: dict, loader: Callable[[], User]):
+        self.id = user_id
+        self.permissions = permissions
+        self._loader = loader
+        self._user = None
+
+    @property
+    def user(self) -> User:
+        """Повний ORM-об'єкт користувача (завантажується один раз)."""
+        if self._user is None:
+            self._user = self._loader()
+        return self._user
+
+    def __getattr__(self, name):
+        # Викликається лише для атрибутів, яких немає в самому principal
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __repr__(self):
+        return f"<UserPrincipal id={self.id}>"
+
+
+class AdminPrincipal:
+    """
+    Адміністратор запиту, відновлений зі знімка в PrincipalCache: id, email
+    і to_dict() доступні без звернення до БД. Інші атрибути завантажують
+    Admin при першому зверненні.
+    """
+
+    is_admin = True
+
+    def __init__(self, snapshot: dict, loader: Callable[[], Admin]):
+        self.id = snapshot["id"]
+        self.email = snapshot["email"]
+        self.permissions = {}
+        self.preferences = {}
+        self._snapshot = snapshot
+        self._loader = loader
+        self._admin = None
+
+    @property
+    def admin(self) -> Admin:
+        """Повний ORM-об'єкт адміністратора (завантажується один раз)."""
+        if self._admin is None:
+            self._admin = self._loader()
+        return self._admin
+
+    def to_dict(self) -> dict:
+        return dict(self._snapshot)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.admin, name)
+
+    def __repr__(self):
+        return f"<AdminPrincipal id={self.id}>"
+
+
+def load_user(current_user):
+    """ORM-об'єкт User за current_user — для запису через репозиторії."""
+    if isinstance(current_user, UserPrincipal):
+        return current_user.user
+    return current_user
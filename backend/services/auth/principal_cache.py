@@ -0,0 +1,150 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Hashable, Iterable, Optional
+from flask import current_app
+from cache import ICacheBackend
+
+
+class PrincipalCache:
+    """
+    Кеш розв'язаних principal (адмін або користувач з обчисленими правами)
+    у пам'яті процесу: LRU на max_entries записів з TTL.
+
+    Ключ — (вид, ID, jti токена), тож новий токен після входу не
+    перетинається зі старим. Записи — незмінні знімки без ORM-об'єктів:
+    principal для запиту будується з них заново.
+
+    invalidate() видаляє записи ідентичності в цьому процесі і змінює її
+    токен покоління в backend. Записи, збережені з generation(), дійсні
+    лише поки токен не змінився, тож зі спільним бекендом (Redis) зміну
+    одразу бачать усі процеси; з memory — лише цей, інші не пізніше ніж
+    через ttl секунд.
+    """
+
+    GENERATION_PREFIX = "principal-gen:"
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float = 60,
+        backend: Optional[ICacheBackend] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.backend = backend
+        self._entries: OrderedDict[tuple, tuple[float, object, object]] = (
+            OrderedDict()
+        )
+        # (вид, ID) -> ключі записів, для invalidate без перебору всього кешу
+        self._keys_by_identity: dict[tuple[str, int], set[tuple]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self, kind: str, identity: int) -> Optional[str]:
+        """
+        Поточний токен покоління ідентичності у спільному бекенді. Читається
+        до завантаження знімка з БД, щоб інвалідація під час завантаження
+        не лишила в кеші застарілий знімок.
+        """
+        if self.backend is None:
+            return None
+        key = f"{self.GENERATION_PREFIX}{kind}:{identity}"
+        token = self.backend.get(key)
+        if token is None:
+            # Токена немає (ще не було інвалідацій або його витіснено) — новий
+            # токен, щоб записи зі старим не ожили
+            token = uuid.uuid4().hex
+            self.backend.set(key, token)
+        return token
+
+    def get(
+        self,
+        kind: str,
+        identity: int,
+        jti: Optional[Hashable],
+        generation: Optional[str] = None,
+    ):
+        """Знімок principal або None (промах)."""
+        key = (kind, identity, jti)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry[0] < time.monotonic() or entry[1] != generation
+            ):
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(
+        self,
+        kind: str,
+        identity: int,
+        jti: Optional[Hashable],
+        value,
+        generation: Optional[str] = None,
+    ):
+        key = (kind, identity, jti)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, generation, value)
+            self._entries.move_to_end(key)
+            self._keys_by_identity.setdefault((kind, identity), set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, kind: str, identity: int, jti: Optional[Hashable]):
+        with self._lock:
+            self._remove((kind, identity, jti))
+
+    def invalidate(self, kind: str, identities: Iterable[int]):
+        """Видаляє знімки всіх токенів цих ідентичностей в усіх процесах."""
+        identities = list(identities)
+        if self.backend is not None:
+            for identity in identities:
+                self.backend.set(
+                    f"{self.GENERATION_PREFIX}{kind}:{identity}", uuid.uuid4().hex
+                )
+        with self._lock:
+            for identity in identities:
+                keys = self._keys_by_identity.pop((kind, identity), ())
+                for key in keys:
+                    self._entries.pop(key, None)
+                self.invalidations += len(keys)
+
+    def _remove(self, key: tuple):
+        if self._entries.pop(key, None) is None:
+            return
+        kind, identity, _ = key
+        keys = self._keys_by_identity.get((kind, identity))
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_identity[(kind, identity)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def get_principal_cache() -> PrincipalCache:
+    return current_app.container.resolve(PrincipalCache)
@@ -22,6 +22,10 @@ class UserTokenFactory(TokenFactory):
         additional_claims: Dict[str, Any] = kwargs.get("additional_claims", {})
 
         additional_claims.update({"type": "user"})
+        # Права та їхня версія: middleware відновлює з них UserPrincipal,
+        # не завантажуючи користувача, підписки й плани
+        additional_claims.setdefault("perms", dict(user.permissions or {}))
+        additional_claims.setdefault("pv", user.permissions_version)
 
         access_token = create_access_token(
             identity=str(user.id),
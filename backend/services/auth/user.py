@@ -1,7 +1,11 @@
-from werkzeug.security import generate_password_hash, check_password_hash
+from typing import Optional
 from flask_jwt_extended import decode_token
 from repositories.user import UserRepository
 from . import AuthStrategy
+from .password_hasher import PasswordHasher, get_password_hasher
+from .permission_versions import PermissionVersions, get_permission_versions
+from .principal import UserPrincipal
+from .principal_cache import PrincipalCache, get_principal_cache
 from .token import TokenFactoryProducer
 
 
@@ -9,8 +13,10 @@ class UserAuthService(AuthStrategy):
     def __init__(
         self,
         user_repo: UserRepository,
+        password_hasher: Optional[PasswordHasher] = None,
     ):
         self.user_repo = user_repo
+        self.password_hasher = password_hasher or get_password_hasher()
 
     def register(self, email: str, password: str, username: str) -> dict:
         """
@@ -24,7 +30,7 @@ class UserAuthService(AuthStrategy):
         if existing_user:
             raise ValueError("Користувач з таким email або ім'ям вже існує")
 
-        hashed_password = generate_password_hash(password)
+        hashed_password = self.password_hasher.hash(password)
 
         user_data = {
             "email": email,
@@ -46,8 +52,16 @@ class UserAuthService(AuthStrategy):
     def authenticate(self, email: str, password: str) -> dict:
         """Існуючий метод для аутентифікації"""
         user = self.user_repo.get_by(email=email)
-        if not user or not check_password_hash(user.password, password):
+        if not user:
+            raise ValueError("Невірний email або пароль")
+        is_valid, new_hash = self.password_hasher.verify_and_rehash(
+            user.password, password
+        )
+        if not is_valid:
             raise ValueError("Невірний email або пароль")
+        if new_hash:
+            # Параметри хешування змінились — оновлюємо хеш, поки знаємо пароль
+            user = self.user_repo.update(user, {"password": new_hash})
 
         token_producer = TokenFactoryProducer()
         tokens = token_producer.create_tokens_for_user(user)
@@ -68,3 +82,48 @@ class UserAuthService(AuthStrategy):
         if not user:
             raise ValueError("Користувача не знайдено")
         return user
+
+    def get_principal(
+        self,
+        user_id: int,
+        claims: dict,
+        permission_versions: Optional[PermissionVersions] = None,
+        principal_cache: Optional[PrincipalCache] = None,
+    ):
+        """
+        Користувач запиту за claims access-токена. Якщо версія прав у токені
+        (pv) збігається з поточною, повертає UserPrincipal з правами з токена
+        без звернення до БД. Інакше токен застарів: права обчислюються з
+        підписок один раз і кешуються в PrincipalCache для цього jti, доки
+        не зміниться версія прав.
+
+        Returns:
+            (користувач, чи застарів токен)
+        """
+        user_id = int(user_id)
+        versions = permission_versions or get_permission_versions()
+        current_version = versions.current(user_id)
+
+        def loader():
+            return self.get_current_user(user_id)
+
+        if "perms" in claims and claims.get("pv", -1) == current_version:
+            return UserPrincipal(user_id, claims["perms"], loader), False
+
+        cache = principal_cache or get_principal_cache()
+        jti = claims.get("jti")
+        cached = cache.get("user", user_id, jti)
+        if cached is not None:
+            permissions, version = cached
+            if version == current_version:
+                return UserPrincipal(user_id, permissions, loader), True
+            cache.discard("user", user_id, jti)
+
+        user = self.get_current_user(user_id)
+        cache.put(
+            "user",
+            user_id,
+            jti,
+            (dict(user.permissions or {}), user.permissions_version),
+        )
+        return user, True
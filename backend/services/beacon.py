@@ -0,0 +1,114 @@
+import hashlib
+import hmac
+from typing import Optional
+from flask import current_app
+from services.ad_event_buffer import AdEventBuffer, get_ad_event_buffer
+from services.frequency_cap import AdFrequencyCapper, get_frequency_capper, viewer_key
+from services.impression_buffer import (
+    ArticleImpressionBuffer,
+    get_article_impression_buffer,
+)
+
+
+class BeaconSigner:
+    """
+    Підписи для маяків відстеження (/beacon).
+
+    Маяк оголошення чи статті — рядок "<id>.<підпис>", де підпис — усічений
+    HMAC-SHA256 від виду та ID. Він детермінований, тож його можна віддавати
+    в кешованих відповідях і готових добірках реклами, а перевірка не
+    потребує звернення до БД: маяк доводить, що ID видав сервер.
+    """
+
+    SIGNATURE_LENGTH = 16
+
+    def __init__(self, secret_key: str):
+        self._key = hashlib.sha256(f"beacon:{secret_key}".encode()).digest()
+
+    def _signature(self, kind: str, item_id: int) -> str:
+        message = f"{kind}:{item_id}".encode()
+        return hmac.new(self._key, message, hashlib.sha256).hexdigest()[
+            : self.SIGNATURE_LENGTH
+        ]
+
+    def sign(self, kind: str, item_id: int) -> str:
+        return f"{item_id}.{self._signature(kind, item_id)}"
+
+    def verify(self, kind: str, beacon: str) -> Optional[int]:
+        """ID з маяка або None, якщо маяк пошкоджений чи підпис не збігається."""
+        item_id, _, signature = str(beacon).partition(".")
+        if not (item_id.isascii() and item_id.isdigit()):
+            return None
+        expected = self._signature(kind, int(item_id))
+        if not hmac.compare_digest(signature.encode(), expected.encode()):
+            return None
+        return int(item_id)
+
+
+class BeaconService:
+    """
+    Приймання маяків: перевіряє підписи і кладе події прямо в буфери
+    відкладеного запису, без сесії БД і завантаження користувача.
+    Видалені тим часом оголошення та статті відсіюються під час скидання
+    буферів.
+    """
+
+    def __init__(
+        self,
+        signer: Optional[BeaconSigner] = None,
+        ad_event_buffer: Optional[AdEventBuffer] = None,
+        article_buffer: Optional[ArticleImpressionBuffer] = None,
+        frequency_capper: Optional[AdFrequencyCapper] = None,
+    ):
+        self.signer = signer or get_beacon_signer()
+        self.ad_event_buffer = ad_event_buffer or get_ad_event_buffer()
+        self.article_buffer = article_buffer or get_article_impression_buffer()
+        self.frequency_capper = frequency_capper or get_frequency_capper()
+
+    def _verify_all(self, kind: str, beacons: list[str]) -> list[int]:
+        """ID з маяків без повторів: підпис детермінований, тож копії однакові."""
+        item_ids = [self.signer.verify(kind, beacon) for beacon in beacons]
+        if None in item_ids:
+            raise PermissionError("Недійсний підпис маяка")
+        return list(dict.fromkeys(item_ids))
+
+    def record(
+        self,
+        ad_views: list[str],
+        ad_clicks: list[str],
+        article_views: list[str],
+        user_id: Optional[int] = None,
+        session_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ) -> int:
+        """
+        Реєструє покази реклами, кліки та покази статей з маяків.
+        Якщо хоч один підпис недійсний, не реєструє нічого. Повтори маяка
+        в одному запиті враховуються один раз, а покази та кліки реклами
+        ще й проходять вікно повторів частотного обмежувача.
+        Повертає кількість прийнятих подій.
+        """
+        ad_view_ids = self._verify_all("ad", ad_views)
+        ad_click_ids = self._verify_all("ad", ad_clicks)
+        article_ids = self._verify_all("article", article_views)
+
+        viewer = viewer_key(user_id, session_id)
+        counted = self.frequency_capper.admit(viewer, ad_view_ids)
+        if counted:
+            self.ad_event_buffer.add_impressions(
+                counted, user_id=user_id, session_id=session_id, ip_address=ip_address
+            )
+        for ad_id in self.frequency_capper.admit_clicks(viewer, ad_click_ids):
+            self.ad_event_buffer.add_click(ad_id)
+        for article_id in article_ids:
+            self.article_buffer.add(
+                article_id,
+                user_id=user_id,
+                session_id=session_id,
+                ip_address=ip_address,
+            )
+        return len(ad_view_ids) + len(ad_click_ids) + len(article_ids)
+
+
+def get_beacon_signer() -> BeaconSigner:
+    return current_app.container.resolve(BeaconSigner)
@@ -0,0 +1,228 @@
+import hashlib
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from typing import Optional
+from flask import current_app
+
+
+def viewer_key(
+    user_id: Optional[int] = None, session_id: Optional[str] = None
+) -> Optional[str]:
+    """
+    Ідентифікатор глядача для частотних обмежень: користувач або сесія.
+    IP не використовується — за NAT чи проксі одна адреса спільна для
+    багатьох читачів; без ідентифікатора обмеження не застосовуються.
+    """
+    if user_id:
+        return f"u:{user_id}"
+    if session_id:
+        return f"s:{session_id}"
+    return None
+
+
+class DecayingCountingBloomFilter:
+    """
+    Лічильний фільтр Блума з часовим згасанням.
+
+    Вікно поділене на generations поколінь; кожне покоління — масив
+    16-бітних лічильників фіксованого розміру, тож пам'ять не залежить від
+    кількості ключів. Після проходження однієї частки вікна найстаріше
+    покоління відкидається. Оцінка лічильника може лише перевищувати
+    справжнє значення (хибні спрацювання), але не занижувати його.
+    """
+
+    MAX_COUNTER = 0xFFFF
+
+    @classmethod
+    def for_capacity(
+        cls,
+        window: float,
+        capacity: int,
+        error_rate: float = 0.01,
+        generations: int = 4,
+    ) -> "DecayingCountingBloomFilter":
+        """
+        Фільтр для capacity різних ключів у вікні з імовірністю хибного
+        спрацювання близько error_rate (класичні формули для m та k).
+        """
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        hashes = max(1, round(size / capacity * math.log(2)))
+        return cls(window, size=size, hashes=hashes, generations=generations)
+
+    def __init__(
+        self,
+        window: float,
+        size: int = 1 << 18,
+        hashes: int = 4,
+        generations: int = 4,
+    ):
+        self.size = size
+        self.hashes = hashes
+        self.generation_span = window / generations
+        self._generations = deque(
+            (array("H", bytes(2 * size)) for _ in range(generations)),
+            maxlen=generations,
+        )
+        self._generation_started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def _rotate(self):
+        elapsed = time.monotonic() - self._generation_started
+        expired = int(elapsed // self.generation_span)
+        if not expired:
+            return
+        for _ in range(min(expired, self._generations.maxlen)):
+            self._generations.append(array("H", bytes(2 * self.size)))
+        self._generation_started += expired * self.generation_span
+
+    def _count(self, positions: list[int]) -> int:
+        return min(
+            sum(generation[position] for generation in self._generations)
+            for position in positions
+        )
+
+    def add(self, key: str) -> int:
+        """Враховує подію для ключа, повертає оцінку кількості подій у вікні."""
+        positions = self._positions(key)
+        with self._lock:
+            self._rotate()
+            current = self._generations[-1]
+            for position in positions:
+                if current[position] < self.MAX_COUNTER:
+                    current[position] += 1
+            return self._count(positions)
+
+    def count(self, key: str) -> int:
+        positions = self._positions(key)
+        with self._lock:
+            self._rotate()
+            return self._count(positions)
+
+
+class AdFrequencyCapper:
+    """
+    Частотні обмеження показів реклами для пари (глядач, оголошення).
+
+    exposures рахує покази у вікні window; після max_impressions оголошення
+    потрапляє до переліку обмежених для глядача (LRU-словник з TTL на
+    max_viewers глядачів), тож вибір реклами виключає його за O(1).
+    recent відсікає повторні покази та кліки тієї ж пари протягом
+    dedupe_seconds.
+    Стан — у пам'яті процесу, тож під кількома воркерами gunicorn ліміт
+    діє в кожному окремо (до workers * max_impressions показів за вікно).
+
+    Фільтри розраховані на capacity різних пар (глядач, оголошення) за
+    вікно з часткою хибних обмежень близько error_rate; пам'ять —
+    близько 2 * 4 * 9.6 * capacity байт при 1%.
+    """
+
+    def __init__(
+        self,
+        max_impressions: int = 3,
+        window: float = 3600,
+        dedupe_seconds: float = 30,
+        max_viewers: int = 100_000,
+        capacity: int = 250_000,
+        error_rate: float = 0.01,
+    ):
+        self.max_impressions = max_impressions
+        self.window = window
+        self.max_viewers = max_viewers
+        self.exposures = DecayingCountingBloomFilter.for_capacity(
+            window, capacity, error_rate
+        )
+        self.recent = (
+            DecayingCountingBloomFilter.for_capacity(
+                dedupe_seconds,
+                max(math.ceil(capacity * dedupe_seconds / window), 1000),
+                error_rate,
+                generations=2,
+            )
+            if dedupe_seconds
+            else None
+        )
+        self._capped: OrderedDict[str, dict[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def capped_ad_ids(self, viewer: Optional[str]) -> frozenset:
+        """ID оголошень, ліміт показів яких глядач уже вичерпав."""
+        if viewer is None:
+            return frozenset()
+
+        now = time.monotonic()
+        with self._lock:
+            capped = self._capped.get(viewer)
+            if not capped:
+                return frozenset()
+            for ad_id in [ad_id for ad_id, until in capped.items() if until <= now]:
+                del capped[ad_id]
+            if not capped:
+                del self._capped[viewer]
+                return frozenset()
+            return frozenset(capped)
+
+    def register(self, viewer: Optional[str], ad_id: int) -> bool:
+        """
+        Реєструє показ. Повертає False, якщо це дублікат у межах
+        dedupe_seconds або ліміт показів уже вичерпано — такий показ
+        не зараховується.
+        """
+        if viewer is None:
+            return True
+
+        key = f"{viewer}|{ad_id}"
+        if self.recent is not None:
+            if self.recent.count(key):
+                return False
+            self.recent.add(key)
+
+        if self.exposures.count(key) >= self.max_impressions:
+            self._mark_capped(viewer, ad_id)
+            return False
+
+        if self.exposures.add(key) >= self.max_impressions:
+            self._mark_capped(viewer, ad_id)
+        return True
+
+    def admit(self, viewer: Optional[str], ad_ids: list[int]) -> list[int]:
+        """ID оголошень, покази яких слід зарахувати (див. register)."""
+        return [ad_id for ad_id in ad_ids if self.register(viewer, ad_id)]
+
+    def admit_clicks(self, viewer: Optional[str], ad_ids: list[int]) -> list[int]:
+        """
+        ID оголошень, кліки яких слід зарахувати: повторний клік тієї ж
+        пари протягом dedupe_seconds відкидається. Ліміт показів на кліки
+        не діє.
+        """
+        if viewer is None or self.recent is None:
+            return list(ad_ids)
+
+        admitted = []
+        for ad_id in ad_ids:
+            key = f"{viewer}|{ad_id}|click"
+            if self.recent.count(key):
+                continue
+            self.recent.add(key)
+            admitted.append(ad_id)
+        return admitted
+
+    def _mark_capped(self, viewer: str, ad_id: int):
+        with self._lock:
+            capped = self._capped.setdefault(viewer, {})
+            capped[ad_id] = time.monotonic() + self.window
+            self._capped.move_to_end(viewer)
+            while len(self._capped) > self.max_viewers:
+                self._capped.popitem(last=False)
+
+
+def get_frequency_capper() -> AdFrequencyCapper:
+    return current_app.container.resolve(AdFrequencyCapper)
@@ -0,0 +1,207 @@
+import atexit
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+from flask import current_app
+from sqlalchemy import bindparam, insert, select, update
+from database import IDatabaseConnection
+from models.article import Article, ArticleView
+
+
+class WriteBehindBuffer(ABC):
+    """
+    Основа буферів з відкладеним записом (write-behind).
+
+    Події накопичуються в пам'яті процесу, а flush() записує їх однією
+    транзакцією. Скидання відбувається при досягненні max_size, кожні
+    flush_interval секунд у фоновому потоці та при завершенні процесу.
+
+    Якщо запис не вдався, пакет повертається в буфер, а наступна спроба
+    відкладається з експоненційною затримкою (до MAX_RETRY_DELAY): поки
+    БД недоступна, запити не пробують скидати буфер самі, це робить лише
+    фоновий потік. Буфер тримає не більше max_pending подій; надлишок
+    (найстаріші події) відкидається і рахується в dropped.
+    """
+
+    worker_name = "write-behind-flusher"
+    MAX_RETRY_DELAY = 60.0
+
+    def __init__(
+        self,
+        db_connection: IDatabaseConnection,
+        max_size: int = 500,
+        flush_interval: float = 5.0,
+        max_pending: Optional[int] = None,
+    ):
+        self.db_connection = db_connection
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending or max_size * 100
+        self.dropped = 0
+        self._failures = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def flush(self) -> int:
+        pass
+
+    def _should_flush(self, size: int) -> bool:
+        """Чи скидати буфер з потоку запиту: заповнений і не в паузі після збою."""
+        return size >= self.max_size and time.monotonic() >= self._retry_at
+
+    def _room(self, size: int, count: int) -> int:
+        """Скільки з count нових подій вміщується; решта рахується в dropped."""
+        accepted = max(min(count, self.max_pending - size), 0)
+        self.dropped += count - accepted
+        return accepted
+
+    def _requeue(self, batch: list, pending: list, limit: int) -> list:
+        """
+        Повертає невдалий пакет перед новішими подіями, обрізаючи найстаріші
+        понад limit. Викликається під self._lock.
+        """
+        combined = batch + pending
+        overflow = len(combined) - max(limit, 0)
+        if overflow > 0:
+            self.dropped += overflow
+            del combined[:overflow]
+        return combined
+
+    def _flush_succeeded(self):
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def _flush_failed(self):
+        self._failures += 1
+        delay = min(
+            self.flush_interval * 2 ** (self._failures - 1), self.MAX_RETRY_DELAY
+        )
+        self._retry_at = time.monotonic() + delay
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(
+                target=self._run, name=self.worker_name, daemon=True
+            )
+            self._worker.start()
+            atexit.register(self.shutdown)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            if time.monotonic() >= self._retry_at:
+                self.flush()
+
+    def shutdown(self):
+        """Зупиняє фоновий потік і записує залишок буфера."""
+        self._stop.set()
+        self.flush()
+
+
+class ArticleImpressionBuffer(WriteBehindBuffer):
+    """
+    Буфер показів статей: масовий INSERT в article_views та один
+    UPDATE views_count = views_count + n на статтю за скидання.
+    """
+
+    worker_name = "article-impression-flusher"
+
+    def __init__(
+        self,
+        db_connection: IDatabaseConnection,
+        max_size: int = 500,
+        flush_interval: float = 5.0,
+        max_pending: Optional[int] = None,
+    ):
+        super().__init__(db_connection, max_size, flush_interval, max_pending)
+        self._pending: list[dict] = []
+
+    def add(
+        self,
+        article_id: int,
+        user_id: Optional[int] = None,
+        session_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+    ):
+        """Додає показ у буфер. Скидає буфер, якщо він заповнений."""
+        self._ensure_worker()
+        with self._lock:
+            if self._room(len(self._pending), 1):
+                self._pending.append(
+                    {
+                        "article_id": article_id,
+                        "user_id": user_id,
+                        "session_id": session_id,
+                        "ip_address": ip_address,
+                        "viewed_at": datetime.now(),
+                    }
+                )
+            is_full = self._should_flush(len(self._pending))
+
+        if is_full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Записує накопичені покази в БД. Повертає кількість записаних показів."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            db_session = self.db_connection.get_session()
+            try:
+                article_ids = {row["article_id"] for row in batch}
+                existing_ids = set(
+                    db_session.scalars(
+                        select(Article.id).where(Article.id.in_(article_ids))
+                    )
+                )
+                batch = [row for row in batch if row["article_id"] in existing_ids]
+                if not batch:
+                    self._flush_succeeded()
+                    return 0
+
+                db_session.execute(insert(ArticleView), batch)
+
+                counts = Counter(row["article_id"] for row in batch)
+                db_session.execute(
+                    update(Article.__table__)
+                    .where(Article.__table__.c.id == bindparam("b_article_id"))
+                    .values(views_count=Article.__table__.c.views_count + bindparam("b_n")),
+                    [
+                        {"b_article_id": article_id, "b_n": n}
+                        for article_id, n in counts.items()
+                    ],
+                )
+                db_session.commit()
+                self._flush_succeeded()
+                return len(batch)
+            except Exception as e:
+                db_session.rollback()
+                with self._lock:
+                    self._pending = self._requeue(
+                        batch, self._pending, self.max_pending
+                    )
+                self._flush_failed()
+                print(
+                    f"ПОМИЛКА під час запису показів статей: {e} "
+                    f"(відкинуто показів: {self.dropped})"
+                )
+                return 0
+            finally:
+                db_session.close()
+
+
+def get_article_impression_buffer() -> ArticleImpressionBuffer:
+    return current_app.container.resolve(ArticleImpressionBuffer)
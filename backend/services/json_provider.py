@@ -0,0 +1,144 @@
+import dataclasses
+import math
+import re
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# Експонента числа у виводі orjson (1e16, 1.5e-9); json.dumps пише її інакше
+# (1e+16, 1.5e-09). Збіг у тексті рядка лише зайвий раз вмикає json
+EXPONENT = re.compile(rb"e[-0-9]")
+# orjson пише 1e-05 як 0.00001, json.dumps — в експоненційній формі
+SMALL_FLOAT = b"0.0000"
+
+# Значення, в яких не буває float; решту обходить _has_non_finite
+SCALAR_TYPES = frozenset((str, int, bool, type(None)))
+
+# Провідні байти UTF-8 символів, які backslashreplace записує не як \uXXXX:
+# Latin-1 (\xNN) та символи поза BMP (\UNNNNNNNN); ширина послідовності
+NON_UNICODE_ESCAPE_LEADS = (
+    (b"\xc2", 2),
+    (b"\xc3", 2),
+    (b"\xf0", 4),
+    (b"\xf1", 4),
+    (b"\xf2", 4),
+    (b"\xf3", 4),
+    (b"\xf4", 4),
+)
+
+
+def _has_divergent_float(data: bytes) -> bool:
+    if SMALL_FLOAT in data:
+        return True
+    return any(
+        data[match.start() - 1 : match.start()].isdigit()
+        for match in EXPONENT.finditer(data)
+    )
+
+
+def _has_non_finite(obj, nulls: int) -> bool:
+    """
+    Чи є в даних NaN або ±Infinity: orjson пише їх як null, а json.dumps —
+    як NaN/Infinity. nulls — кількість null у виводі orjson; обхід іде
+    рівнями і зупиняється, щойно всі вони пояснені значеннями None
+    (зазвичай це next_cursor чи total на верхньому рівні). Датакласи
+    обходяться як словники, на які їх перетворить default.
+    """
+    level = [[obj]]
+    while level:
+        children = []
+        for value in level:
+            if isinstance(value, dict):
+                values = value.values()
+            elif isinstance(value, (list, tuple)):
+                values = value
+            elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+                values = dataclasses.asdict(value).values()
+            else:
+                continue
+            for item in values:
+                kind = type(item)
+                if kind in SCALAR_TYPES:
+                    if item is None:
+                        nulls -= 1
+                elif kind is float:
+                    if not math.isfinite(item):
+                        return True
+                else:
+                    children.append(item)
+        if nulls <= 0:
+            return False
+        level = children
+    return False
+
+
+def _unicode_escape(char: str) -> bytes:
+    """\\uXXXX як у json.dumps (сурогатна пара для символів поза BMP)."""
+    return ("\\u" + char.encode("utf-16-be").hex(" ", 2).replace(" ", "\\u")).encode()
+
+
+def _escape_sequences(data: bytes, lead: bytes, width: int) -> bytes:
+    head, *rest = data.split(lead)
+    parts = [head]
+    for piece in rest:
+        parts.append(_unicode_escape((lead + piece[: width - 1]).decode()))
+        parts.append(piece[width - 1 :])
+    return b"".join(parts)
+
+
+def ascii_escape(data: bytes) -> bytes:
+    """
+    UTF-8 JSON -> ASCII JSON з тими самими \\u-послідовностями, що й
+    json.dumps(ensure_ascii=True). Основну роботу робить C-кодек
+    ascii/backslashreplace; Latin-1 і символи поза BMP, які він записав би
+    як \\xNN та \\UNNNNNNNN, екрануються заздалегідь.
+    """
+    for lead, width in NON_UNICODE_ESCAPE_LEADS:
+        if lead in data:
+            data = _escape_sequences(data, lead, width)
+    if not data.isascii():
+        data = data.decode().encode("ascii", "backslashreplace")
+    if b"\x7f" in data:
+        data = data.replace(b"\x7f", b"\\u007f")
+    return data
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON-провайдер Flask на orjson з виводом, байт-у-байт однаковим із
+    DefaultJSONProvider: ті самі sort_keys, ensure_ascii, компактні
+    роздільники або відступ 2 в debug, та сама функція default
+    (дати у форматі HTTP, Decimal як рядок).
+
+    Те, чого orjson не вміє або записує інакше (нерядкові ключі, цілі поза
+    64 бітами, сурогати, експоненційні числа, NaN та Infinity), кодується
+    стандартним json. Дані на NaN/Infinity перевіряються, лише коли у
+    виводі orjson є null: без null їх там не було.
+    """
+
+    OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def _encode(self, obj, indent: bool) -> bytes | None:
+        """Тіло відповіді або None, якщо потрібен стандартний кодувальник."""
+        option = self.OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            data = orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return None
+        if _has_divergent_float(data):
+            return None
+        nulls = data.count(b"null")
+        if nulls and _has_non_finite(obj, nulls):
+            return None
+        return ascii_escape(data) if self.ensure_ascii else data
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        data = self._encode(obj, indent)
+        if data is None:
+            return super().response(obj)
+        return self._app.response_class(data + b"\n", mimetype=self.mimetype)
@@ -8,6 +8,8 @@ from models.push_subscription import PushSubscription
 from models.article import Article
 from models.user import User
 from models.notification import Notification
+from repositories.recommendation import RecommendationRepository
+from services.recommendation_service import RecommendationService
 
 VAPID_PRIVATE_KEY = os.environ.get("VAPID_PRIVATE_KEY")
 VAPID_CLAIMS = {"sub": os.environ.get("VAPID_ADMIN_EMAIL")}
@@ -178,6 +180,22 @@ class AuthorNotifier(GeneralNotifier):
         )
 
 
+class RecommendationInvalidator(AbstractArticleObserver):
+    """
+    Оновлює списки рекомендацій при публікації статті: лише тих
+    користувачів, до чиїх рекомендацій вона може потрапити.
+    """
+
+    def update(self, article: Article, db_session: Session):
+        marked, extended = RecommendationRepository(db_session).add_article(
+            article, RecommendationService.MAX_STORED
+        )
+        print(
+            f"[Observer] RecommendationInvalidator: застарілих списків {marked}, "
+            f"доповнено {extended}."
+        )
+
+
 class ArticleNotificationService:
     def __init__(self):
         self._observers: List[AbstractArticleObserver] = []
@@ -208,5 +226,6 @@ notification_service = ArticleNotificationService()
 notification_service.attach(BreakingNewsNotifier())
 notification_service.attach(CategoryNotifier())
 notification_service.attach(AuthorNotifier())
+notification_service.attach(RecommendationInvalidator())
 
 print("Сервіс сповіщень ініціалізовано.")
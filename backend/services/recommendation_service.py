@@ -0,0 +1,128 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+from models.recommendation import UserRecommendation
+from models.serialization import FieldSet
+from models.user import User
+from repositories.article import ArticleRepository
+from repositories.pagination import paginate_ids
+from repositories.recommendation import RecommendationRepository
+
+
+class RecommendationService:
+    """
+    Рекомендації статей з попередньо обчисленого списку.
+
+    Список кандидатів ранжується за спорідненістю з категоріями та авторами,
+    з якими взаємодіяв користувач (і за улюбленими категоріями), з поправкою
+    на свіжість статті, та зберігається в user_recommendations. Запит
+    рекомендацій лише читає цей список; застарілий список перераховується
+    при першому зверненні або фоновим завданням.
+    """
+
+    FAVORITE_CATEGORY_WEIGHT = 5.0
+    HALF_LIFE_DAYS = 7
+    CANDIDATE_POOL = 1000
+    MAX_STORED = 200
+
+    def __init__(
+        self,
+        article_repo: ArticleRepository,
+        recommendation_repo: RecommendationRepository,
+    ):
+        self.article_repo = article_repo
+        self.recommendation_repo = recommendation_repo
+
+    def compute_for_user(
+        self, user_id: Optional[int], favorite_category_slugs: list[str] = None
+    ) -> list[int]:
+        """
+        Обчислює ранжований список ID рекомендованих статей.
+        user_id=None — без інтересів і переглядів (найновіші статті).
+        """
+        category_weights = defaultdict(float)
+        author_weights = defaultdict(float)
+        if user_id is not None:
+            for row in self.article_repo.get_interest_weights(user_id):
+                if row.category_id:
+                    category_weights[row.category_id] += row.weight
+                author_weights[row.author_id] += row.weight
+
+        favorite_slugs = set(favorite_category_slugs or [])
+        candidates = self.article_repo.get_recommendation_candidates(
+            user_id,
+            set(category_weights),
+            set(author_weights),
+            favorite_category_slugs=list(favorite_slugs),
+            limit=self.CANDIDATE_POOL,
+        )
+
+        def score(row) -> float:
+            affinity = (
+                1.0
+                + category_weights.get(row.category_id, 0.0)
+                + author_weights.get(row.author_id, 0.0)
+            )
+            if row.category_slug in favorite_slugs:
+                affinity += self.FAVORITE_CATEGORY_WEIGHT
+            now = datetime.now(row.created_at.tzinfo)
+            age_days = max((now - row.created_at).total_seconds(), 0) / 86400
+            return affinity * 0.5 ** (age_days / self.HALF_LIFE_DAYS)
+
+        ranked = sorted(candidates, key=lambda row: (score(row), row.id), reverse=True)
+        return [row.id for row in ranked[: self.MAX_STORED]]
+
+    def refresh_for_user(self, user: User) -> UserRecommendation:
+        """Перераховує та зберігає список рекомендацій користувача."""
+        preferences = user.preferences or {}
+        article_ids = self.compute_for_user(
+            user.id, preferences.get("favorite_categories", [])
+        )
+        return self.recommendation_repo.save_for_user(user.id, article_ids)
+
+    def get_recommended_articles(
+        self,
+        user: User,
+        page: int = 1,
+        per_page: int = 10,
+        filters: dict = None,
+        current_article_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        totals: str = "exact",
+        fieldset: Optional[FieldSet] = None,
+    ):
+        """
+        Повертає сторінку рекомендацій (articles, total, next_cursor).
+        Перераховує список лише якщо його немає або він позначений застарілим.
+        """
+        if user.is_admin:
+            # ID адміністратора — не ID користувача: без взаємодій і без
+            # збереженого списку
+            viewer_id = None
+            article_ids = self.compute_for_user(None)
+        else:
+            viewer_id = user.id
+            entry = self.recommendation_repo.get_for_user(user.id)
+            if entry is None or entry.is_stale:
+                entry = self.refresh_for_user(user)
+            article_ids = entry.article_ids
+
+        allowed_ids = self.article_repo.filter_recommendable_ids(
+            viewer_id,
+            article_ids,
+            filters=filters,
+            exclude_article_id=current_article_id,
+        )
+        ranked_ids = [
+            article_id for article_id in article_ids if article_id in allowed_ids
+        ]
+
+        page_ids, total, next_cursor = paginate_ids(
+            ranked_ids, page, per_page, cursor=cursor, totals=totals
+        )
+        return (
+            self.article_repo.get_by_ids(page_ids, fieldset=fieldset),
+            total,
+            next_cursor,
+        )
+
@@ -0,0 +1,99 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from flask import current_app
+from cache import ICacheBackend
+
+
+class IRotationStateBackend(ABC):
+    """
+    Сховище позицій ротації реклами.
+
+    advance() атомарно резервує step наступних позицій для ключа і повертає
+    першу з них. Лічильник лише зростає, індекс у списку оголошень стратегія
+    отримує як позицію за модулем кількості оголошень.
+    """
+
+    @abstractmethod
+    def advance(self, key: str, step: int) -> int:
+        pass
+
+
+class InProcessRotationState(IRotationStateBackend):
+    """Лічильники в пам'яті процесу: кожен воркер обертає рекламу окремо."""
+
+    def __init__(self):
+        self._positions = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def advance(self, key: str, step: int) -> int:
+        with self._lock:
+            position = self._positions[key]
+            self._positions[key] = position + step
+            return position
+
+
+class SharedMemoryRotationState(IRotationStateBackend):
+    """
+    Лічильники у файлі, відображеному в пам'ять (mmap), — спільні для всіх
+    воркерів на одному хості й переживають їх перезапуск.
+
+    Кожен ключ потрапляє в 8-байтовий слот (crc32 за модулем slots).
+    Інкремент захищений fcntl-блокуванням лише байтів цього слота, тож
+    воркери не чекають один одного на різних типах реклами.
+    """
+
+    SLOT = struct.Struct("<Q")
+
+    def __init__(self, path: str, slots: int = 64):
+        import fcntl
+
+        self._fcntl = fcntl
+        self.path = path
+        self.slots = slots
+        size = slots * self.SLOT.size
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+        # fcntl-блокування належать процесу, потоки одного воркера
+        # серіалізуємо звичайним локом
+        self._lock = threading.Lock()
+
+    def _offset(self, key: str) -> int:
+        return zlib.crc32(key.encode()) % self.slots * self.SLOT.size
+
+    def advance(self, key: str, step: int) -> int:
+        offset = self._offset(key)
+        with self._lock:
+            self._fcntl.lockf(self._fd, self._fcntl.LOCK_EX, self.SLOT.size, offset)
+            try:
+                (position,) = self.SLOT.unpack_from(self._map, offset)
+                self.SLOT.pack_into(self._map, offset, (position + step) % 2**64)
+            finally:
+                self._fcntl.lockf(self._fd, self._fcntl.LOCK_UN, self.SLOT.size, offset)
+        return position
+
+
+class CacheRotationState(IRotationStateBackend):
+    """
+    Лічильники в кеш-бекенді через атомарний incr (INCRBY у Redis) —
+    спільні для всіх вузлів, що використовують той самий Redis.
+    """
+
+    KEY_PREFIX = "ad-rotation:"
+
+    def __init__(self, backend: ICacheBackend):
+        self.backend = backend
+
+    def advance(self, key: str, step: int) -> int:
+        return self.backend.incr(self.KEY_PREFIX + key, step) - step
+
+
+def get_rotation_state() -> IRotationStateBackend:
+    return current_app.container.resolve(IRotationStateBackend)
@@ -1,10 +1,22 @@
-from typing import Any, List, Tuple, Dict
+from typing import Any, List, Optional, Tuple, Dict
 from repositories.subscription import SubscriptionRepository
+from services.auth.permission_versions import (
+    PermissionVersions,
+    get_permission_versions,
+)
+from services.auth.principal_cache import PrincipalCache, get_principal_cache
 
 
 class SubscriptionService:
-    def __init__(self, repo: SubscriptionRepository):
+    def __init__(
+        self,
+        repo: SubscriptionRepository,
+        permission_versions: Optional[PermissionVersions] = None,
+        principal_cache: Optional[PrincipalCache] = None,
+    ):
         self.repo = repo
+        self.permission_versions = permission_versions or get_permission_versions()
+        self.principal_cache = principal_cache or get_principal_cache()
 
     def list_plans(self):
         return self.repo.get_all_plans()
@@ -13,7 +25,18 @@ class SubscriptionService:
         plan = self.repo.get_plan_by_id(plan_id)
         if not plan:
             raise ValueError("План не знайдено")
-        return self.repo.subscribe_user(user_id, plan_id)
+        subscription = self.repo.subscribe_user(user_id, plan_id)
+        # Токени користувача з попередньою версією прав стають застарілими
+        self._invalidate([user_id])
+        return subscription
+
+    def invalidate_plan_subscribers(self, plan_id: int):
+        """Позначає застарілими токени підписників плану після зміни його прав."""
+        self._invalidate(self.repo.bump_plan_subscribers(plan_id))
+
+    def _invalidate(self, user_ids: List[int]):
+        self.permission_versions.invalidate(user_ids)
+        self.principal_cache.invalidate("user", user_ids)
 
     def get_current_subscription(self, user_id: int):
         return self.repo.get_active_user_subscription(user_id)
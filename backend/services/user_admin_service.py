@@ -1,10 +1,23 @@
 from repositories.user import UserRepository
-from typing import Dict, Any, Tuple, List
+from models.user import User
+from services.auth.permission_versions import (
+    PermissionVersions,
+    get_permission_versions,
+)
+from services.auth.principal_cache import PrincipalCache, get_principal_cache
+from typing import Dict, Any, Optional, Tuple, List
 
 
 class UserAdminService:
-    def __init__(self, user_repo: UserRepository):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        principal_cache: Optional[PrincipalCache] = None,
+        permission_versions: Optional[PermissionVersions] = None,
+    ):
         self.user_repo = user_repo
+        self.principal_cache = principal_cache or get_principal_cache()
+        self.permission_versions = permission_versions or get_permission_versions()
 
     def get_users_paginated(
         self, page: int, per_page: int
@@ -16,3 +29,19 @@ class UserAdminService:
 
         result = [user.to_dict() for user in users]
         return result, total
+
+    def update_user(self, user: User, update_data: Dict[str, Any]) -> User:
+        """Оновлює користувача і скидає закешовані principal його токенів."""
+        updated_user = self.user_repo.update(user, update_data)
+        self.principal_cache.invalidate("user", [user.id])
+        return updated_user
+
+    def delete_user(self, user: User):
+        """
+        Видаляє користувача. Версія прав і principal скидаються, тож його
+        токени перестають прийматися одразу, а не після закінчення TTL.
+        """
+        user_id = user.id
+        self.user_repo.delete(user)
+        self.principal_cache.invalidate("user", [user_id])
+        self.permission_versions.invalidate([user_id])
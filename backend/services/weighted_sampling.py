@@ -0,0 +1,61 @@
+import math
+
+
+class FenwickTree:
+    """
+    Дерево Фенвіка над вагами: зміна ваги та вибір елемента за накопиченою
+    сумою — O(log n). Використовується для зваженого вибору, коли ваги
+    змінюються поступово (pacing), і перебудова alias-таблиці була б O(n).
+    """
+
+    def __init__(self, weights: list[float]):
+        for weight in weights:
+            self._check(weight)
+        self.size = len(weights)
+        self.weights = list(weights)
+        self._tree = [0.0] * (self.size + 1)
+        for index, weight in enumerate(weights, start=1):
+            self._tree[index] += weight
+            parent = index + (index & -index)
+            if parent <= self.size:
+                self._tree[parent] += self._tree[index]
+
+    @staticmethod
+    def _check(weight: float):
+        # NaN чи нескінченність зробили б суми дерева NaN для всіх елементів
+        if not math.isfinite(weight) or weight < 0:
+            raise ValueError(f"Вага має бути скінченним невід'ємним числом: {weight}")
+
+    def total(self) -> float:
+        total = 0.0
+        index = self.size
+        while index > 0:
+            total += self._tree[index]
+            index -= index & -index
+        return total
+
+    def set(self, position: int, weight: float):
+        self._check(weight)
+        delta = weight - self.weights[position]
+        if not delta:
+            return
+        self.weights[position] = weight
+        index = position + 1
+        while index <= self.size:
+            self._tree[index] += delta
+            index += index & -index
+
+    def find(self, value: float) -> int:
+        """Позиція елемента, в проміжок накопиченої суми якого потрапляє value."""
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            candidate = position + step
+            if candidate <= self.size and self._tree[candidate] <= value:
+                position = candidate
+                value -= self._tree[candidate]
+            step >>= 1
+        # Захист від похибок округлення на правій межі
+        while position < self.size - 1 and self.weights[position] <= 0:
+            position += 1
+        return min(position, self.size - 1)
@@ -0,0 +1,40 @@
+import os
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+os.environ.setdefault("FLASK_CONFIG", "default")
+
+from app import create_app
+from database import IDatabaseConnection
+from repositories.article import ArticleRepository
+
+app = create_app(os.environ.get("FLASK_CONFIG"))
+
+
+def rebuild_search_index():
+    """
+    Повністю перебудовує повнотекстовий індекс статей (FTS5 / tsvector).
+    Потрібно після масового імпорту даних в обхід репозиторіїв (seed.sql).
+    """
+    with app.app_context():
+        print(f"[{datetime.now()}] Запуск завдання 'rebuild_search_index'...")
+
+        db_connection = app.container.resolve(IDatabaseConnection)
+        db_session: Session = db_connection.get_session()
+
+        try:
+            article_repo = ArticleRepository(db_session)
+            with db_connection.db.begin() as connection:
+                article_repo.search_index.create_schema(connection)
+            total = article_repo.rebuild_search_index()
+            print(f"Проіндексовано {total} статей.")
+        except Exception as e:
+            db_session.rollback()
+            print(f"ПОМИЛКА під час перебудови пошукового індексу: {e}")
+        finally:
+            db_session.close()
+            print("Завдання 'rebuild_search_index' завершено.")
+
+
+if __name__ == "__main__":
+    rebuild_search_index()
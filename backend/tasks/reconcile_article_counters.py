@@ -0,0 +1,37 @@
+import os
+from datetime import datetime
+from sqlalchemy.orm import Session
+
+os.environ.setdefault("FLASK_CONFIG", "default")
+
+from app import create_app
+from database import IDatabaseConnection
+from repositories.article import ArticleRepository
+
+app = create_app(os.environ.get("FLASK_CONFIG"))
+
+
+def reconcile_article_counters():
+    """
+    Звіряє likes_count / saves_count статей з таблицею article_interactions.
+    Потрібно після міграції та після імпорту взаємодій в обхід репозиторію.
+    """
+    with app.app_context():
+        print(f"[{datetime.now()}] Запуск завдання 'reconcile_article_counters'...")
+
+        db_connection = app.container.resolve(IDatabaseConnection)
+        db_session: Session = db_connection.get_session()
+
+        try:
+            fixed = ArticleRepository(db_session).reconcile_interaction_counters()
+            print(f"Виправлено лічильники для {fixed} статей.")
+        except Exception as e:
+            db_session.rollback()
+            print(f"ПОМИЛКА під час звірки лічильників: {e}")
+        finally:
+            db_session.close()
+            print("Завдання 'reconcile_article_counters' завершено.")
+
+
+if __name__ == "__main__":
+    reconcile_article_counters()
@@ -0,0 +1,55 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+os.environ.setdefault("FLASK_CONFIG", "default")
+
+from app import create_app
+from database import IDatabaseConnection
+from models.user import User
+from repositories.article import ArticleRepository
+from repositories.recommendation import RecommendationRepository
+from services.recommendation_service import RecommendationService
+
+app = create_app(os.environ.get("FLASK_CONFIG"))
+
+ACTIVE_WITHIN_DAYS = 30
+MAX_AGE_HOURS = 6
+
+
+def refresh_recommendations():
+    """
+    Перераховує списки рекомендацій активних користувачів (взаємодії чи
+    перегляди за останні ACTIVE_WITHIN_DAYS днів), якщо список відсутній,
+    позначений застарілим або старший за MAX_AGE_HOURS годин.
+    """
+    with app.app_context():
+        print(f"[{datetime.now()}] Запуск завдання 'refresh_recommendations'...")
+
+        db_session: Session = app.container.resolve(IDatabaseConnection).get_session()
+
+        try:
+            recommendation_repo = RecommendationRepository(db_session)
+            recommendation_service = RecommendationService(
+                ArticleRepository(db_session), recommendation_repo
+            )
+
+            now = datetime.now()
+            user_ids = recommendation_repo.get_user_ids_to_refresh(
+                active_since=now - timedelta(days=ACTIVE_WITHIN_DAYS),
+                computed_before=now - timedelta(hours=MAX_AGE_HOURS),
+            )
+            print(f"Знайдено {len(user_ids)} користувачів для оновлення рекомендацій.")
+
+            for user in db_session.query(User).filter(User.id.in_(user_ids)).all():
+                recommendation_service.refresh_for_user(user)
+        except Exception as e:
+            db_session.rollback()
+            print(f"ПОМИЛКА під час оновлення рекомендацій: {e}")
+        finally:
+            db_session.close()
+            print("Завдання 'refresh_recommendations' завершено.")
+
+
+if __name__ == "__main__":
+    refresh_recommendations()
@@ -0,0 +1,52 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+os.environ.setdefault("FLASK_CONFIG", "default")
+
+from app import create_app
+from database import IDatabaseConnection
+from repositories.ad_stats import AdStatsRepository
+
+app = create_app(os.environ.get("FLASK_CONFIG"))
+
+# Події, молодші за це, ще можуть дописуватися паралельними транзакціями
+SETTLE_SECONDS = 60
+# Скільки днів зберігати сирі ad_views / ad_clicks після агрегування
+RAW_RETENTION_DAYS = int(os.environ.get("AD_RAW_RETENTION_DAYS", 30))
+
+
+def rollup_ad_stats():
+    """
+    Інкрементально агрегує нові покази та кліки реклами в погодинні й добові
+    таблиці ad_stats_* та видаляє агреговані сирі події, старші за
+    RAW_RETENTION_DAYS днів.
+    """
+    with app.app_context():
+        print(f"[{datetime.now()}] Запуск завдання 'rollup_ad_stats'...")
+
+        db_session: Session = app.container.resolve(IDatabaseConnection).get_session()
+
+        try:
+            stats_repo = AdStatsRepository(db_session)
+            now = datetime.now()
+
+            processed = stats_repo.roll_up(
+                settled_before=now - timedelta(seconds=SETTLE_SECONDS)
+            )
+            print(f"Агреговано {processed} подій.")
+
+            pruned = stats_repo.prune_raw_events(
+                older_than=now - timedelta(days=RAW_RETENTION_DAYS)
+            )
+            print(f"Видалено {pruned} сирих подій.")
+        except Exception as e:
+            db_session.rollback()
+            print(f"ПОМИЛКА під час агрегування статистики реклами: {e}")
+        finally:
+            db_session.close()
+            print("Завдання 'rollup_ad_stats' завершено.")
+
+
+if __name__ == "__main__":
+    rollup_ad_stats()
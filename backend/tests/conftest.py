@@ -0,0 +1,130 @@
+import datetime as dt
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+from app import create_app
+from config import TestingConfig
+from database import IDatabaseConnection
+from database.search import get_search_index
+from models import (
+    Admin,
+    Article,
+    Author,
+    Category,
+    SubscriptionPlan,
+    User,
+    UserSubscriptionPlan,
+)
+from models.article import ArticleKeyword
+
+ARTICLES_COUNT = 30
+PASSWORD = "password"
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Файл, а не :memory:, щоб фонові потоки бачили ту саму БД
+    monkeypatch.setattr(
+        TestingConfig, "DATABASE_URL", f"sqlite:///{tmp_path / 'news.db'}"
+    )
+    app = create_app("testing")
+    connection = app.container.resolve(IDatabaseConnection)
+    connection.create_tables()
+    yield app
+    connection.engine.dispose()
+
+
+@pytest.fixture
+def db_session(app):
+    session = app.container.resolve(IDatabaseConnection).get_session()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def seed(db_session):
+    """Дві категорії, два автори, статті з ключовими словами, користувач, адмін."""
+    plan = SubscriptionPlan(
+        name="Безкоштовний",
+        permissions={"comment": True, "save_article": True},
+        price_per_month=None,
+    )
+    categories = [
+        Category(name="Спорт", slug="sport"),
+        Category(name="Технології", slug="tech"),
+    ]
+    authors = [
+        Author(first_name="Іван", last_name="Франко"),
+        Author(first_name="Леся", last_name="Українка"),
+    ]
+    db_session.add_all([plan, *categories, *authors])
+    db_session.flush()
+
+    created_at = dt.datetime(2025, 1, 1)
+    for index in range(ARTICLES_COUNT):
+        article = Article(
+            title=f"Стаття {index}",
+            content=f"Текст статті {index}",
+            author_id=authors[index % 2].id,
+            category_id=categories[index % 2].id,
+            status="published",
+            created_at=created_at + dt.timedelta(hours=index),
+        )
+        db_session.add(article)
+        db_session.flush()
+        db_session.add_all(
+            ArticleKeyword(article_id=article.id, keyword=keyword)
+            for keyword in (f"тег{index}", "новини")
+        )
+
+    user = User(
+        email="user@news.com",
+        password=generate_password_hash(PASSWORD),
+        username="user",
+        preferences={"favorite_categories": ["sport"]},
+    )
+    admin = Admin(email="admin@news.com", password=generate_password_hash(PASSWORD))
+    db_session.add_all([user, admin])
+    db_session.flush()
+    db_session.add(UserSubscriptionPlan(user_id=user.id, plan_id=plan.id))
+    get_search_index(db_session.get_bind().dialect.name).rebuild(db_session)
+    db_session.commit()
+    return {"user_id": user.id, "admin_id": admin.id}
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def _auth_headers(app, identity: int, kind: str) -> dict:
+    with app.app_context():
+        token = create_access_token(
+            identity=str(identity), additional_claims={"type": kind}
+        )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def user_headers(app, seed):
+    return _auth_headers(app, seed["user_id"], "user")
+
+
+@pytest.fixture
+def admin_headers(app, seed):
+    return _auth_headers(app, seed["admin_id"], "admin")
+
+
+@pytest.fixture
+def statements(app):
+    """Список SQL-запитів, виконаних під час тесту."""
+    engine = app.container.resolve(IDatabaseConnection).engine
+    executed = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,45 @@
+import datetime as dt
+from models.ad import Ad
+from repositories.ad import AdRepository
+from services.ad_timeline import AdStatusCounts, AdTimeline, ad_status
+
+NOW = dt.datetime(2026, 1, 1, 12, 0)
+
+
+def make_ads(db_session) -> list[Ad]:
+    ads = [
+        Ad(title="Закінчується зараз", ad_type="banner", end_date=NOW),
+        Ad(title="Закінчилось", ad_type="banner", end_date=NOW - dt.timedelta(1)),
+        Ad(title="Триває", ad_type="banner", end_date=NOW + dt.timedelta(1)),
+        Ad(title="Вимкнене", ad_type="banner", is_active=False),
+    ]
+    db_session.add_all(ads)
+    db_session.commit()
+    return ads
+
+
+def test_ad_ending_now_has_one_status_everywhere(db_session):
+    ads = make_ads(db_session)
+    repo = AdRepository(db_session)
+
+    by_filter = {
+        status: {
+            ad.id for ad in repo.get_paginated_ads(1, 10, status, None, now=NOW)[0]
+        }
+        for status in ("active", "inactive", "expired")
+    }
+    by_ad_status = {
+        status: {ad.id for ad in ads if ad_status(ad, NOW) == status}
+        for status in ("active", "inactive", "expired")
+    }
+    assert by_filter == by_ad_status
+    assert ads[0].id in by_filter["active"]
+
+    counts = AdStatusCounts(ads).at(NOW)
+    assert counts["active_ads"] == len(by_filter["active"])
+    assert counts["expired_ads"] == len(by_filter["expired"])
+    assert counts["inactive_ads"] == len(by_filter["inactive"])
+
+    # Показ іде до end_date включно
+    by_type, _ = AdTimeline([ad for ad in ads if ad.is_active]).active_by_type(NOW)
+    assert {ad.id for ad in by_type["banner"]} == by_filter["active"]
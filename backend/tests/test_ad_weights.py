@@ -0,0 +1,44 @@
+import math
+import random
+from types import SimpleNamespace
+import pytest
+from services.ad_strategy import WeightedAdStrategy
+from services.weighted_sampling import FenwickTree
+
+
+@pytest.mark.parametrize("weight", ["NaN", "Infinity", '"inf"', '"-nan"'])
+def test_admin_rejects_non_finite_ad_weight(client, seed, admin_headers, weight):
+    response = client.post(
+        "/admin/ads/",
+        data=f'{{"title": "Банер", "ad_type": "banner", "weight": {weight}}}',
+        content_type="application/json",
+        headers=admin_headers,
+    )
+    assert response.status_code == 400
+
+
+def test_fenwick_tree_rejects_non_finite_weights():
+    with pytest.raises(ValueError):
+        FenwickTree([1.0, math.nan])
+    tree = FenwickTree([1.0, 2.0])
+    with pytest.raises(ValueError):
+        tree.set(0, math.inf)
+    assert tree.total() == 3.0
+
+
+def test_weighted_strategy_ignores_non_finite_stored_weights():
+    ads = tuple(
+        SimpleNamespace(
+            id=ad_id,
+            weight=weight,
+            impression_budget=None,
+            impressions_count=0,
+            clicks_count=0,
+        )
+        for ad_id, weight in enumerate([math.inf, 1.0, math.nan, 2.0])
+    )
+    strategy = WeightedAdStrategy(rng=random.Random(1))
+
+    for _ in range(20):
+        selected = strategy.select_ads(ads, 3)
+        assert sorted(ad.id for ad in selected) == [1, 3]
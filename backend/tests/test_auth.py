@@ -0,0 +1,33 @@
+from flask_jwt_extended import create_access_token
+
+
+def test_admin_token_is_not_taken_for_user_with_same_id(
+    app, client, seed, user_headers
+):
+    # Адмін і користувач мають однаковий ID; користувач зберіг статтю 1
+    assert seed["admin_id"] == seed["user_id"]
+    assert client.post("/articles/1/save", headers=user_headers).status_code == 200
+
+    with app.app_context():
+        admin_token = create_access_token(
+            identity=str(seed["admin_id"]), additional_claims={"type": "admin"}
+        )
+    client.set_cookie("access_token_cookie", admin_token)
+    response = client.get("/articles/1")
+
+    assert response.status_code == 200
+    assert "is_saved" not in response.get_json()
+    assert "access_token_cookie" not in response.headers.get("Set-Cookie", "")
+    assert client.get_cookie("access_token_cookie").value == admin_token
+
+    response = client.get(
+        "/articles/1", headers={"Authorization": f"Bearer {admin_token}"}
+    )
+    assert "is_saved" not in response.get_json()
+    assert "X-Permissions-Changed" not in response.headers
+
+
+def test_user_token_still_resolves_user(client, seed, user_headers):
+    client.post("/articles/1/save", headers=user_headers)
+    response = client.get("/articles/1", headers=user_headers)
+    assert response.get_json()["is_saved"] is True
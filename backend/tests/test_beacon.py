@@ -0,0 +1,34 @@
+import json
+from models import Ad, Article
+from services.ad_event_buffer import AdEventBuffer
+from services.beacon import get_beacon_signer
+from services.impression_buffer import ArticleImpressionBuffer
+
+
+def _send(client, **beacons):
+    return client.post(
+        "/beacon/", data=json.dumps(beacons), content_type="text/plain"
+    )
+
+
+def test_repeated_beacons_count_once(app, client, db_session, seed):
+    ad = Ad(title="Банер", ad_type="banner")
+    db_session.add(ad)
+    db_session.commit()
+    article_id = db_session.query(Article.id).first()[0]
+    with app.app_context():
+        signer = get_beacon_signer()
+        click = signer.sign("ad", ad.id)
+        view = signer.sign("article", article_id)
+    client.get("/")
+
+    assert _send(client, clicks=[click] * 100).status_code == 204
+    assert _send(client, articles=[view] * 50).status_code == 204
+    # Той самий клік у межах вікна повторів — уже з наступного запиту
+    assert _send(client, clicks=[click]).status_code == 204
+
+    app.container.resolve(AdEventBuffer).flush()
+    app.container.resolve(ArticleImpressionBuffer).flush()
+    db_session.expire_all()
+    assert db_session.get(Ad, ad.id).clicks_count == 1
+    assert db_session.get(Article, article_id).views_count == 1
@@ -0,0 +1,48 @@
+from models.ad import Ad, AdView
+from middleware.viewer_middleware import VIEWER_COOKIE
+from services.ad_event_buffer import AdEventBuffer
+from services.frequency_cap import DecayingCountingBloomFilter, viewer_key
+
+
+def test_viewer_cookie_is_issued_once(client):
+    first = client.get("/")
+    assert VIEWER_COOKIE in first.headers.get("Set-Cookie", "")
+    assert client.get_cookie(VIEWER_COOKIE) is not None
+
+    second = client.get("/")
+    assert "Set-Cookie" not in second.headers
+
+
+def test_anonymous_viewers_are_keyed_by_cookie_not_ip(app, db_session):
+    ad = Ad(title="Банер", ad_type="banner")
+    db_session.add(ad)
+    db_session.commit()
+
+    readers = [app.test_client(), app.test_client()]
+    for reader in readers:
+        # Перший запит лише отримує cookie: без нього показ без сесії
+        reader.get("/")
+        response = reader.post(f"/ads/{ad.id}/impression", json={})
+        assert response.status_code == 200
+    app.container.resolve(AdEventBuffer).flush()
+
+    session_ids = {
+        view.session_id for view in db_session.query(AdView).filter_by(ad_id=ad.id)
+    }
+    assert len(session_ids) == 2
+    assert None not in session_ids
+
+
+def test_viewer_without_session_is_not_keyed():
+    assert viewer_key(None, None) is None
+    assert viewer_key(7, "abc") == "u:7"
+    assert viewer_key(None, "abc") == "s:abc"
+
+
+def test_bloom_filter_is_sized_for_expected_load():
+    bloom = DecayingCountingBloomFilter.for_capacity(3600, 20_000, error_rate=0.01)
+    for index in range(20_000):
+        bloom.add(f"s:{index}|1")
+
+    false_positives = sum(bool(bloom.count(f"s:new{index}|1")) for index in range(5000))
+    assert false_positives / 5000 < 0.02
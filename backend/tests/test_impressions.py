@@ -0,0 +1,21 @@
+from models import Article
+from services.impression_buffer import ArticleImpressionBuffer
+
+
+def test_batch_rejects_boolean_ids(client, seed):
+    for body in ({"article_ids": [True]}, {"ad_ids": [False]}):
+        response = client.post("/articles/impressions", json=body)
+        assert response.status_code == 400
+
+
+def test_batch_counts_repeated_ids_once(app, client, db_session, seed):
+    article_id = db_session.query(Article.id).first()[0]
+
+    response = client.post(
+        "/articles/impressions", json={"article_ids": [article_id] * 3}
+    )
+    assert response.get_json()["articles_recorded"] == 1
+
+    app.container.resolve(ArticleImpressionBuffer).flush()
+    db_session.expire_all()
+    assert db_session.get(Article, article_id).views_count == 1
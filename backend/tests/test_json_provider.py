@@ -0,0 +1,28 @@
+import dataclasses
+import math
+import pytest
+from flask.json.provider import DefaultJSONProvider
+from services.json_provider import FastJSONProvider
+
+
+@dataclasses.dataclass
+class Score:
+    name: str
+    value: float
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        {"ctr": math.nan, "next_cursor": None},
+        {"ads": [{"id": 1, "weight": math.inf}], "total": None},
+        [None, (1, -math.inf)],
+        {"score": Score("ctr", math.nan), "page": None},
+        {"next_cursor": None, "articles": [{"id": 1, "ctr": math.nan}]},
+        {"title": "null", "articles": [{"bio": None, "ctr": -math.inf}]},
+        {"ctr": 0.5, "next_cursor": None, "title": "Україна"},
+    ],
+)
+def test_fast_provider_matches_default_for_non_finite_floats(app, payload):
+    expected = DefaultJSONProvider(app).response(payload).get_data()
+    assert FastJSONProvider(app).response(payload).get_data() == expected
@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.mark.parametrize("per_page", [0, -1])
+@pytest.mark.parametrize(
+    "url",
+    [
+        "/articles/?per_page={}",
+        "/articles/?per_page={}&cursor=",
+        "/authors/1/articles?per_page={}",
+        "/admin/articles/?per_page={}",
+    ],
+)
+def test_non_positive_page_size_returns_empty_page(
+    client, seed, admin_headers, url, per_page
+):
+    response = client.get(url.format(per_page), headers=admin_headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["articles"] == []
+    assert body.get("next_cursor") is None
+
+
+@pytest.mark.parametrize("query", ["per_page=0", "per_page=-1", "per_page=0&cursor="])
+def test_recommended_with_non_positive_page_size_returns_empty_page(
+    client, user_headers, query
+):
+    response = client.get(f"/articles/recommended?{query}", headers=user_headers)
+    assert response.status_code == 200
+    assert response.get_json()["articles"] == []
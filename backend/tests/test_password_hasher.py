@@ -0,0 +1,35 @@
+import threading
+import pytest
+from config import Config
+from services.auth.password_hasher import PasswordHasher, PasswordHashingBusyError
+
+
+def test_hashing_leaves_request_threads_for_reads():
+    assert Config.PASSWORD_HASH_THREADS < Config.WEB_THREADS
+
+
+def test_logins_beyond_concurrency_limit_are_rejected():
+    hasher = PasswordHasher(max_workers=2, max_concurrent=2)
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def slow_hash():
+        started.release()
+        release.wait()
+
+    # Два входи вже рахують хеш і тримають потоки запитів
+    waiting = [
+        threading.Thread(target=hasher._run, args=(slow_hash,)) for _ in range(2)
+    ]
+    for thread in waiting:
+        thread.start()
+    for _ in waiting:
+        started.acquire()
+
+    with pytest.raises(PasswordHashingBusyError):
+        hasher._run(slow_hash)
+
+    release.set()
+    for thread in waiting:
+        thread.join()
+    assert hasher.verify(hasher.hash("password"), "password")
@@ -0,0 +1,31 @@
+from cache.backends import InMemoryLRUCache
+from services.auth.principal_cache import PrincipalCache
+
+SNAPSHOT = {"id": 1, "email": "admin@news.com"}
+
+
+def cached_snapshot(cache: PrincipalCache):
+    return cache.get("admin", 1, "jti", cache.generation("admin", 1))
+
+
+def test_admin_revocation_reaches_other_workers():
+    shared = InMemoryLRUCache()
+    worker_a, worker_b = PrincipalCache(backend=shared), PrincipalCache(backend=shared)
+    worker_b.put("admin", 1, "jti", SNAPSHOT, worker_b.generation("admin", 1))
+    assert cached_snapshot(worker_b) == SNAPSHOT
+
+    # Адміністратора видалили в іншому воркері
+    worker_a.invalidate("admin", [1])
+
+    assert cached_snapshot(worker_b) is None
+
+
+def test_snapshot_loaded_during_revocation_is_not_reused():
+    shared = InMemoryLRUCache()
+    worker_a, worker_b = PrincipalCache(backend=shared), PrincipalCache(backend=shared)
+
+    generation = worker_b.generation("admin", 1)
+    worker_a.invalidate("admin", [1])
+    worker_b.put("admin", 1, "jti", SNAPSHOT, generation)
+
+    assert cached_snapshot(worker_b) is None
@@ -0,0 +1,84 @@
+import pytest
+
+# (URL, чиї заголовки, очікувана кількість SQL-запитів на сторінку).
+# Кількість не залежить від per_page: автор і категорія підтягуються
+# JOIN-ом, ключові слова — одним selectin-запитом на всю сторінку.
+LIST_ENDPOINTS = [
+    ("/articles/?", None, 2),
+    ("/articles/?cursor=&", None, 2),
+    ("/articles/search?q=Стаття&", None, 2),
+    ("/authors/1/articles?", None, 2),
+    ("/articles/saved?", "user", 2),
+    ("/articles/liked?", "user", 3),
+    ("/articles/recommended?", "user", 4),
+    ("/admin/articles/?", "admin", 2),
+    ("/admin/authors/1/articles?", "admin", 3),
+]
+
+
+@pytest.fixture
+def headers(user_headers, admin_headers):
+    return {None: {}, "user": user_headers, "admin": admin_headers}
+
+
+@pytest.fixture
+def interactions(client, user_headers):
+    for article_id in range(1, 13):
+        client.post(f"/articles/{article_id}/save", headers=user_headers)
+        client.post(f"/articles/{article_id}/toggle-like", headers=user_headers)
+
+
+@pytest.mark.parametrize("url, who, expected", LIST_ENDPOINTS)
+def test_list_query_count_does_not_grow_with_page_size(
+    client, headers, interactions, statements, url, who, expected
+):
+    # Перший запит прогріває кеші (total, реклама, principal)
+    client.get(f"{url}per_page=5", headers=headers[who])
+
+    # Унікальний параметр обходить кеш відповідей
+    for attempt, per_page in enumerate((2, 10)):
+        statements.clear()
+        response = client.get(
+            f"{url}per_page={per_page}&attempt={attempt}", headers=headers[who]
+        )
+        assert response.status_code == 200
+        body = response.get_json()
+        articles = body if isinstance(body, list) else body["articles"]
+        assert len(articles) == per_page
+        assert len(statements) == expected, statements
+
+
+def test_category_articles_query_count(client, admin_headers, statements):
+    client.get("/admin/categories/2/articles", headers=admin_headers)
+
+    statements.clear()
+    response = client.get("/admin/categories/1/articles", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert len(response.get_json()["articles"]) == 15
+    assert len(statements) == 3, statements
+
+
+def test_article_detail_query_count(client, seed, user_headers, statements):
+    client.get("/articles/2", headers=user_headers)
+
+    statements.clear()
+    response = client.get("/articles/3", headers=user_headers)
+
+    assert response.status_code == 200
+    assert len(statements) == 4, statements
+
+
+def test_article_detail_skips_unrequested_interaction_lookups(
+    client, seed, user_headers, statements
+):
+    client.get("/articles/2", headers=user_headers)
+
+    statements.clear()
+    response = client.get("/articles/3?fields=title", headers=user_headers)
+    assert set(response.get_json()) == {"id", "title", "beacon", "ads"}
+    assert not any("article_interactions" in sql for sql in statements), statements
+
+    response = client.get("/articles/3?fields=title,is_liked", headers=user_headers)
+    assert response.get_json()["is_liked"] is False
+    assert "is_saved" not in response.get_json()
@@ -0,0 +1,95 @@
+import re
+import pytest
+from sqlalchemy import event
+from database import IDatabaseConnection
+
+# Таблиці з індексами для гарячих запитів (міграції b5e9c2d47f18, 9e2f7b4c1d58)
+INDEXED_TABLES = {
+    "articles",
+    "article_keywords",
+    "article_interactions",
+    "article_views",
+    "notifications",
+    "comments",
+    "ad_views",
+    "push_subscriptions",
+}
+SCAN = re.compile(r"^SCAN (\w+)( USING (?:COVERING )?INDEX \w+)?")
+
+HOT_ENDPOINTS = [
+    ("/articles/", None),
+    ("/articles/?cursor=", None),
+    ("/articles/?status=published", None),
+    ("/articles/?category=1", None),
+    ("/articles/?category_slug=sport", None),
+    ("/articles/", "user"),
+    ("/authors/1/articles", None),
+    ("/articles/3", "user"),
+    ("/articles/3/comments", None),
+    ("/articles/saved", "user"),
+    ("/articles/liked", "user"),
+    ("/articles/recommended", "user"),
+    ("/notifications/", "user"),
+    ("/admin/articles/", "admin"),
+    ("/admin/authors/1/articles", "admin"),
+]
+
+
+def full_scans(plan: list[str], statement: str) -> list[str]:
+    """
+    Рядки плану з повним переглядом індексованої таблиці. Перегляд за
+    індексом допустимий лише як упорядкований обхід з LIMIT (без
+    сортування в тимчасовому B-дереві) або для запиту без WHERE.
+    """
+    sorts = any("USE TEMP B-TREE FOR ORDER BY" in line for line in plan)
+    ordered_walk = "LIMIT" in statement and not sorts
+    scans = []
+    for line in plan:
+        match = SCAN.match(line)
+        if not match or match.group(1) not in INDEXED_TABLES:
+            continue
+        if match.group(2) and (ordered_walk or "WHERE" not in statement):
+            continue
+        scans.append(line)
+    return scans
+
+
+@pytest.fixture
+def selects(app):
+    """SELECT-запити з параметрами, виконані під час тесту."""
+    engine = app.container.resolve(IDatabaseConnection).engine
+    executed = []
+
+    def record(connection, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            executed.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def headers(user_headers, admin_headers):
+    return {None: {}, "user": user_headers, "admin": admin_headers}
+
+
+@pytest.mark.parametrize("url, who", HOT_ENDPOINTS)
+def test_hot_queries_use_indexes(app, client, headers, selects, url, who):
+    for article_id in range(1, 6):
+        client.post(f"/articles/{article_id}/save", headers=headers["user"])
+        client.post(f"/articles/{article_id}/toggle-like", headers=headers["user"])
+    selects.clear()
+
+    assert client.get(url, headers=headers[who]).status_code == 200
+
+    engine = app.container.resolve(IDatabaseConnection).engine
+    with engine.connect() as connection:
+        for statement, parameters in selects:
+            plan = [
+                row[3]
+                for row in connection.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+            ]
+            assert not full_scans(plan, statement), (statement, plan)
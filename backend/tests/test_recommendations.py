@@ -0,0 +1,87 @@
+from flask_jwt_extended import create_access_token
+from models import Article, User, UserRecommendation, UserSubscriptionPlan
+
+
+def _user_headers(app, db_session, username, preferences):
+    user = User(
+        email=f"{username}@news.com",
+        password="-",
+        username=username,
+        preferences=preferences,
+    )
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(UserSubscriptionPlan(user_id=user.id, plan_id=1))
+    db_session.commit()
+    with app.app_context():
+        token = create_access_token(
+            identity=str(user.id), additional_claims={"type": "user"}
+        )
+    return user.id, {"Authorization": f"Bearer {token}"}
+
+
+def _entry(db_session, user_id) -> UserRecommendation:
+    db_session.expire_all()
+    return db_session.query(UserRecommendation).filter_by(user_id=user_id).one()
+
+
+def test_publish_updates_only_affected_lists(
+    app, client, db_session, seed, admin_headers
+):
+    draft = Article(
+        title="Чернетка",
+        content="Текст",
+        author_id=1,
+        category_id=1,
+        status="draft",
+    )
+    db_session.add(draft)
+    db_session.commit()
+
+    sport_fan, sport_headers = _user_headers(
+        app, db_session, "sport", {"favorite_categories": ["sport"]}
+    )
+    tech_fan, tech_headers = _user_headers(
+        app, db_session, "tech", {"favorite_categories": ["tech"]}
+    )
+    newcomer, newcomer_headers = _user_headers(app, db_session, "new", {})
+    for headers in (sport_headers, tech_headers, newcomer_headers):
+        assert client.get("/articles/recommended", headers=headers).status_code == 200
+    newcomer_ids = _entry(db_session, newcomer).article_ids
+
+    response = client.put(
+        f"/admin/articles/{draft.id}/status",
+        json={"status": "published"},
+        headers=admin_headers,
+    )
+    assert response.status_code == 200
+
+    assert _entry(db_session, sport_fan).is_stale
+    assert not _entry(db_session, tech_fan).is_stale
+    newcomer_entry = _entry(db_session, newcomer)
+    assert not newcomer_entry.is_stale
+    assert newcomer_entry.article_ids == [draft.id, *newcomer_ids]
+
+
+def test_admin_recommendations_ignore_user_with_same_id(
+    client, db_session, seed, user_headers, admin_headers
+):
+    # Користувач з тим самим ID, що й адмін, переглянув усі статті
+    assert seed["admin_id"] == seed["user_id"]
+    for article_id in range(1, 31):
+        client.post(f"/articles/{article_id}/toggle-like", headers=user_headers)
+
+    response = client.get("/articles/recommended?per_page=5", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert len(response.get_json()["articles"]) == 5
+    assert db_session.query(UserRecommendation).count() == 0
+
+
+def test_unsave_of_unsaved_article_keeps_list(client, db_session, seed, user_headers):
+    client.get("/articles/recommended", headers=user_headers)
+
+    response = client.post("/articles/3/unsave", headers=user_headers)
+
+    assert response.status_code == 200
+    assert not _entry(db_session, seed["user_id"]).is_stale
@@ -0,0 +1,40 @@
+from cache.backends import InMemoryLRUCache
+from cache.response_cache import ResponseCache
+
+
+def test_response_read_before_purge_is_not_cached():
+    cache = ResponseCache(InMemoryLRUCache())
+    snapshot = cache.snapshot()
+    # Обробник прочитав дані, потім адмін змінив статтю та інвалідував тег
+    payload = {"id": 1, "title": "Стара назва"}
+    cache.purge("article:1")
+
+    assert not cache.set("/articles/1", payload, ["article:1"], snapshot)
+    assert cache.get("/articles/1") is None
+
+
+def test_response_is_cached_until_purge():
+    cache = ResponseCache(InMemoryLRUCache())
+    payload = {"id": 1, "title": "Назва"}
+
+    assert cache.set("/articles/1", payload, ["article:1"], cache.snapshot())
+    assert cache.get("/articles/1") == payload
+
+    cache.purge("article:1")
+    assert cache.get("/articles/1") is None
+
+
+def test_cached_response_is_served_without_queries(
+    client, seed, admin_headers, statements
+):
+    client.get("/categories/")
+    statements.clear()
+    assert client.get("/categories/").status_code == 200
+    assert statements == []
+
+    response = client.put(
+        "/admin/categories/1", json={"name": "Футбол"}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    categories = client.get("/categories/").get_json()["categories"]
+    assert "Футбол" in [category["name"] for category in categories]
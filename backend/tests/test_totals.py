@@ -0,0 +1,75 @@
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql
+from app import create_app
+from database import IDatabaseConnection
+from models import Category
+from models.article import Article
+from repositories.article import ArticleRepository
+from repositories.totals import TotalsCounter
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.calls = []
+
+    def exec_driver_sql(self, sql, params):
+        self.calls.append((sql, params))
+        return self
+
+    def scalar(self):
+        return [{"Plan": {"Plan Rows": 1234}}]
+
+
+class PostgresBind:
+    dialect = postgresql.psycopg2.dialect()
+
+
+def test_estimate_expands_in_parameters_for_postgresql(db_session, monkeypatch):
+    connection = RecordingConnection()
+    query = db_session.query(Article).filter(Article.id.in_([1, 2, 3]))
+    monkeypatch.setattr(query.session, "get_bind", lambda *a, **kw: PostgresBind())
+    monkeypatch.setattr(query.session, "connection", lambda *a, **kw: connection)
+
+    assert TotalsCounter()._estimate(query) == 1234
+
+    [(sql, params)] = connection.calls
+    assert "POSTCOMPILE" not in sql
+    assert sorted(params.values()) == [1, 2, 3]
+
+
+def test_each_app_invalidates_its_own_totals(app):
+    other = create_app("testing")
+    connection = other.container.resolve(IDatabaseConnection)
+    db_session = connection.get_session()
+    counter = other.container.resolve(TotalsCounter)
+    assert counter.count(db_session.query(Category)) == 0
+
+    db_session.add(Category(name="Спорт", slug="sport"))
+    db_session.commit()
+
+    assert counter.count(db_session.query(Category)) == 1
+    db_session.close()
+    connection.engine.dispose()
+
+
+def test_counter_updates_keep_cached_totals(app, db_session, seed):
+    counter = app.container.resolve(TotalsCounter)
+    article_id = db_session.query(Article.id).first()[0]
+    generation = counter._generations(["articles"])
+
+    articles = Article.__table__
+    db_session.execute(
+        update(articles)
+        .where(articles.c.id == article_id)
+        .values(views_count=articles.c.views_count + 1)
+    )
+    ArticleRepository(db_session)._increment_counter(
+        article_id, Article.likes_count, 1
+    )
+    db_session.get(Article, article_id).saves_count += 1
+    db_session.commit()
+    assert counter._generations(["articles"]) == generation
+
+    db_session.get(Article, article_id).status = "draft"
+    db_session.commit()
+    assert counter._generations(["articles"]) != generation
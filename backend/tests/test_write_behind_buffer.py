@@ -0,0 +1,84 @@
+from services.ad_event_buffer import AdEventBuffer
+from services.impression_buffer import ArticleImpressionBuffer
+
+
+class FailingSession:
+    def scalars(self, statement):
+        raise ConnectionError("БД недоступна")
+
+    def execute(self, statement, params=None):
+        raise ConnectionError("БД недоступна")
+
+    def query(self, *entities):
+        raise ConnectionError("БД недоступна")
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FailingConnection:
+    def __init__(self, on_session=None):
+        self.sessions = 0
+        self.on_session = on_session
+
+    def get_session(self):
+        self.sessions += 1
+        if self.on_session:
+            self.on_session()
+        return FailingSession()
+
+
+def make_buffer(connection, buffer_class=ArticleImpressionBuffer, **kwargs):
+    buffer = buffer_class(connection, **kwargs)
+    # Фоновий потік не потрібен: скидання викликаються явно або з add()
+    buffer._ensure_worker = lambda: None
+    return buffer
+
+
+def test_failed_flush_backs_off_instead_of_retrying_on_requests():
+    connection = FailingConnection()
+    buffer = make_buffer(connection, max_size=2, flush_interval=60)
+
+    buffer.add(1)
+    buffer.add(2)
+    assert connection.sessions == 1
+
+    for article_id in range(3, 20):
+        buffer.add(article_id)
+    assert connection.sessions == 1
+    assert len(buffer._pending) == 19
+
+
+def test_pending_impressions_are_capped_while_database_is_down():
+    connection = FailingConnection()
+    buffer = make_buffer(connection, max_size=5, flush_interval=60, max_pending=8)
+
+    for article_id in range(12):
+        buffer.add(article_id)
+    assert len(buffer._pending) == 8
+    assert buffer.dropped == 4
+
+    buffer.flush()
+    assert len(buffer._pending) == 8
+    assert [row["article_id"] for row in buffer._pending] == list(range(8))
+
+
+def test_ad_clicks_take_priority_over_views_when_requeued():
+    connection = FailingConnection()
+    buffer = make_buffer(
+        connection, AdEventBuffer, max_size=100, flush_interval=60, max_pending=6
+    )
+    buffer.add_impressions([1, 2, 3, 4, 5, 6, 7])
+    assert buffer._size() == 6
+    assert buffer.dropped == 1
+
+    # Кліки надходять, поки покази записуються
+    connection.on_session = lambda: [buffer.add_click(9) for _ in range(2)]
+    buffer.flush()
+
+    assert [click["ad_id"] for click in buffer._clicks] == [9, 9]
+    assert [view["ad_id"] for view in buffer._views] == [3, 4, 5, 6]
+    assert buffer.dropped == 3